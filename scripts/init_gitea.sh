@@ -11,8 +11,11 @@ TOKEN_FILE="/data/gitea_admin_token"
 SSH_KEY_FILE="/etc/ssh_keys/id_rsa.pub"
 
 echo "[init] Waiting for Gitea to be healthy..."
+# exponential backoff: 50ms doubling up to 2s (usually already up after scripts/wait_for_gitea.sh)
+DELAY_MS=50
 until curl -s -o /dev/null -w "%{http_code}" "${GITEA_URL}/api/healthz" | grep -q "200"; do
-  sleep 2
+  sleep "$(printf '%d.%03d' $((DELAY_MS / 1000)) $((DELAY_MS % 1000)))"
+  DELAY_MS=$((DELAY_MS * 2 > 2000 ? 2000 : DELAY_MS * 2))
 done
 
 echo "[init] Gitea is healthy."
@@ -6,6 +6,14 @@ set -euo pipefail
 GITEA_URL="${GITEA_URL:-http://localhost:3000}"
 MAX_RETRIES="${MAX_RETRIES:-90}"   # up to 180s
 SLEEP_INTERVAL="${SLEEP_INTERVAL:-2}"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Preferred: Python prober (HTTP health + SSH banner + git daemon, concurrent, ms-level backoff)
+if command -v python3 >/dev/null 2>&1; then
+  echo "[wait] Probing Gitea HTTP/SSH/git at ${GITEA_URL} ..."
+  PYTHONPATH="${SCRIPT_DIR}/../src${PYTHONPATH:+:${PYTHONPATH}}" exec python3 -m gitguard.infra.readiness \
+    --url "${GITEA_URL}" --timeout "$((MAX_RETRIES * SLEEP_INTERVAL))"
+fi
 
 echo "[wait] Waiting for Gitea at ${GITEA_URL} ..."
 
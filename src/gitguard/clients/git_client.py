@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import contextlib
 import subprocess
 import os
+import random
+import re
+import shutil
 import time
 import datetime
 import logging
 import shlex
+import tempfile
+import threading
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Dict, Iterator, Optional, List, Sequence, Tuple, Union
+
+from gitguard.clients.process import iter_process_output, run_process
+from gitguard.clients.reference_cache import ReferenceCache
 
 try:
     import allure
@@ -21,13 +30,25 @@ except Exception:
 logger = logging.getLogger("gitguard")
 
 
+class GitTimeoutError(TimeoutError):
+    """A git command timed out; its whole process group was killed. Keeps the output produced so far."""
+
+    def __init__(self, message: str, stdout: str = "", stderr: str = "", duration: float = 0.0):
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+
+
 @dataclass
 class GitResult:
     """Result of a git command."""
     code: int
     stdout: str
     stderr: str
-    duration: float  # seconds
+    duration: float  # seconds (all attempts when retried)
+    attempts: int = 1
+    transient_errors: List[str] = field(default_factory=list)  # failure class of every retried attempt
 
     @property
     def returncode(self) -> int:
@@ -37,14 +58,205 @@ class GitResult:
         return self.code == 0
 
 
+# ---------- Failure classification ----------
+
+# Checked first: failures that will not go away by trying again
+PERMANENT_FAILURES: Dict[str, re.Pattern] = {
+    "auth": re.compile(r"Authentication failed|Permission denied|could not read Username|"
+                       r"returned error: 40[13]|HTTP 40[13]|Host key verification failed", re.I),
+    # anchored to git's own fatal/remote lines: traced stderr (GIT_TRACE, curl, ssh -v) mentions "not found" routinely
+    "not_found": re.compile(r"^fatal: repository '.*' not found|^(ERROR|remote): Repository not found|"
+                            r"^fatal: .*does not appear to be a git repository|"
+                            r"^fatal: unable to access .*returned error: 404", re.M),
+    "rejected": re.compile(r"\[rejected\]|\[remote rejected\]|non-fast-forward", re.I),
+    "local": re.compile(r"already exists and is not an empty directory|not a git repository|"
+                        r"pathspec .* did not match", re.I),
+}
+
+TRANSIENT_FAILURES: Dict[str, re.Pattern] = {
+    "early_eof": re.compile(r"early EOF|unexpected disconnect while reading sideband packet|"
+                            r"the remote end hung up unexpectedly|index-pack failed|"
+                            r"transfer closed with outstanding read data remaining", re.I),
+    "http_5xx": re.compile(r"RPC failed; HTTP 5\d\d|returned error: 5\d\d|HTTP/[\d.]+ 5\d\d|"
+                           r"RPC failed; curl (18|52|55|56)", re.I),
+    "connection": re.compile(r"Connection (reset|refused|timed out)|Could not resolve host|Failed to connect|"
+                             r"Operation timed out|Broken pipe|gnutls_handshake|SSL_read|"
+                             r"TLS connection was non-properly terminated", re.I),
+    "ssh": re.compile(r"kex_exchange_identification|ssh_exchange_identification|"
+                      r"Connection closed by (remote host|[\d.:]+ port)", re.I),
+}
+
+
+def classify_failure(stderr: str) -> Tuple[str, Optional[str]]:
+    """Classify git stderr as ("permanent"|"transient"|"unknown", failure class or None)."""
+    for name, pattern in PERMANENT_FAILURES.items():
+        if pattern.search(stderr or ""):
+            return "permanent", name
+    for name, pattern in TRANSIENT_FAILURES.items():
+        if pattern.search(stderr or ""):
+            return "transient", name
+    return "unknown", None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Opt-in retry of safe git operations (clone, fetch, ls-remote, push) on transient failures.
+    Delay before retry n: min(max_delay, base_delay * 2**(n-1)) scaled by a random factor
+    in [1 - jitter, 1] so parallel workers do not retry in lockstep.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    jitter: float = 0.5
+    retry_on: Sequence[str] = tuple(TRANSIENT_FAILURES)
+
+    def delay(self, attempt: int) -> float:
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return backoff * random.uniform(1.0 - self.jitter, 1.0)
+
+    def should_retry(self, result: GitResult, attempt: int) -> Optional[str]:
+        """Failure class to retry on, or None when `result` is final."""
+        if result.ok() or attempt >= self.max_attempts:
+            return None
+        kind, name = classify_failure(result.stderr)
+        return name if kind == "transient" and name in self.retry_on else None
+
+
+@dataclass
+class HistoryCommit:
+    """
+    One commit of a declarative history for GitClient.build_history().
+    - files: path -> content (str/bytes); None deletes the path
+    - label: name later commits can use in `parent` / `merge`
+    - parent: label or committish the branch starts from (only needed for the first commit of a branch;
+      use "refs/heads/<name>^0" to extend a branch that already exists in the repository)
+    - merge: labels/committishes merged into this commit (additional parents); fast-import does not
+      merge trees, the commit tree is the first parent's tree plus `files`
+    - tag: lightweight tag pointing at this commit
+    """
+    message: str
+    files: Dict[str, Optional[Union[str, bytes]]] = field(default_factory=dict)
+    branch: str = "main"
+    label: Optional[str] = None
+    parent: Optional[str] = None
+    merge: List[str] = field(default_factory=list)
+    tag: Optional[str] = None
+    author: Optional[str] = None  # "Name <email>", defaults to the build_history() author
+    timestamp: Optional[int] = None  # seconds since epoch, defaults to a deterministic sequence
+
+
+@dataclass
+class HistoryResult(GitResult):
+    """Result of build_history(): commit ids in input order and by label."""
+    commits: List[str] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+# ---------- Structured records ----------
+
+@dataclass(slots=True)
+class StatusEntry:
+    """One `git status --porcelain=v2` entry. kind: "1" changed, "2" renamed/copied, "u" unmerged, "?", "!"."""
+    kind: str
+    path: str
+    xy: str = ".."  # index / worktree status letters, "." = unchanged
+    orig_path: Optional[str] = None  # source path of a rename/copy
+    head_sha: Optional[str] = None
+    index_sha: Optional[str] = None
+    score: Optional[str] = None  # rename/copy score, e.g. "R100"
+
+    @property
+    def staged(self) -> bool:
+        return self.kind in "12" and self.xy[0] != "."
+
+    @property
+    def unstaged(self) -> bool:
+        return self.kind in "12" and self.xy[1] != "."
+
+    @property
+    def conflicted(self) -> bool:
+        return self.kind == "u"
+
+    @property
+    def untracked(self) -> bool:
+        return self.kind == "?"
+
+
+@dataclass
+class StatusReport:
+    """Parsed `git status --porcelain=v2 --branch`."""
+    branch: Optional[str] = None  # None when detached
+    oid: Optional[str] = None  # None before the first commit
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    entries: List[StatusEntry] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        """No tracked changes and no conflicts (untracked/ignored files do not count)."""
+        return not any(e.kind in "12u" for e in self.entries)
+
+    @property
+    def conflicts(self) -> List[StatusEntry]:
+        return [e for e in self.entries if e.conflicted]
+
+
+# `git log` placeholders available to iter_log(); the commit id is always requested first
+LOG_FIELDS: Dict[str, str] = {
+    "sha": "%H", "parents": "%P", "tree": "%T",
+    "author_name": "%an", "author_email": "%ae", "author_time": "%at",
+    "committer_name": "%cn", "committer_email": "%ce", "commit_time": "%ct",
+    "subject": "%s", "body": "%b", "refs": "%D",
+}
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """One commit from iter_log(); fields that were not requested stay None."""
+    sha: str
+    parents: Optional[List[str]] = None
+    tree: Optional[str] = None
+    author_name: Optional[str] = None
+    author_email: Optional[str] = None
+    author_time: Optional[int] = None
+    committer_name: Optional[str] = None
+    committer_email: Optional[str] = None
+    commit_time: Optional[int] = None
+    subject: Optional[str] = None
+    body: Optional[str] = None
+    refs: Optional[str] = None
+
+
+@dataclass(slots=True)
+class RefEntry:
+    """One ref from iter_refs(); `peeled` is the commit an annotated tag points to."""
+    name: str
+    sha: str
+    type: str
+    peeled: Optional[str] = None
+    upstream: Optional[str] = None
+
+    @property
+    def short(self) -> str:
+        for prefix in ("refs/heads/", "refs/tags/", "refs/remotes/"):
+            if self.name.startswith(prefix):
+                return self.name[len(prefix):]
+        return self.name
+
+
 class GitClient:
     """
     Thin wrapper around the system `git` command used by tests.
     Features:
     - Logs all commands with timestamps, duration, env vars, stdout/stderr to a log
-    - Uses subprocess.run(...) (so unit tests that patch subprocess.run work).
+    - Runs git via process.run_process(...) in its own process group, so a timeout kills git together with
+      its helpers (remote-http, ssh, index-pack); unit tests patch gitguard.clients.git_client.run_process.
     - Public operations accept optional `workdir` override so tests can call client.pull("/tmp/repo").
     - Returns GitResult with `.returncode` property for compatibility.
+    - Optional RetryPolicy retries clone/fetch/ls-remote/push on transient network failures.
+    - Optional ReferenceCache: clones borrow objects from a shared local mirror of the remote.
     """
 
     def __init__(
@@ -57,6 +269,8 @@ class GitClient:
         artifacts_dir: Optional[str] = None,
         enable_trace: bool = True,
         attach_logs_always: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        reference_cache: Optional[ReferenceCache] = None,
     ):
         self.protocol = (protocol or "http").lower()
         self.host = host
@@ -65,6 +279,8 @@ class GitClient:
         self.workdir = Path(workdir) if workdir else Path.cwd()
         self.enable_trace = bool(enable_trace)
         self.attach_logs_always = bool(attach_logs_always)
+        self.retry_policy = retry_policy
+        self.reference_cache = reference_cache
 
         # artifacts dir (under workdir so CI picks it up easily)
         if artifacts_dir:
@@ -75,6 +291,7 @@ class GitClient:
 
         ts = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         self.log_path = self.artifacts / f"git-client-{ts}.log"
+        self._log_lock = threading.Lock()  # one client may run git from several threads
 
         logger.debug("Initialized GitClient: protocol=%s host=%s owner=%s repo=%s workdir=%s artifacts=%s",
                      self.protocol, self.host, self.owner, self.repo, str(self.workdir), str(self.artifacts))
@@ -120,7 +337,7 @@ class GitClient:
             f"Duration: {duration:.6f} sec\n"
             f"---\n"
         )
-        with open(self.log_path, "a", encoding="utf-8") as f:
+        with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
             f.write(header)
             if stdout:
                 f.write("STDOUT:\n")
@@ -150,10 +367,40 @@ class GitClient:
     # Core runner 
     # -----------
     def _run(self, args: List[str], extra_env: Optional[dict] = None, cwd: Optional[str] = None,
-             timeout: Optional[float] = 60) -> GitResult:
+             timeout: Optional[float] = 60, input: Optional[Union[str, bytes]] = None,
+             retry_safe: bool = False, before_retry: Optional[Callable[[], None]] = None) -> GitResult:
+        """
+        Run a git command; with a retry policy configured and `retry_safe` set, transient failures
+        are retried with backoff (`before_retry` runs first, e.g. to remove a half-written clone).
+        """
+        result = self._run_once(args, extra_env=extra_env, cwd=cwd, timeout=timeout, input=input)
+        policy = self.retry_policy
+        if not (retry_safe and policy):
+            return result
+
+        total = result.duration
+        transient: List[str] = []
+        while (failure := policy.should_retry(result, len(transient) + 1)) is not None:
+            transient.append(failure)
+            delay = policy.delay(len(transient))
+            logger.warning("git %s failed transiently (%s), retry %d/%d in %.2fs",
+                           args[0], failure, len(transient), policy.max_attempts - 1, delay)
+            time.sleep(delay)
+            if before_retry:
+                before_retry()
+            result = self._run_once(args, extra_env=extra_env, cwd=cwd, timeout=timeout, input=input)
+            total += delay + result.duration
+        result.duration = total
+        result.attempts = len(transient) + 1
+        result.transient_errors = transient
+        return result
+
+    def _run_once(self, args: List[str], extra_env: Optional[dict] = None, cwd: Optional[str] = None,
+                  timeout: Optional[float] = 60, input: Optional[Union[str, bytes]] = None) -> GitResult:
         """
         Run a git command with optional extra environment and optional cwd override.
-        Returns GitResult (and allows subprocess.run to be mocked by unit tests).
+        `input` is fed to stdin; bytes input runs the process in binary mode (output is decoded as UTF-8).
+        Returns GitResult; on timeout raises GitTimeoutError carrying the partial stdout/stderr.
         """
         cmd = ["git"] + args
         logger.debug("About to run git command: %s", shlex.join(cmd))
@@ -162,29 +409,32 @@ class GitClient:
         if extra_env:
             env.update({k: str(v) for k, v in extra_env.items()})
 
+        # ssh must never prompt for (or reject) the throwaway test server's host key; tracing only adds -v
+        env.setdefault("GIT_SSH_COMMAND", f"ssh{' -v' if self.enable_trace else ''} "
+                                          "-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null")
         if self.enable_trace:
             env.setdefault("GIT_TRACE", "1")
             env.setdefault("GIT_CURL_VERBOSE", "1")
-            env.setdefault("GIT_SSH_COMMAND", 
-                           "ssh -v -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null")
 
         # determine working directory
         run_cwd = str(self.workdir) if cwd is None else str(Path(cwd))
 
         start = time.perf_counter()
         try:
-            completed = subprocess.run(
+            completed = run_process(
                 cmd,
                 cwd=run_cwd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                text=not isinstance(input, bytes),
+                input=input,
                 env=env,
                 timeout=timeout,
-                check=False,
             )
             out = completed.stdout or ""
             err = completed.stderr or ""
+            if isinstance(out, bytes):
+                out = out.decode("utf-8", errors="replace")
+            if isinstance(err, bytes):
+                err = err.decode("utf-8", errors="replace")
             rc = completed.returncode
         except (OSError, PermissionError) as e:
             duration = time.perf_counter() - start
@@ -195,15 +445,15 @@ class GitClient:
             raise
         except subprocess.TimeoutExpired as e:
             duration = time.perf_counter() - start
+            # partial output captured before the process group was killed (bytes in binary mode)
+            stdout = e.stdout.decode("utf-8", errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+            stderr = e.stderr.decode("utf-8", errors="replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
             try:
-                # e.stdout/e.stderr might be bytes or None
-                stdout = (e.stdout or "") if isinstance(e.stdout, str) else ""
-                stderr = (e.stderr or "") if isinstance(e.stderr, str) else ""
                 self._write_log_header(cmd, env, duration, 124, stdout, stderr)
             except Exception:
                 logger.exception("Failed writing git-client log (timeout path)")
-            # Re-raise TimeoutError for tests expecting it
-            raise TimeoutError(str(e)) from e
+            # Re-raise as TimeoutError (GitTimeoutError subclasses it) for tests expecting it
+            raise GitTimeoutError(str(e), stdout=stdout.strip(), stderr=stderr.strip(), duration=duration) from e
         finally:
             duration = time.perf_counter() - start
 
@@ -228,19 +478,92 @@ class GitClient:
     def clone(self, target_dir: Optional[str] = None, repo_url: Optional[str] = None,
               protocol: Optional[str] = None, host: Optional[str] = None,
               owner: Optional[str] = None, repo: Optional[str] = None,
-              workdir: Optional[str] = None) -> GitResult:
+              workdir: Optional[str] = None, reference: Optional[bool] = None,
+              depth: Optional[int] = None, shallow_since: Optional[str] = None,
+              filter: Optional[str] = None, branch: Optional[str] = None, single_branch: bool = False,
+              no_checkout: bool = False, sparse: Optional[Sequence[str]] = None,
+              bundle_uri: Optional[str] = None) -> GitResult:
         """
         Clone repository. If repo_url is provided it is used verbatim;
         otherwise URL is constructed from protocol/host/owner/repo (overrides allowed).
+        With a reference cache configured (and `reference` not False) objects are borrowed from the
+        cache's mirror of the URL; if that mirror cannot be created the clone runs without it.
+
+        Reduced clones:
+        - depth / shallow_since: shallow history (--depth, --shallow-since=<date>); ignored by git for
+          plain local paths, use a file:// URL there.
+        - filter: partial clone filter spec, e.g. "blob:none" or "tree:0" (the server must allow filters).
+        - branch / single_branch: check out `branch` and/or fetch only that branch.
+        - no_checkout: leave the working tree empty (HEAD still points at the branch).
+        - sparse: cone-mode sparse-checkout directories, set up before the working tree is populated.
+        - bundle_uri: download a bundle (or bundle list) from this URI first and only fetch the rest
+          from the remote (`git clone --bundle-uri`, git >= 2.38; http(s) URIs need >= 2.39).
+        Shallow, filtered and bundle-uri clones never use the reference cache, so they transfer exactly
+        what they ask for.
         """
         if repo_url:
             url = repo_url
         else:
             url = self._make_repo_url(protocol=protocol, host=host, owner=owner, repo=repo)
-        args = ["clone", url]
+        reduced = depth is not None or shallow_since is not None or filter is not None or bundle_uri is not None
+        cache = self.reference_cache if reference is not False and not reduced else None
+        if reference and cache is None:
+            raise ValueError("reference=True requires a GitClient with a reference_cache (and a full clone)")
+        ref_path = cache.ensure(self, url) if cache else None
+        args = ["clone", *(cache.clone_args(ref_path) if ref_path else [])]
+        if depth is not None:
+            args += ["--depth", str(depth)]
+        if shallow_since is not None:
+            args.append(f"--shallow-since={shallow_since}")
+        if filter is not None:
+            args.append(f"--filter={filter}")
+        if bundle_uri is not None:
+            args.append(f"--bundle-uri={bundle_uri}")
+        if branch:
+            args += ["--branch", branch]
+        if single_branch:
+            args.append("--single-branch")
+        # sparse: clone without a working tree, narrow it, then check out only the cone
+        if no_checkout or sparse:
+            args.append("--no-checkout")
+        args.append(url)
         if target_dir:
             args.append(target_dir)
-        return self._run(args, cwd=workdir)
+
+        # a retried clone must start from a fresh directory again
+        base = Path(workdir) if workdir else Path(self.workdir)
+        dest = base / (target_dir or url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git"))
+        pre_existing = dest.is_dir()
+        was_empty = pre_existing and not any(dest.iterdir())
+
+        def reset_target() -> None:
+            if not pre_existing:
+                shutil.rmtree(dest, ignore_errors=True)
+            elif was_empty:
+                for child in dest.iterdir():
+                    if child.is_dir() and not child.is_symlink():
+                        shutil.rmtree(child, ignore_errors=True)
+                    else:
+                        child.unlink(missing_ok=True)
+
+        if ref_path is None:
+            result = self._run(args, cwd=workdir, retry_safe=True, before_retry=reset_target)
+        else:
+            # shared lock: the cache is not refreshed while objects are being borrowed from it
+            with cache.locked(url, exclusive=False):
+                result = self._run(args, cwd=workdir, retry_safe=True, before_retry=reset_target)
+        if not (result.ok() and sparse):
+            return result
+
+        steps = [["sparse-checkout", "set", "--cone", "--", *sparse]]
+        if not no_checkout:
+            steps.append(["checkout"])
+        for step in steps:
+            res = self._run(step, cwd=str(dest))
+            if not res.ok():
+                return res
+            result.duration += res.duration
+        return result
 
     def init(self, path: Optional[str] = None, workdir: Optional[str] = None) -> GitResult:
         """
@@ -259,13 +582,50 @@ class GitClient:
         return self._run(["commit", "-m", message], cwd=workdir)
 
     def push(self, remote: str = "origin", branch: str = "main", workdir: Optional[str] = None) -> GitResult:
-        return self._run(["push", remote, branch], cwd=workdir)
+        # pushing the same commit again is a no-op, so a push that failed in transit is safe to retry
+        return self._run(["push", remote, branch], cwd=workdir, retry_safe=True)
 
-    def pull(self, remote: str = "origin", branch: str = "main", workdir: Optional[str] = None) -> GitResult:
-        return self._run(["pull", remote, branch], cwd=workdir)
+    def pull(self, remote: str = "origin", branch: str = "main", workdir: Optional[str] = None,
+             rebase: Optional[bool] = None) -> GitResult:
+        """git pull; rebase=True/False adds --rebase/--no-rebase (None keeps the configured default)."""
+        args = ["pull"]
+        if rebase is not None:
+            args.append("--rebase" if rebase else "--no-rebase")
+        return self._run(args + [remote, branch], cwd=workdir)
 
     def fetch(self, remote: str = "origin", workdir: Optional[str] = None) -> GitResult:
-        return self._run(["fetch", remote], cwd=workdir)
+        return self._run(["fetch", remote], cwd=workdir, retry_safe=True)
+
+    def ls_remote(self, remote: str = "origin", refs: Sequence[str] = (), workdir: Optional[str] = None,
+                  heads: bool = False, tags: bool = False) -> GitResult:
+        """git ls-remote over protocol v2; heads/tags are sent as ref-prefix so the server filters them."""
+        args = ["-c", "protocol.version=2", "ls-remote"]
+        if heads:
+            args.append("--heads")
+        if tags:
+            args.append("--tags")
+        return self._run(args + [remote, *refs], cwd=workdir, retry_safe=True)
+
+    def remote_refs(self, remote: str = "origin", prefixes: Sequence[str] = (),
+                    workdir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Map ref -> sha advertised by `remote`, limited to `prefixes` (e.g. "refs/heads/").
+        refs/heads/ and refs/tags/ are filtered server-side, other prefixes locally; peeled
+        tag entries (^{}) are skipped. Raises RuntimeError when ls-remote fails.
+        """
+        heads = "refs/heads/" in prefixes
+        tags = "refs/tags/" in prefixes
+        server_filtered = not prefixes or all(p in ("refs/heads/", "refs/tags/") for p in prefixes)
+        r = self.ls_remote(remote, workdir=workdir, heads=heads and server_filtered, tags=tags and server_filtered)
+        if not r.ok():
+            raise RuntimeError(f"ls-remote {remote} failed: {r.stderr}")
+        refs: Dict[str, str] = {}
+        for line in r.stdout.splitlines():
+            sha, _, name = line.partition("\t")
+            if name.endswith("^{}") or (prefixes and not name.startswith(tuple(prefixes))):
+                continue
+            refs[name] = sha
+        return refs
 
     def status(self, workdir: Optional[str] = None) -> GitResult:
         return self._run(["status"], cwd=workdir)
@@ -275,3 +635,335 @@ class GitClient:
 
     def branch(self, name: str, workdir: Optional[str] = None) -> GitResult:
         return self._run(["branch", name], cwd=workdir)
+
+    def rev_parse(self, rev: str = "HEAD", workdir: Optional[str] = None) -> GitResult:
+        """Resolve `rev` to an object id (stdout holds the full sha)."""
+        return self._run(["rev-parse", "--verify", rev], cwd=workdir)
+
+    @contextlib.contextmanager
+    def worktree(self, branch: Optional[str] = None, path: Optional[str] = None, workdir: Optional[str] = None,
+                 create: bool = False, start_point: Optional[str] = None, detach: bool = False,
+                 keep: bool = False) -> Iterator[Path]:
+        """
+        Check out `branch` in an extra working tree of the clone in `workdir` (`git worktree add`)
+        and yield its path; the worktree is removed again on exit unless keep=True. Worktrees share
+        the object store and refs with the clone, so a second actor or branch costs a checkout,
+        not a clone. A branch only known as origin/<branch> is created tracking it; create=True
+        makes a new branch at `start_point`, detach=True checks out `branch` (or `start_point`)
+        without a branch. git refuses to check out one branch in two worktrees at once: use
+        create=True or detach=True for a second actor on the same branch.
+        Raises RuntimeError when the worktree cannot be created.
+        """
+        base = Path(workdir or self.workdir)
+        if path:
+            target = Path(path)
+        else:
+            label = re.sub(r"[^A-Za-z0-9._-]+", "-", branch or start_point or "detached")
+            target = Path(tempfile.mkdtemp(prefix=f"{base.name}-wt-{label}-", dir=str(base.parent)))
+        args = ["worktree", "add"]
+        if create:
+            if not branch:
+                raise ValueError("create=True needs a branch name")
+            args += ["-b", branch, str(target)] + ([start_point] if start_point else [])
+        else:
+            if detach:
+                args.append("--detach")
+            args += [str(target)] + [ref for ref in (branch or start_point,) if ref]
+        result = self._run(args, cwd=str(base))
+        if not result.ok():
+            if not path:
+                shutil.rmtree(target, ignore_errors=True)
+            raise RuntimeError(f"git worktree add {target} failed: {result.stderr}")
+        try:
+            yield target
+        finally:
+            if not keep:
+                removed = self._run(["worktree", "remove", "--force", str(target)], cwd=str(base))
+                if not removed.ok():
+                    logger.warning("git worktree remove %s failed, pruning instead: %s", target, removed.stderr)
+                    shutil.rmtree(target, ignore_errors=True)
+                    self._run(["worktree", "prune"], cwd=str(base))
+
+    # ---------------------------
+    # Bulk history construction
+    # ---------------------------
+
+    @staticmethod
+    def _fast_import_stream(commits: Sequence[HistoryCommit], author: str, base_timestamp: int) -> bytes:
+        """Render commits as a `git fast-import` stream (marks :1..:n follow the input order)."""
+        labels: Dict[str, int] = {}
+
+        def ref(name: str) -> bytes:
+            return f":{labels[name]}".encode() if name in labels else name.encode()
+
+        def data(payload: bytes) -> bytes:
+            return b"data %d\n%s\n" % (len(payload), payload)
+
+        chunks: List[bytes] = []
+        for mark, c in enumerate(commits, start=1):
+            ident = (c.author or author).encode()
+            ts = c.timestamp if c.timestamp is not None else base_timestamp + mark
+            chunks.append(b"commit refs/heads/%s\nmark :%d\n" % (c.branch.encode(), mark))
+            chunks.append(b"author %s %d +0000\ncommitter %s %d +0000\n" % (ident, ts, ident, ts))
+            chunks.append(data(c.message.encode()))
+            if c.parent:
+                chunks.append(b"from " + ref(c.parent) + b"\n")
+            for other in c.merge:
+                chunks.append(b"merge " + ref(other) + b"\n")
+            for path, content in c.files.items():
+                if content is None:
+                    chunks.append(b"D %s\n" % path.encode())
+                else:
+                    raw = content.encode() if isinstance(content, str) else content
+                    chunks.append(b"M 100644 inline %s\n" % path.encode())
+                    chunks.append(data(raw))
+            chunks.append(b"\n")
+            if c.tag:
+                chunks.append(b"reset refs/tags/%s\nfrom :%d\n\n" % (c.tag.encode(), mark))
+            if c.label:
+                labels[c.label] = mark
+        chunks.append(b"done\n")
+        return b"".join(chunks)
+
+    def build_history(self, commits: Sequence[Union[HistoryCommit, dict]], workdir: Optional[str] = None,
+                      author: str = "GitGuard <gitguard@example.com>", base_timestamp: int = 1700000000,
+                      checkout: bool = False, timeout: Optional[float] = 300) -> HistoryResult:
+        """
+        Write a whole declarative history (commits, files, branches, merges, tags) with one
+        `git fast-import` process, without touching the working tree. Works in bare repositories.
+        `commits` are HistoryCommit objects or dicts with the same fields. With default timestamps
+        the resulting commit ids are deterministic. `checkout=True` force-checks-out the branch of
+        the last commit afterwards (one extra git process).
+        """
+        specs = [c if isinstance(c, HistoryCommit) else HistoryCommit(**c) for c in commits]
+        stream = self._fast_import_stream(specs, author, base_timestamp)
+
+        marks_path = self.artifacts / f"fast-import-marks-{os.getpid()}-{time.monotonic_ns()}.txt"
+        try:
+            result = self._run(["fast-import", "--quiet", "--date-format=raw", "--done",
+                                f"--export-marks={marks_path}"], cwd=workdir, input=stream, timeout=timeout)
+            marks: Dict[int, str] = {}
+            if result.ok() and marks_path.exists():
+                for line in marks_path.read_text(encoding="utf-8").splitlines():
+                    mark, sha = line.split()
+                    marks[int(mark.lstrip(":"))] = sha
+        finally:
+            marks_path.unlink(missing_ok=True)
+
+        history = HistoryResult(code=result.code, stdout=result.stdout, stderr=result.stderr,
+                                duration=result.duration,
+                                commits=[marks[i] for i in range(1, len(specs) + 1) if i in marks],
+                                labels={c.label: marks[i] for i, c in enumerate(specs, start=1)
+                                        if c.label and i in marks})
+        if history.ok() and checkout and specs:
+            co = self._run(["checkout", "-f", specs[-1].branch], cwd=workdir)
+            if not co.ok():
+                history.code, history.stderr = co.code, co.stderr
+        return history
+
+    # ---------------------------
+    # Bundles
+    # ---------------------------
+
+    def bundle_create(self, path: str, refs: Sequence[str] = ("--all",), exclude: Sequence[str] = (),
+                      workdir: Optional[str] = None, timeout: Optional[float] = 300) -> GitResult:
+        """
+        `git bundle create` of `refs` (ref names or rev-list options such as --all / --branches).
+        For an incremental bundle pass what the receiver already has in `exclude` (e.g. the heads
+        of the previous bundle); they become ^<rev> prerequisites. git refuses to write a bundle
+        with nothing new in it.
+        """
+        return self._run(["bundle", "create", str(path), *refs, *(f"^{rev}" for rev in exclude)],
+                         cwd=workdir, timeout=timeout)
+
+    def bundle_heads(self, path: str, workdir: Optional[str] = None) -> Dict[str, str]:
+        """Map ref -> sha of the refs a bundle carries. Raises RuntimeError for an unreadable bundle."""
+        result = self._run(["bundle", "list-heads", str(path)], cwd=workdir)
+        if not result.ok():
+            raise RuntimeError(f"git bundle list-heads {path} failed: {result.stderr}")
+        heads: Dict[str, str] = {}
+        for line in result.stdout.splitlines():
+            sha, _, ref = line.partition(" ")
+            if ref:
+                heads[ref] = sha
+        return heads
+
+    def bundle_verify(self, path: str, workdir: Optional[str] = None) -> GitResult:
+        """Check that the repository in `workdir` has every prerequisite commit of the bundle."""
+        return self._run(["bundle", "verify", "--quiet", str(path)], cwd=workdir)
+
+    def clone_from_bundle(self, bundle: str, target_dir: str, origin_url: Optional[str] = None,
+                          branch: Optional[str] = None, fetch: bool = True, workdir: Optional[str] = None,
+                          timeout: Optional[float] = 300) -> GitResult:
+        """
+        Clone from a local bundle file, then point `origin` at `origin_url` and (with fetch=True)
+        fetch only what the bundle lacks: the server packs the delta instead of the whole history.
+        Returns the first failing step, otherwise the clone result with the total duration.
+        """
+        args = ["clone"]
+        if branch:
+            args += ["--branch", branch]
+        result = self._run(args + [str(bundle), str(target_dir)], cwd=workdir, timeout=timeout)
+        if not (result.ok() and origin_url):
+            return result
+        dest = str((Path(workdir) if workdir else self.workdir) / target_dir)
+        steps = [["remote", "set-url", "origin", origin_url]]
+        if fetch:
+            steps.append(["fetch", "--prune", "origin"])
+        for step in steps:
+            res = self._run(step, cwd=dest, timeout=timeout, retry_safe=step[0] == "fetch")
+            if not res.ok():
+                return res
+            result.duration += res.duration
+        return result
+
+    # ---------------------------
+    # Git LFS (needs the git-lfs extension installed)
+    # ---------------------------
+
+    def lfs_install(self, workdir: Optional[str] = None) -> GitResult:
+        """Install the LFS filters and hooks for this repository only (`git lfs install --local`)."""
+        return self._run(["lfs", "install", "--local"], cwd=workdir)
+
+    def lfs_track(self, patterns: Sequence[str], workdir: Optional[str] = None) -> GitResult:
+        """Track `patterns` (e.g. "*.bin") with LFS and stage the updated .gitattributes."""
+        result = self._run(["lfs", "track", *patterns], cwd=workdir)
+        if not result.ok():
+            return result
+        return self._run(["add", ".gitattributes"], cwd=workdir)
+
+    def lfs_push(self, remote: str = "origin", branch: Optional[str] = None, all_objects: bool = False,
+                 workdir: Optional[str] = None, timeout: Optional[float] = 600) -> GitResult:
+        """Upload LFS objects referenced by `branch` (or every local object with all_objects=True)."""
+        args = ["lfs", "push"] + (["--all"] if all_objects else []) + [remote] + ([branch] if branch else [])
+        return self._run(args, cwd=workdir, timeout=timeout, retry_safe=True)
+
+    def lfs_pull(self, remote: str = "origin", include: Sequence[str] = (), workdir: Optional[str] = None,
+                 timeout: Optional[float] = 600) -> GitResult:
+        """Download LFS objects of the current checkout (limited to `include` patterns) and smudge them."""
+        args = ["lfs", "pull", remote] + (["--include", ",".join(include)] if include else [])
+        return self._run(args, cwd=workdir, timeout=timeout, retry_safe=True)
+
+    def lfs_files(self, ref: Optional[str] = None, workdir: Optional[str] = None) -> Dict[str, str]:
+        """Map path -> LFS oid of the LFS files in `ref` (default: HEAD). Raises RuntimeError on failure."""
+        result = self._run(["lfs", "ls-files", "--long", *([ref] if ref else [])], cwd=workdir)
+        if not result.ok():
+            raise RuntimeError(f"git lfs ls-files failed: {result.stderr}")
+        files: Dict[str, str] = {}
+        for line in result.stdout.splitlines():
+            # "<oid> <*|-> <path>": '*' when the content is checked out, '-' for a pointer file
+            oid, _, path = line.split(" ", 2)
+            files[path] = oid
+        return files
+
+    # ---------------------------
+    # Structured / streaming output
+    # ---------------------------
+
+    def _iter_records(self, args: List[str], cwd: Optional[str] = None, sep: bytes = b"\0") -> Iterator[str]:
+        """
+        Stream `git <args>` stdout as `sep`-delimited records without buffering the whole output.
+        Only a summary (record count) is written to the client log. Raises RuntimeError on failure.
+        """
+        cmd = ["git"] + args
+        env = os.environ.copy()
+        run_cwd = str(self.workdir) if cwd is None else str(Path(cwd))
+        start = time.perf_counter()
+        records = 0
+        rc, err = 0, ""
+        try:
+            for raw in iter_process_output(cmd, cwd=run_cwd, env=env, sep=sep):
+                records += 1
+                yield raw.decode("utf-8", errors="replace")
+        except subprocess.CalledProcessError as e:
+            rc, err = e.returncode, (e.stderr or b"").decode("utf-8", errors="replace")
+            raise RuntimeError(f"{shlex.join(cmd)} failed ({rc}): {err.strip()}") from e
+        finally:
+            try:
+                self._write_log_header(cmd, env, time.perf_counter() - start, rc, f"<{records} records streamed>", err)
+            except Exception:
+                logger.exception("Failed writing git-client log to %s", self.log_path)
+
+    def _iter_status(self, workdir: Optional[str], untracked: str, ignored: bool,
+                     headers: Optional[Dict[str, str]]) -> Iterator[StatusEntry]:
+        args = ["status", "--porcelain=v2", "-z", f"--untracked-files={untracked}"]
+        if ignored:
+            args.append("--ignored")
+        if headers is not None:
+            args.append("--branch")
+        records = self._iter_records(args, cwd=workdir)
+        for record in records:
+            kind = record[:1]
+            if kind == "#" and headers is not None:
+                key, _, value = record[2:].partition(" ")
+                headers[key] = value
+            elif kind == "1":
+                _, xy, _sub, _mh, _mi, _mw, hh, hi, path = record.split(" ", 8)
+                yield StatusEntry("1", path, xy, head_sha=hh, index_sha=hi)
+            elif kind == "2":
+                _, xy, _sub, _mh, _mi, _mw, hh, hi, score, path = record.split(" ", 9)
+                yield StatusEntry("2", path, xy, orig_path=next(records), head_sha=hh, index_sha=hi, score=score)
+            elif kind == "u":
+                fields = record.split(" ", 10)
+                yield StatusEntry("u", fields[10], fields[1])
+            elif kind in ("?", "!"):
+                yield StatusEntry(kind, record[2:])
+
+    def iter_status(self, workdir: Optional[str] = None, untracked: str = "all",
+                    ignored: bool = False) -> Iterator[StatusEntry]:
+        """Stream `git status --porcelain=v2 -z` entries (paths are never quoted)."""
+        return self._iter_status(workdir, untracked, ignored, headers=None)
+
+    def status_porcelain(self, workdir: Optional[str] = None, untracked: str = "all",
+                         ignored: bool = False) -> StatusReport:
+        """Branch information plus every status entry, parsed from porcelain v2."""
+        headers: Dict[str, str] = {}
+        entries = list(self._iter_status(workdir, untracked, ignored, headers=headers))
+        ahead, behind = 0, 0
+        if "branch.ab" in headers:
+            a, b = headers["branch.ab"].split()
+            ahead, behind = int(a), -int(b)
+        head = headers.get("branch.head")
+        oid = headers.get("branch.oid")
+        return StatusReport(branch=None if head == "(detached)" else head,
+                            oid=None if oid == "(initial)" else oid,
+                            upstream=headers.get("branch.upstream"), ahead=ahead, behind=behind, entries=entries)
+
+    def iter_log(self, rev: str = "HEAD", fields: Sequence[str] = ("sha", "parents", "author_time", "subject"),
+                 max_count: Optional[int] = None, paths: Sequence[str] = (), extra_args: Sequence[str] = (),
+                 workdir: Optional[str] = None) -> Iterator[LogEntry]:
+        """
+        Stream commits of `rev` as LogEntry records with only `fields` (keys of LOG_FIELDS) filled in.
+        Every field is NUL-terminated and commits are NUL-separated, so subjects/bodies need no escaping.
+        """
+        unknown = set(fields) - set(LOG_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown log fields: {sorted(unknown)}")
+        names = ["sha"] + [f for f in fields if f != "sha"]
+        fmt = "".join(LOG_FIELDS[name] + "%x00" for name in names)
+        args = ["log", "-z", f"--format={fmt}"]
+        if max_count is not None:
+            args.append(f"--max-count={max_count}")
+        args += [*extra_args, rev, "--", *paths]
+
+        values: List[str] = []
+        for token in self._iter_records(args, cwd=workdir):
+            if not values and token == "":
+                continue  # separator between two commits
+            values.append(token)
+            if len(values) == len(names):
+                record = dict(zip(names, values))
+                if "parents" in record:
+                    record["parents"] = record["parents"].split()
+                for name in ("author_time", "commit_time"):
+                    if name in record:
+                        record[name] = int(record[name])
+                yield LogEntry(**record)
+                values = []
+
+    def iter_refs(self, patterns: Sequence[str] = (), workdir: Optional[str] = None) -> Iterator[RefEntry]:
+        """Stream `git for-each-ref` (optionally limited to `patterns`, e.g. "refs/tags") as RefEntry records."""
+        fmt = "%(refname)%00%(objectname)%00%(objecttype)%00%(*objectname)%00%(upstream)"
+        for line in self._iter_records(["for-each-ref", f"--format={fmt}", *patterns], cwd=workdir, sep=b"\n"):
+            name, sha, obj_type, peeled, upstream = line.split("\0")
+            yield RefEntry(name, sha, obj_type, peeled or None, upstream or None)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import time
 import requests
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
 
 
 try:
@@ -30,6 +33,30 @@ class HttpResult:
         return 200 <= self.status_code < 300
 
 
+@dataclass
+class DownloadResult:
+    """Result of a streamed download (the body itself is never held in memory)."""
+    status_code: int
+    bytes_written: int
+    sha256: str
+    headers: Dict[str, Any]
+    duration: float  # seconds
+    path: Optional[str] = None  # destination file, None when streamed into a writer
+    error: str = ""  # leading part of the body of a failed response
+
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.bytes_written / self.duration if self.duration > 0 else 0.0
+
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_ERROR_BODY_LIMIT = 64 * 1024
+
+
 class HttpClient:
     """
     Simple HTTP client wrapper with logging and optional Allure integration.
@@ -39,6 +66,8 @@ class HttpClient:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.attach_to_allure = attach_to_allure
+        # One pooled session per client: keep-alive connections are reused across calls
+        self.session = requests.Session()
 
     def _attach(self, name: str, content: str) -> None:
         if not (self.attach_to_allure and _HAS_ALLURE):
@@ -53,7 +82,7 @@ class HttpClient:
         logger.debug("HTTP %s %s kwargs=%s", method.upper(), url, kwargs)
 
         start = time.perf_counter()
-        resp = requests.request(method, url, timeout=self.timeout, **kwargs)
+        resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
         duration = time.perf_counter() - start
 
         text = resp.text
@@ -79,6 +108,58 @@ class HttpClient:
 
         return result
 
+    def download(self, path: str, dest: Union[str, Path, BinaryIO], chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                 **kwargs) -> DownloadResult:
+        """
+        GET `path` and stream the body into `dest` (a file path or a binary writer) in `chunk_size`
+        pieces, hashing on the fly. A file destination is written to `<dest>.part` and renamed on
+        success, so a failed or interrupted download never leaves a truncated file behind.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        logger.debug("HTTP GET %s (stream) kwargs=%s", url, kwargs)
+
+        digest = hashlib.sha256()
+        written = 0
+        target = Path(dest) if isinstance(dest, (str, os.PathLike)) else None
+        start = time.perf_counter()
+        with self.session.get(url, timeout=self.timeout, stream=True, **kwargs) as resp:
+            if not 200 <= resp.status_code < 300:
+                error = resp.raw.read(_ERROR_BODY_LIMIT, decode_content=True).decode("utf-8", errors="replace")
+                result = DownloadResult(status_code=resp.status_code, bytes_written=0, sha256="",
+                                        headers=dict(resp.headers), duration=time.perf_counter() - start,
+                                        path=str(target) if target else None, error=error)
+                logger.error("HTTP GET %s -> %s: %s", url, resp.status_code, error[:500])
+                return result
+
+            partial = target.with_name(target.name + ".part") if target else None
+            if partial:
+                partial.parent.mkdir(parents=True, exist_ok=True)
+            out: BinaryIO = partial.open("wb") if partial else dest  # type: ignore[assignment]
+            try:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    out.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+            except BaseException:
+                if partial:
+                    out.close()
+                    partial.unlink(missing_ok=True)
+                raise
+            if partial:
+                out.close()
+                os.replace(partial, target)
+            headers = dict(resp.headers)
+
+        result = DownloadResult(status_code=resp.status_code, bytes_written=written, sha256=digest.hexdigest(),
+                                headers=headers, duration=time.perf_counter() - start,
+                                path=str(target) if target else None)
+        logger.info("HTTP GET %s -> %s streamed %d bytes in %.3fs (%.1f MiB/s)", url, resp.status_code,
+                    written, result.duration, result.throughput / (1024 * 1024))
+        if self.attach_to_allure:
+            self._attach("http-download", f"GET {url}\n\nStatus: {resp.status_code}\nBytes: {written}\n"
+                                          f"sha256: {result.sha256}\nDuration: {result.duration:.3f}s")
+        return result
+
     # Convenience wrappers
     def get(self, path: str, **kwargs) -> HttpResult:
         return self._request("get", path, **kwargs)
@@ -1,14 +1,58 @@
 from __future__ import annotations
 
+import base64
+import json
 import logging
 import os
+import time
 
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
-from gitguard.clients.http_client import HttpClient, HttpResult
+from gitguard.clients.http_client import DOWNLOAD_CHUNK_SIZE, DownloadResult, HttpClient, HttpResult
 
 logger = logging.getLogger("gitguard")
 
+# Content accepted by commit_files(): text, bytes, a local file streamed from disk, or None to delete the path
+FileContent = Union[str, bytes, Path, None]
+
+# Raw bytes base64-encoded per chunk when streaming a request body (multiple of 3: no padding mid-stream)
+_B64_CHUNK = 3 * 256 * 1024
+
+
+@dataclass
+class CommitFilesResult:
+    """Outcome of commit_files(): one response (and commit) per request sent."""
+    responses: List[HttpResult] = field(default_factory=list)
+    commits: List[str] = field(default_factory=list)
+    files: int = 0
+    payload_bytes: int = 0  # raw (pre-base64) content bytes sent
+    duration: float = 0.0
+
+    def ok(self) -> bool:
+        return all(r.ok() for r in self.responses)
+
+
+def _content_size(content: FileContent) -> int:
+    if content is None:
+        return 0
+    if isinstance(content, Path):
+        return content.stat().st_size
+    return len(content.encode("utf-8") if isinstance(content, str) else content)
+
+
+def _iter_base64(content: FileContent) -> Iterator[bytes]:
+    """Base64-encode content chunk by chunk so large files never sit in memory encoded as a whole."""
+    if isinstance(content, Path):
+        with content.open("rb") as f:
+            while chunk := f.read(_B64_CHUNK):
+                yield base64.b64encode(chunk)
+        return
+    raw = content.encode("utf-8") if isinstance(content, str) else (content or b"")
+    for offset in range(0, len(raw), _B64_CHUNK):
+        yield base64.b64encode(raw[offset:offset + _B64_CHUNK])
+
 
 class GiteaHttpClient(HttpClient):
     """
@@ -85,6 +129,29 @@ class GiteaHttpClient(HttpClient):
         payload = {"name": name, "private": private, "description": description}
         return self.post("user/repos", json=payload, headers=self._auth_headers())
 
+    def search_repos(self, page: int = 1, limit: int = 50, sort: str = "updated", order: str = "desc",
+                     query: str = "") -> HttpResult:
+        """One page of repos/search (all repos visible to the token; admins see every repo)."""
+        params = {"page": page, "limit": limit, "sort": sort, "order": order}
+        if query:
+            params["q"] = query
+        return self.get("repos/search", params=params, headers=self._auth_headers())
+
+    def iter_repos(self, limit: int = 50, sort: str = "updated", order: str = "desc") -> Iterator[Dict[str, Any]]:
+        """Yield every repo from repos/search page by page (stops on an empty/short page or X-Total-Count)."""
+        page, seen = 1, 0
+        while True:
+            r = self.search_repos(page=page, limit=limit, sort=sort, order=order)
+            if not r.ok():
+                raise RuntimeError(f"repos/search page {page} failed: {r.status_code} {r.text}")
+            items = (r.json or {}).get("data") or []
+            yield from items
+            seen += len(items)
+            total = r.headers.get("X-Total-Count") or r.headers.get("x-total-count")
+            if len(items) < limit or (total is not None and seen >= int(total)):
+                return
+            page += 1
+
     def get_repo(self, owner: str, repo: str) -> HttpResult:
         return self.get(f"repos/{owner}/{repo}", headers=self._auth_headers())
 
@@ -95,6 +162,38 @@ class GiteaHttpClient(HttpClient):
         payload = {"name": new_name}
         return self.patch(f"repos/{owner}/{repo}", json=payload, headers=self._auth_headers())
 
+    def download_archive(self, owner: str, repo: str, ref: str, dest: Union[str, Path, BinaryIO],
+                         fmt: str = "tar.gz", chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> DownloadResult:
+        """Stream the `zip`/`tar.gz`/`bundle` archive of `ref` into a file or writer."""
+        return self.download(f"repos/{owner}/{repo}/archive/{ref}.{fmt}", dest, chunk_size=chunk_size,
+                             headers=self._auth_headers())
+
+    def download_raw(self, owner: str, repo: str, filepath: str, dest: Union[str, Path, BinaryIO],
+                     ref: Optional[str] = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> DownloadResult:
+        """Stream a raw file (blob) at `ref` (default branch when omitted) into a file or writer."""
+        params = {"ref": ref} if ref else None
+        return self.download(f"repos/{owner}/{repo}/raw/{filepath.lstrip('/')}", dest, chunk_size=chunk_size,
+                             params=params, headers=self._auth_headers())
+
+    # ---------- Webhooks ----------
+
+    def create_hook(self, owner: str, repo: str, url: str, events: Sequence[str] = ("push",),
+                    secret: Optional[str] = None, content_type: str = "json", active: bool = True,
+                    branch_filter: str = "*") -> HttpResult:
+        """Register a Gitea-type webhook delivering `events` to `url` (signed when `secret` is set)."""
+        config = {"url": url, "content_type": content_type}
+        if secret:
+            config["secret"] = secret
+        payload = {"type": "gitea", "config": config, "events": list(events), "active": active,
+                   "branch_filter": branch_filter}
+        return self.post(f"repos/{owner}/{repo}/hooks", json=payload, headers=self._auth_headers())
+
+    def list_hooks(self, owner: str, repo: str) -> HttpResult:
+        return self.get(f"repos/{owner}/{repo}/hooks", headers=self._auth_headers())
+
+    def delete_hook(self, owner: str, repo: str, hook_id: int) -> HttpResult:
+        return self.delete(f"repos/{owner}/{repo}/hooks/{hook_id}", headers=self._auth_headers())
+
     # ---------- Admin: Users ----------
 
     def list_users(self) -> HttpResult:
@@ -138,3 +237,98 @@ class GiteaHttpClient(HttpClient):
 
     def delete_unadopted_repo(self, owner: str, repo_name: str) -> HttpResult:
         return self.delete(f"admin/unadopted/{owner}/{repo_name}", headers=self._auth_headers())
+
+    # ---------- Repository contents ----------
+
+    def tree_shas(self, owner: str, repo: str, ref: str) -> Dict[str, str]:
+        """Map path -> blob sha for every file at `ref` (empty when the repo or ref has no commits yet)."""
+        shas: Dict[str, str] = {}
+        page = 1
+        while True:
+            r = self.get(f"repos/{owner}/{repo}/git/trees/{ref}",
+                         params={"recursive": "true", "page": page, "per_page": 1000},
+                         headers=self._auth_headers())
+            if not r.ok() or not isinstance(r.json, dict):
+                return shas
+            shas.update({e["path"]: e["sha"] for e in r.json.get("tree") or [] if e.get("type") == "blob"})
+            if not r.json.get("truncated"):
+                return shas
+            page += 1
+
+    def _change_files_body(self, branch: str, message: str,
+                           batch: List[Tuple[str, str, Optional[str], FileContent]]) -> Iterator[bytes]:
+        """Stream the JSON body of POST repos/{owner}/{repo}/contents, base64-encoding content on the fly."""
+        yield json.dumps({"branch": branch, "message": message})[:-1].encode() + b', "files": ['
+        for i, (operation, path, sha, content) in enumerate(batch):
+            meta: Dict[str, str] = {"operation": operation, "path": path}
+            if sha:
+                meta["sha"] = sha
+            yield (b", " if i else b"") + json.dumps(meta)[:-1].encode()
+            if operation != "delete":
+                yield b', "content": "'
+                yield from _iter_base64(content)
+                yield b'"'
+            yield b"}"
+        yield b"]}"
+
+    def commit_files(self, owner: str, repo: str, branch: str, files: Mapping[str, FileContent],
+                     message: str, max_payload_bytes: int = 8 * 1024 * 1024) -> CommitFilesResult:
+        """
+        Create/update/delete many files with the batch contents endpoint (one commit per request).
+        `files` maps repo paths to content; None deletes the path, a Path is streamed from disk.
+        Existing paths are looked up once so create vs update is chosen per file. Files are packed
+        into requests of at most ~max_payload_bytes of encoded content (a larger single file gets
+        its own request); a request rejected with 413 is split in half and retried.
+        """
+        start = time.perf_counter()
+        existing = self.tree_shas(owner, repo, branch)
+        result = CommitFilesResult()
+
+        changes: List[Tuple[str, str, Optional[str], FileContent]] = []
+        for path, content in files.items():
+            sha = existing.get(path)
+            if content is None:
+                if sha is None:
+                    logger.warning("commit_files: %s not found in %s/%s@%s, skipping delete", path, owner, repo, branch)
+                    continue
+                changes.append(("delete", path, sha, None))
+            else:
+                changes.append(("update" if sha else "create", path, sha, content))
+
+        # Greedy packing by estimated request size (base64 grows content by 4/3)
+        batches: List[List[Tuple[str, str, Optional[str], FileContent]]] = []
+        current: List[Tuple[str, str, Optional[str], FileContent]] = []
+        current_size = 0
+        for change in changes:
+            size = 4 * ((_content_size(change[3]) + 2) // 3) + len(change[1]) + 128
+            if current and current_size + size > max_payload_bytes:
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(change)
+            current_size += size
+        if current:
+            batches.append(current)
+
+        def send(batch: List[Tuple[str, str, Optional[str], FileContent]]) -> bool:
+            r = self.post(f"repos/{owner}/{repo}/contents", data=self._change_files_body(branch, message, batch),
+                          headers={**self._auth_headers(), "Content-Type": "application/json"})
+            if r.status_code == 413 and len(batch) > 1:
+                logger.info("commit_files: %d files rejected as too large, splitting", len(batch))
+                half = len(batch) // 2
+                return send(batch[:half]) and send(batch[half:])
+            result.responses.append(r)
+            if not r.ok():
+                logger.error("commit_files %s/%s@%s failed: %s %s", owner, repo, branch, r.status_code, r.text)
+                return False
+            commit = (r.json or {}).get("commit") or {}
+            if commit.get("sha"):
+                result.commits.append(commit["sha"])
+            result.files += len(batch)
+            result.payload_bytes += sum(_content_size(c[3]) for c in batch)
+            return True
+
+        for batch in batches:
+            if not send(batch):
+                break
+        result.duration = time.perf_counter() - start
+        return result
@@ -0,0 +1,241 @@
+"""
+Git LFS API client (batch API + basic transfer adapter) with its own pooled session.
+
+Talks to `<repo>.git/info/lfs/objects/batch` directly, so LFS server throughput can be measured
+without the git-lfs client in the loop. Uploads stream files from disk, downloads stream to disk
+while hashing, and every download is checked against its oid (sha256):
+
+    lfs = LfsClient(gitea)
+    batch, transfers = lfs.upload_files("testuser", "test-repo", ["big.bin"])
+    batch, transfers = lfs.download_objects("testuser", "test-repo", [file_oid("big.bin")], "/tmp/out")
+    assert all(t.verified for t in transfers)
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+
+logger = logging.getLogger("gitguard")
+
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class LfsObject:
+    oid: str  # sha256 of the content
+    size: int
+
+
+def file_oid(path: Union[str, Path], chunk_size: int = HASH_CHUNK_SIZE) -> LfsObject:
+    """LFS object id of a file, hashed in `chunk_size` pieces."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return LfsObject(digest.hexdigest(), size)
+
+
+@dataclass
+class LfsBatchResult:
+    status_code: int
+    operation: str
+    objects: List[Dict[str, Any]] = field(default_factory=list)  # per-object entries of the response
+    duration: float = 0.0  # seconds
+    error: str = ""
+
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300 and not self.errors()
+
+    def errors(self) -> Dict[str, str]:
+        """oid -> message for objects the server refused (e.g. 404 on download)."""
+        return {o.get("oid", ""): (o.get("error") or {}).get("message", "")
+                for o in self.objects if o.get("error")}
+
+    def actions(self, oid: str) -> Dict[str, Any]:
+        """Actions (upload/verify/download) offered for `oid`; empty when there is nothing to transfer."""
+        return next((o.get("actions") or {} for o in self.objects if o.get("oid") == oid), {})
+
+
+@dataclass
+class LfsTransfer:
+    oid: str
+    size: int
+    operation: str  # "upload" or "download"
+    status_code: int = 0
+    bytes: int = 0
+    duration: float = 0.0  # seconds, including the verify call of an upload
+    sha256: str = ""  # download: hash of the received content
+    skipped: bool = False  # upload: the server already had the object
+    error: str = ""
+
+    def ok(self) -> bool:
+        return not self.error
+
+    @property
+    def verified(self) -> bool:
+        """Download whose content hashes to its oid."""
+        return self.operation == "download" and self.ok() and self.sha256 == self.oid
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.bytes / self.duration if self.duration > 0 else 0.0
+
+
+class LfsClient:
+    """
+    LFS batch/basic-transfer client reusing the GiteaHttpClient base URL and token (basic auth,
+    token as user name) over a session of its own; `pool_size` widens its pool for parallel transfers.
+    """
+
+    def __init__(self, gitea: GiteaHttpClient, base_url: Optional[str] = None, pool_size: Optional[int] = None,
+                 chunk_size: int = HASH_CHUNK_SIZE):
+        self.base_url = (base_url or gitea.base_url.removesuffix("/api/v1")).rstrip("/")
+        # own session: widening the pool must not swap the adapter of the (shared) API client's session
+        self.session = requests.Session()
+        self.timeout = gitea.timeout
+        self.token = gitea.token
+        self.chunk_size = chunk_size
+        if pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE}
+        if self.token:
+            basic = base64.b64encode(f"{self.token}:x-oauth-basic".encode()).decode()
+            headers["Authorization"] = f"Basic {basic}"
+        return headers
+
+    def _action_headers(self, action: Dict[str, Any]) -> Dict[str, str]:
+        headers = self._headers()
+        headers.update(action.get("header") or {})
+        return headers
+
+    def batch(self, owner: str, repo: str, operation: str, objects: Sequence[LfsObject],
+              ref: Optional[str] = None) -> LfsBatchResult:
+        """POST the batch request for `operation` ("upload"/"download") and `objects`."""
+        body: Dict[str, Any] = {"operation": operation, "transfers": ["basic"],
+                                "objects": [{"oid": o.oid, "size": o.size} for o in objects]}
+        if ref:
+            body["ref"] = {"name": ref}
+        url = f"{self.base_url}/{owner}/{repo}.git/info/lfs/objects/batch"
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(url, data=json.dumps(body), headers=self._headers(), timeout=self.timeout)
+        except Exception as e:
+            return LfsBatchResult(status_code=0, operation=operation, duration=time.perf_counter() - start,
+                                  error=str(e))
+        result = LfsBatchResult(status_code=resp.status_code, operation=operation,
+                                duration=time.perf_counter() - start)
+        try:
+            result.objects = resp.json().get("objects") or []
+        except ValueError:
+            result.error = resp.text[:500]
+        if not 200 <= resp.status_code < 300:
+            result.error = result.error or resp.text[:500]
+        logger.debug("LFS batch %s %s/%s (%d objects) -> %s in %.3fs", operation, owner, repo, len(objects),
+                     resp.status_code, result.duration)
+        return result
+
+    def upload(self, obj: LfsObject, path: Union[str, Path], actions: Dict[str, Any]) -> LfsTransfer:
+        """Stream `path` to the upload action and call the verify action if the server asked for it."""
+        transfer = LfsTransfer(oid=obj.oid, size=obj.size, operation="upload")
+        if "upload" not in actions:
+            transfer.skipped = True
+            return transfer
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as fh:
+                headers = self._action_headers(actions["upload"])
+                headers.update({"Content-Type": "application/octet-stream", "Content-Length": str(obj.size)})
+                resp = self.session.put(actions["upload"]["href"], data=fh, headers=headers, timeout=self.timeout)
+            transfer.status_code = resp.status_code
+            if not 200 <= resp.status_code < 300:
+                transfer.error = f"upload failed: {resp.status_code} {resp.text[:200]}"
+            elif "verify" in actions:
+                resp = self.session.post(actions["verify"]["href"], data=json.dumps({"oid": obj.oid, "size": obj.size}),
+                                         headers=self._action_headers(actions["verify"]), timeout=self.timeout)
+                if not 200 <= resp.status_code < 300:
+                    transfer.error = f"verify failed: {resp.status_code} {resp.text[:200]}"
+            transfer.bytes = obj.size if transfer.ok() else 0
+        except Exception as e:
+            transfer.error = str(e)
+        transfer.duration = time.perf_counter() - start
+        return transfer
+
+    def download(self, obj: LfsObject, dest: Union[str, Path], actions: Dict[str, Any]) -> LfsTransfer:
+        """Stream the download action into `dest` (via `<dest>.part`), hashing on the fly."""
+        transfer = LfsTransfer(oid=obj.oid, size=obj.size, operation="download")
+        if "download" not in actions:
+            transfer.error = "no download action offered"
+            return transfer
+        target = Path(dest)
+        partial = target.with_name(target.name + ".part")
+        digest = hashlib.sha256()
+        start = time.perf_counter()
+        try:
+            with self.session.get(actions["download"]["href"], headers=self._action_headers(actions["download"]),
+                                  stream=True, timeout=self.timeout) as resp:
+                transfer.status_code = resp.status_code
+                if not 200 <= resp.status_code < 300:
+                    transfer.error = f"download failed: {resp.status_code}"
+                else:
+                    partial.parent.mkdir(parents=True, exist_ok=True)
+                    with open(partial, "wb") as out:
+                        for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                            out.write(chunk)
+                            digest.update(chunk)
+                            transfer.bytes += len(chunk)
+            transfer.sha256 = digest.hexdigest() if transfer.ok() else ""
+            if transfer.ok() and transfer.sha256 != obj.oid:
+                transfer.error = f"integrity check failed: got sha256 {transfer.sha256}"
+            if transfer.ok():
+                os.replace(partial, target)
+        except Exception as e:
+            transfer.error = str(e)
+        finally:
+            partial.unlink(missing_ok=True)
+        transfer.duration = time.perf_counter() - start
+        return transfer
+
+    def upload_files(self, owner: str, repo: str, paths: Sequence[Union[str, Path]], max_parallel: int = 4,
+                     ref: Optional[str] = None) -> Tuple[LfsBatchResult, List[LfsTransfer]]:
+        """Hash, batch and upload files (objects the server already has are skipped)."""
+        objects = [file_oid(p, self.chunk_size) for p in paths]
+        batch = self.batch(owner, repo, "upload", objects, ref=ref)
+        if batch.status_code == 0 or not 200 <= batch.status_code < 300:
+            return batch, []
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            transfers = list(pool.map(lambda item: self.upload(item[0], item[1], batch.actions(item[0].oid)),
+                                      zip(objects, paths)))
+        return batch, transfers
+
+    def download_objects(self, owner: str, repo: str, objects: Sequence[LfsObject], dest_dir: Union[str, Path],
+                         max_parallel: int = 4, ref: Optional[str] = None) -> Tuple[LfsBatchResult, List[LfsTransfer]]:
+        """Batch and download objects into `dest_dir/<oid>`, verifying each against its oid."""
+        batch = self.batch(owner, repo, "download", objects, ref=ref)
+        if batch.status_code == 0 or not 200 <= batch.status_code < 300:
+            return batch, []
+        dest = Path(dest_dir)
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            transfers = list(pool.map(lambda o: self.download(o, dest / o.oid, batch.actions(o.oid)), objects))
+        return batch, transfers
@@ -0,0 +1,98 @@
+"""
+Subprocess helper that owns the whole process tree of a command.
+
+git forks helpers (`git-remote-http`, `ssh`, `index-pack`, ...) that outlive a killed `git`
+parent and keep holding sockets, pipes and CPU. run_process() starts the command in its own
+session (so it leads a new process group), and on timeout terminates the whole group
+(SIGTERM, then SIGKILL after a grace period) before collecting whatever output was produced.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+
+from typing import Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger("gitguard")
+
+TERMINATE_GRACE = 2.0  # seconds between SIGTERM and SIGKILL
+
+
+def kill_process_group(proc: subprocess.Popen, grace: float = TERMINATE_GRACE) -> None:
+    """SIGTERM the process group led by `proc`, wait up to `grace` for the leader, then SIGKILL the group."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return  # group already gone
+        except PermissionError:
+            logger.warning("Not allowed to signal process group %d", proc.pid)
+            return
+        if sig == signal.SIGTERM:
+            try:
+                proc.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                pass
+
+
+def run_process(cmd: Sequence[str], cwd: Optional[str] = None, env: Optional[dict] = None,
+                timeout: Optional[float] = None, input: Optional[Union[str, bytes]] = None,
+                text: bool = True, grace: float = TERMINATE_GRACE) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() look-alike (stdout/stderr captured, no check) that kills the whole process
+    group on timeout. The raised subprocess.TimeoutExpired carries the partial output read so far.
+    """
+    with subprocess.Popen(cmd, cwd=cwd, env=env, text=text, start_new_session=True,
+                          stdin=subprocess.PIPE if input is not None else None,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        try:
+            out, err = proc.communicate(input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(proc, grace)
+            # with the group gone every pipe writer is closed, so this returns promptly with all buffered output
+            out, err = proc.communicate()
+            raise subprocess.TimeoutExpired(list(cmd), timeout, output=out, stderr=err) from None
+        except BaseException:
+            kill_process_group(proc, grace=0)
+            raise
+    return subprocess.CompletedProcess(list(cmd), proc.returncode, out, err)
+
+
+def iter_process_output(cmd: Sequence[str], cwd: Optional[str] = None, env: Optional[dict] = None,
+                        sep: bytes = b"\n", chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Yield the `sep`-delimited records of a command's stdout as they arrive, never holding more
+    than one chunk plus a partial record in memory. stderr is drained by a background thread.
+    A non-zero exit raises subprocess.CalledProcessError (with stderr) after the last record;
+    closing the generator early kills the command's process group.
+    """
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, start_new_session=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr: List[bytes] = []
+    drain = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    finished = False
+    try:
+        buf = bytearray()
+        while chunk := proc.stdout.read1(chunk_size):
+            buf.extend(chunk)
+            start = 0
+            while (end := buf.find(sep, start)) != -1:
+                yield bytes(buf[start:end])
+                start = end + 1
+            del buf[:start]
+        if buf:
+            yield bytes(buf)
+        finished = True
+    finally:
+        if not finished:
+            kill_process_group(proc, grace=0)
+        proc.stdout.close()
+        rc = proc.wait()
+        drain.join()
+        proc.stderr.close()
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, list(cmd), stderr=b"".join(stderr))
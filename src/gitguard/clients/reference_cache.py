@@ -0,0 +1,120 @@
+"""
+Shared bare reference repositories for repeated clones of the same remote.
+
+The e2e suite clones the same few repositories over and over; every clone would transfer and
+store the full object set again. A ReferenceCache keeps one bare mirror per remote URL under
+`root` (kept up to date with `fetch --prune`) and GitClient.clone borrows its objects with
+`--reference-if-able`, so only objects missing from the cache travel over the network:
+
+    cache = ReferenceCache("/tmp/gitguard-refcache")
+    git = GitClient(workdir=str(tmp_path), reference_cache=cache)
+    git.clone(repo_url="http://gitea:3000/testuser/test-repo.git")
+
+Concurrent processes (xdist workers) share the cache safely through flock(2): updates take an
+exclusive lock, clones that borrow objects hold a shared lock for the duration of the clone.
+Cache repositories are never garbage collected (gc.auto=0), so objects borrowed through
+alternates stay available; with dissociate=True clones copy the borrowed objects and stop
+depending on the cache.
+"""
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import logging
+import re
+import shutil
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from gitguard.clients.git_client import GitClient
+
+logger = logging.getLogger("gitguard")
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class ReferenceCache:
+    """
+    One bare mirror per remote URL: `<root>/<name>-<sha1(url)[:12]>.git` plus a `.lock` file.
+    A mirror fetched less than `refresh_interval` seconds ago is used as is; a stale reference only
+    means more objects are fetched by the clone itself, never a wrong result.
+    """
+
+    def __init__(self, root: str, refresh_interval: float = 30.0, dissociate: bool = False,
+                 lock_timeout: float = 300.0, timeout: Optional[float] = 600):
+        self.root = Path(root)
+        self.refresh_interval = refresh_interval
+        self.dissociate = dissociate
+        self.lock_timeout = lock_timeout
+        self.timeout = timeout
+
+    def path_for(self, url: str) -> Path:
+        name = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git") or "repo"
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        return self.root / f"{_UNSAFE_RE.sub('_', name)}-{digest}.git"
+
+    @contextlib.contextmanager
+    def locked(self, url: str, exclusive: bool = True) -> Iterator[Path]:
+        """flock the cache entry of `url` (exclusive for updates, shared for readers)."""
+        path = self.path_for(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        deadline = time.monotonic() + self.lock_timeout
+        with open(path.with_name(path.name + ".lock"), "a+") as fh:
+            while True:
+                try:
+                    fcntl.flock(fh.fileno(), mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for reference cache lock of {url}")
+                    time.sleep(0.05)
+            try:
+                yield path
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _is_fresh(self, path: Path) -> bool:
+        stamp = path / "FETCH_HEAD"
+        if not stamp.exists():
+            stamp = path / "HEAD"
+        return time.time() - stamp.stat().st_mtime < self.refresh_interval
+
+    def ensure(self, git: "GitClient", url: str) -> Optional[Path]:
+        """
+        Create or refresh the reference mirror of `url` under the exclusive lock.
+        Returns its path, or None when it could not be created (the caller clones without reference).
+        """
+        with self.locked(url) as path:
+            if path.is_dir():
+                if self._is_fresh(path):
+                    return path
+                res = git._run(["-c", "gc.auto=0", "fetch", "--prune", "origin"], cwd=str(path),
+                               timeout=self.timeout, retry_safe=True)
+                if not res.ok():
+                    # the old objects are still a valid reference
+                    logger.warning("Refreshing reference cache %s failed: %s", path, res.stderr)
+                return path
+
+            partial = path.with_name(path.name + ".partial")
+            shutil.rmtree(partial, ignore_errors=True)
+            res = git._run(["clone", "--mirror", "-c", "gc.auto=0", url, str(partial)], cwd=str(self.root),
+                           timeout=self.timeout, retry_safe=True,
+                           before_retry=lambda: shutil.rmtree(partial, ignore_errors=True))
+            if not res.ok():
+                shutil.rmtree(partial, ignore_errors=True)
+                logger.warning("Creating reference cache for %s failed: %s", url, res.stderr)
+                return None
+            partial.replace(path)
+            logger.info("Created reference cache %s for %s in %.2fs", path, url, res.duration)
+            return path
+
+    def clone_args(self, path: Path) -> list:
+        args = ["--reference-if-able", str(path)]
+        if self.dissociate:
+            args.append("--dissociate")
+        return args
@@ -0,0 +1,181 @@
+"""
+Pure-Python smart-HTTP protocol v2 client for ref advertisement.
+
+Reads refs with a single `ls-refs` POST to `<repo>.git/git-upload-pack` over a pooled requests
+session of its own, so polling many repositories costs keep-alive HTTP
+requests instead of a `git` process plus a transport helper each, and the server's ref
+advertisement latency can be measured on its own.
+
+pkt-line framing (gitprotocol-common): 4 hex digits of length (including themselves) followed
+by the payload; "0000" flush, "0001" delimiter, "0002" response-end.
+"""
+from __future__ import annotations
+
+import base64
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+
+logger = logging.getLogger("gitguard")
+
+FLUSH_PKT = b"0000"
+DELIM_PKT = b"0001"
+RESPONSE_END_PKT = b"0002"
+MAX_PKT_PAYLOAD = 65516
+AGENT = "gitguard/1.0"
+
+
+def pkt_line(payload: Union[str, bytes]) -> bytes:
+    """Frame one payload as a pkt-line."""
+    data = payload.encode() if isinstance(payload, str) else payload
+    if len(data) > MAX_PKT_PAYLOAD:
+        raise ValueError(f"pkt-line payload too long: {len(data)} bytes")
+    return b"%04x" % (len(data) + 4) + data
+
+
+def iter_pkt_lines(data: bytes) -> Iterator[Union[bytes, None]]:
+    """
+    Decode pkt-lines: yields payloads (trailing LF stripped) and None for flush/delim/response-end
+    packets. Raises ValueError on truncated or malformed framing.
+    """
+    pos = 0
+    while pos < len(data):
+        header = data[pos:pos + 4]
+        try:
+            length = int(header, 16)
+        except ValueError:
+            raise ValueError(f"invalid pkt-line header {header!r} at offset {pos}") from None
+        if length < 4:
+            pos += 4
+            yield None
+            continue
+        if pos + length > len(data):
+            raise ValueError(f"truncated pkt-line at offset {pos}: need {length} bytes")
+        payload = data[pos + 4:pos + length]
+        pos += length
+        yield payload[:-1] if payload.endswith(b"\n") else payload
+
+
+def encode_command(command: str, args: Sequence[str] = (), capabilities: Sequence[str] = ()) -> bytes:
+    """Protocol v2 request: command + capabilities, delimiter, arguments, flush."""
+    body = [pkt_line(f"command={command}\n"), pkt_line(f"agent={AGENT}\n")]
+    body += [pkt_line(f"{cap}\n") for cap in capabilities]
+    body.append(DELIM_PKT)
+    body += [pkt_line(f"{arg}\n") for arg in args]
+    body.append(FLUSH_PKT)
+    return b"".join(body)
+
+
+@dataclass
+class RefAdvertisement:
+    """Parsed `ls-refs` response of one repository."""
+    status_code: int
+    refs: Dict[str, str] = field(default_factory=dict)  # ref -> oid
+    peeled: Dict[str, str] = field(default_factory=dict)  # annotated tag -> commit oid
+    symrefs: Dict[str, str] = field(default_factory=dict)  # e.g. HEAD -> refs/heads/main
+    duration: float = 0.0  # full request/response, seconds
+    ttfb: float = 0.0  # until response headers arrived
+    bytes_received: int = 0
+    error: str = ""
+
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300 and not self.error
+
+
+def parse_ls_refs(data: bytes) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    """Parse `<oid> <ref>[ symref-target:<ref>][ peeled:<oid>]` lines of an ls-refs response."""
+    refs: Dict[str, str] = {}
+    peeled: Dict[str, str] = {}
+    symrefs: Dict[str, str] = {}
+    for line in iter_pkt_lines(data):
+        if line is None:
+            break
+        if line.startswith(b"ERR "):
+            raise ValueError(line[4:].decode(errors="replace"))
+        if b"\0" in line or line.startswith(b"# service="):
+            raise ValueError("server answered with protocol v0/v1, not v2")
+        oid, name, *attributes = line.decode().split(" ")
+        refs[name] = oid
+        for attr in attributes:
+            key, _, value = attr.partition(":")
+            if key == "symref-target":
+                symrefs[name] = value
+            elif key == "peeled":
+                peeled[name] = value
+    return refs, peeled, symrefs
+
+
+class SmartHttpClient:
+    """
+    Protocol v2 `ls-refs` over Gitea's smart-HTTP endpoint, reusing the GiteaHttpClient base URL
+    and token over a session of its own; `pool_size` widens that session's per-host connection
+    pool for concurrent polling.
+    """
+
+    def __init__(self, gitea: GiteaHttpClient, base_url: Optional[str] = None, pool_size: Optional[int] = None):
+        self.base_url = (base_url or gitea.base_url.removesuffix("/api/v1")).rstrip("/")
+        # own session: widening the pool must not swap the adapter of the (shared) API client's session
+        self.session = requests.Session()
+        self.timeout = gitea.timeout
+        self.token = gitea.token
+        if pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {
+            "Content-Type": "application/x-git-upload-pack-request",
+            "Accept": "application/x-git-upload-pack-result",
+            "Git-Protocol": "version=2",
+            "User-Agent": f"git/{AGENT}",
+        }
+        if self.token:
+            # git smart-HTTP takes the token as basic-auth credentials
+            basic = base64.b64encode(f"{self.token}:x-oauth-basic".encode()).decode()
+            headers["Authorization"] = f"Basic {basic}"
+        return headers
+
+    def ls_refs(self, owner: str, repo: str, prefixes: Sequence[str] = (), peel: bool = True,
+                symrefs: bool = True) -> RefAdvertisement:
+        """Advertised refs of owner/repo, filtered server-side by `prefixes` (ref-prefix)."""
+        args = (["peel"] if peel else []) + (["symrefs"] if symrefs else [])
+        args += [f"ref-prefix {p}" for p in prefixes]
+        url = f"{self.base_url}/{owner}/{repo}.git/git-upload-pack"
+
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(url, data=encode_command("ls-refs", args, ["object-format=sha1"]),
+                                     headers=self._headers(), timeout=self.timeout)
+        except Exception as e:
+            return RefAdvertisement(status_code=0, duration=time.perf_counter() - start, error=str(e))
+        result = RefAdvertisement(status_code=resp.status_code, duration=time.perf_counter() - start,
+                                  ttfb=resp.elapsed.total_seconds(), bytes_received=len(resp.content))
+        if not result.ok():
+            result.error = resp.text[:500]
+        else:
+            try:
+                result.refs, result.peeled, result.symrefs = parse_ls_refs(resp.content)
+            except ValueError as e:
+                result.error = str(e)
+        logger.debug("ls-refs %s/%s -> %s, %d refs in %.3fs", owner, repo, resp.status_code,
+                     len(result.refs), result.duration)
+        return result
+
+    def ls_refs_many(self, repos: Sequence[Tuple[str, str]], prefixes: Sequence[str] = (),
+                     max_parallel: int = 16) -> Dict[str, RefAdvertisement]:
+        """ls_refs() for many (owner, repo) pairs concurrently, keyed by "owner/repo"."""
+        def one(item: Tuple[str, str]) -> Tuple[str, RefAdvertisement]:
+            owner, repo = item
+            return f"{owner}/{repo}", self.ls_refs(owner, repo, prefixes=prefixes)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            return dict(pool.map(one, repos))
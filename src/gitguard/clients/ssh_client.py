@@ -4,8 +4,13 @@ import subprocess
 import logging
 import datetime
 import shlex
+import tarfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List
+from typing import IO, Callable, Dict, Iterator, Optional, List, Sequence, Tuple, Union
 
 try:
     import allure
@@ -16,17 +21,110 @@ except Exception:
 logger = logging.getLogger("gitguard")
 
 
+# Return code reported for commands killed after exceeding their timeout (same as coreutils `timeout`)
+TIMEOUT_RC = 124
+
+# Chunk size used when streaming tar archives through the ssh channel
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+
+# tarfile stream mode suffix -> GNU tar flag used on the remote side
+_TAR_COMPRESSION_FLAGS = {None: "", "gz": "z", "bz2": "j", "xz": "J"}
+
+
 class SSHResult:
     """Result of an SSH command."""
-    def __init__(self, code: int, stdout: str, stderr: str, duration: float):
+    def __init__(self, code: int, stdout: str, stderr: str, duration: float,
+                 host: Optional[str] = None, command: Optional[str] = None, timed_out: bool = False):
         self.code = code
         self.stdout = stdout
         self.stderr = stderr
         self.duration = duration
+        self.host = host
+        self.command = command
+        self.timed_out = timed_out
+
+    def ok(self) -> bool:
+        return self.code == 0
+
+
+class SSHBatchResult:
+    """Aggregated result of a fan-out execution (see SSHClient.run_many)."""
+    def __init__(self, results: List[SSHResult], wall_time: float):
+        self.results = results
+        self.wall_time = wall_time
+
+    def ok(self) -> bool:
+        return all(r.ok() for r in self.results)
+
+    @property
+    def failed(self) -> List[SSHResult]:
+        return [r for r in self.results if not r.ok()]
+
+    @property
+    def timed_out(self) -> List[SSHResult]:
+        return [r for r in self.results if r.timed_out]
+
+    def durations_by_host(self) -> Dict[str, float]:
+        """Total time spent per host (sum over all commands executed on it)."""
+        totals: Dict[str, float] = {}
+        for r in self.results:
+            totals[r.host or ""] = totals.get(r.host or "", 0.0) + r.duration
+        return totals
+
+    @property
+    def serial_time(self) -> float:
+        """Time the same work would have taken when executed one command after another."""
+        return sum(r.duration for r in self.results)
+
+
+class SSHTransferResult:
+    """Result of a streamed directory transfer (see SSHClient.upload_tree / download_tree)."""
+    def __init__(self, code: int, direction: str, bytes_transferred: int, payload_bytes: int,
+                 files: int, duration: float, stderr: str = "", timed_out: bool = False):
+        self.code = code
+        self.direction = direction
+        self.bytes_transferred = bytes_transferred  # bytes on the wire (after compression)
+        self.payload_bytes = payload_bytes  # uncompressed size of transferred files
+        self.files = files
+        self.duration = duration
+        self.stderr = stderr
+        self.timed_out = timed_out
 
     def ok(self) -> bool:
         return self.code == 0
 
+    @property
+    def throughput(self) -> float:
+        """Wire throughput in bytes per second."""
+        return self.bytes_transferred / self.duration if self.duration > 0 else 0.0
+
+
+class _CountingWriter:
+    """Write-only file object forwarding to `raw` and counting bytes."""
+    def __init__(self, raw: IO[bytes]):
+        self.raw = raw
+        self.bytes = 0
+
+    def write(self, data: bytes) -> int:
+        self.raw.write(data)
+        self.bytes += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+class _CountingReader:
+    """Read-only file object reading from `raw` and counting bytes."""
+    def __init__(self, raw: IO[bytes]):
+        self.raw = raw
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.bytes += len(chunk)
+        return chunk
+
 
 class SSHClient:
     """
@@ -59,12 +157,14 @@ class SSHClient:
 
         ts = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         self.log_path = self.artifacts / f"ssh-client-{ts}.log"
+        # run_many() executes commands from worker threads; serialize log writes
+        self._log_lock = threading.Lock()
 
-    def _build_ssh_command(self, remote_cmd: str) -> List[str]:
+    def _build_ssh_command(self, remote_cmd: str, host: Optional[str] = None) -> List[str]:
         cmd = ["ssh", "-p", str(self.port), "-o", "StrictHostKeyChecking=no"]
         if self.key_path:
             cmd += ["-i", str(self.key_path)]
-        cmd.append(f"{self.user}@{self.host}")
+        cmd.append(f"{self.user}@{host or self.host}")
         cmd.append(remote_cmd)
         return cmd
 
@@ -76,7 +176,7 @@ class SSHClient:
             f"Duration: {duration:.6f} sec\n"
             f"---\n"
         )
-        with open(self.log_path, "a", encoding="utf-8") as f:
+        with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
             f.write(header)
             if out:
                 f.write("STDOUT:\n" + out + "\n")
@@ -87,20 +187,35 @@ class SSHClient:
         if not (self.attach_logs_always and _HAS_ALLURE):
             return
         try:
-            with open(self.log_path, "rb") as fh:
+            with self._log_lock, open(self.log_path, "rb") as fh:
                 allure.attach(fh.read(), name="ssh-client-log", attachment_type=allure.attachment_type.TEXT)
         except Exception as e:
             logger.exception("Failed to attach SSH log: %s", e)
 
-    def run(self, remote_cmd: str, check: bool = True) -> SSHResult:
-        cmd = self._build_ssh_command(remote_cmd)
+    def run(self, remote_cmd: str, check: bool = True, timeout: Optional[float] = None,
+            host: Optional[str] = None) -> SSHResult:
+        """
+        Run `remote_cmd` on `host` (defaults to the client host).
+        If `timeout` is exceeded the ssh child is killed and the result has `timed_out=True`
+        and code TIMEOUT_RC; with `check=True` a TimeoutError is raised instead.
+        """
+        target = host or self.host
+        cmd = self._build_ssh_command(remote_cmd, host=target)
         logger.debug("Running SSH command: %s", shlex.join(cmd))
 
-        start = datetime.datetime.utcnow()
+        timed_out = False
+        start = time.perf_counter()
         proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        out, err = proc.communicate()
-        duration = (datetime.datetime.utcnow() - start).total_seconds()
-        rc = proc.returncode
+        try:
+            out, err = proc.communicate(timeout=timeout)
+            rc = proc.returncode
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            proc.kill()
+            # collect whatever the child managed to print before it was killed
+            out, err = proc.communicate()
+            rc = TIMEOUT_RC
+        duration = time.perf_counter() - start
 
         # logging
         try:
@@ -109,9 +224,213 @@ class SSHClient:
         except Exception:
             logger.exception("SSH logging failed")
 
-        result = SSHResult(code=rc, stdout=(out or "").strip(), stderr=(err or "").strip(), duration=duration)
+        result = SSHResult(code=rc, stdout=(out or "").strip(), stderr=(err or "").strip(), duration=duration,
+                           host=target, command=remote_cmd, timed_out=timed_out)
 
+        if check and timed_out:
+            raise TimeoutError(f"SSH command timed out after {timeout}s on {target}: {remote_cmd}")
         if check and not result.ok():
             raise RuntimeError(f"SSH command failed: {rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}")
 
         return result
+
+    # -----------------
+    # Parallel fan-out
+    # -----------------
+    @staticmethod
+    def _expand_targets(hosts: Optional[Sequence[str]],
+                        commands: Union[str, Sequence[str]],
+                        default_host: str) -> List[Tuple[str, str]]:
+        """Build (host, command) pairs: every command is executed on every host."""
+        cmds = [commands] if isinstance(commands, str) else list(commands)
+        targets = list(hosts) if hosts else [default_host]
+        return [(h, c) for h in targets for c in cmds]
+
+    def iter_many(
+        self,
+        commands: Union[str, Sequence[str]],
+        hosts: Optional[Sequence[str]] = None,
+        max_parallel: int = 8,
+        timeout: Optional[float] = None,
+    ) -> Iterator[SSHResult]:
+        """
+        Execute every command on every host concurrently (at most `max_parallel` ssh processes)
+        and yield results in completion order. Each command is killed after `timeout` seconds.
+        Failures never raise; inspect `SSHResult.ok()` / `SSHResult.timed_out`.
+        """
+        pairs = self._expand_targets(hosts, commands, self.host)
+        if not pairs:
+            return
+        workers = max(1, min(max_parallel, len(pairs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ssh-fanout") as pool:
+            futures = {
+                pool.submit(self.run, cmd, check=False, timeout=timeout, host=host): (host, cmd)
+                for host, cmd in pairs
+            }
+            for fut in as_completed(futures):
+                host, cmd = futures[fut]
+                try:
+                    yield fut.result()
+                except Exception as e:  # e.g. ssh binary missing
+                    logger.exception("SSH fan-out command failed to start on %s: %s", host, cmd)
+                    yield SSHResult(code=255, stdout="", stderr=str(e), duration=0.0, host=host, command=cmd)
+
+    def run_many(
+        self,
+        commands: Union[str, Sequence[str]],
+        hosts: Optional[Sequence[str]] = None,
+        max_parallel: int = 8,
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[SSHResult], None]] = None,
+    ) -> SSHBatchResult:
+        """
+        Fan-out execution across hosts and/or commands.
+        `on_result` is called for every result as soon as it completes (streaming);
+        the returned SSHBatchResult aggregates all results and per-host durations.
+        """
+        start = time.perf_counter()
+        results: List[SSHResult] = []
+        for result in self.iter_many(commands, hosts=hosts, max_parallel=max_parallel, timeout=timeout):
+            results.append(result)
+            if on_result:
+                on_result(result)
+        wall_time = time.perf_counter() - start
+
+        batch = SSHBatchResult(results=results, wall_time=wall_time)
+        logger.info("SSH fan-out: %d commands on %d hosts in %.3fs (serial %.3fs), %d failed, %d timed out",
+                    len(results), len(batch.durations_by_host()), wall_time, batch.serial_time,
+                    len(batch.failed), len(batch.timed_out))
+        return batch
+
+    # ------------------------
+    # Streaming tar transfers
+    # ------------------------
+    @staticmethod
+    def _tar_flag(compress: Optional[str]) -> str:
+        if compress not in _TAR_COMPRESSION_FLAGS:
+            raise ValueError(f"Unsupported compression '{compress}', expected one of gz/bz2/xz or None")
+        return _TAR_COMPRESSION_FLAGS[compress]
+
+    def _stream_tar(self, direction: str, remote_cmd: str, compress: Optional[str], timeout: Optional[float],
+                    host: Optional[str], pump: Callable[[subprocess.Popen], Tuple[int, int, int]]
+                    ) -> SSHTransferResult:
+        """
+        Spawn ssh with binary stdin/stdout pipes and let `pump` stream the tar archive through them.
+        `pump` returns (wire bytes, payload bytes, files). stderr is drained in a background thread
+        so a chatty remote tar can never block the transfer; `timeout` kills the ssh child.
+        """
+        cmd = self._build_ssh_command(remote_cmd, host=host)
+        logger.debug("Streaming tar (%s, compress=%s): %s", direction, compress, shlex.join(cmd))
+
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE if direction == "download" else subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, bufsize=TRANSFER_CHUNK_SIZE)
+        stderr_chunks: List[bytes] = []
+        drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+        drain.start()
+
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        killer = threading.Timer(timeout, _kill) if timeout else None
+        if killer:
+            killer.start()
+
+        wire = payload = files = 0
+        error: Optional[BaseException] = None
+        try:
+            wire, payload, files = pump(proc)
+        except (OSError, tarfile.TarError) as e:
+            # broken pipe / truncated stream: the remote side failed, its stderr tells why
+            error = e
+        finally:
+            for pipe in (proc.stdin, proc.stdout):
+                try:
+                    if pipe:
+                        pipe.close()
+                except OSError:
+                    pass
+            rc = proc.wait()
+            if killer:
+                killer.cancel()
+            drain.join()
+        duration = time.perf_counter() - start
+
+        err = b"".join(c for c in stderr_chunks if c).decode("utf-8", errors="replace")
+        if error is not None:
+            err = f"{err}\n{error}".strip()
+            rc = rc or 1
+        if timed_out.is_set():
+            rc = TIMEOUT_RC
+
+        summary = (f"{direction}: {files} files, {payload} payload bytes, {wire} wire bytes "
+                   f"in {duration:.3f}s ({wire / duration if duration > 0 else 0:.0f} B/s)")
+        try:
+            self._write_log(cmd, rc, summary, err, duration)
+            self._attach_log_to_allure()
+        except Exception:
+            logger.exception("SSH logging failed")
+        logger.info("SSH %s", summary)
+
+        return SSHTransferResult(code=rc, direction=direction, bytes_transferred=wire, payload_bytes=payload,
+                                 files=files, duration=duration, stderr=err.strip(), timed_out=timed_out.is_set())
+
+    def upload_tree(self, local_dir: str, remote_dir: str, compress: Optional[str] = None,
+                    timeout: Optional[float] = None, host: Optional[str] = None) -> SSHTransferResult:
+        """
+        Upload the contents of `local_dir` into `remote_dir` as a single tar stream over one ssh channel.
+        Nothing is buffered to disk on either side; `compress` is one of None/"gz"/"bz2"/"xz".
+        """
+        flag = self._tar_flag(compress)
+        src = Path(local_dir)
+        if not src.is_dir():
+            raise FileNotFoundError(f"Local directory not found: {src}")
+        dest = shlex.quote(remote_dir)
+        remote_cmd = f"mkdir -p {dest} && tar -x{flag}f - -C {dest}"
+
+        def pump(proc: subprocess.Popen) -> Tuple[int, int, int]:
+            writer = _CountingWriter(proc.stdin)
+            payload = files = 0
+            with tarfile.open(fileobj=writer, mode=f"w|{compress or ''}", bufsize=TRANSFER_CHUNK_SIZE) as tar:
+                for path in sorted(src.rglob("*")):
+                    info = tar.gettarinfo(str(path), arcname=str(path.relative_to(src)))
+                    if info.isreg():
+                        with open(path, "rb") as fh:
+                            tar.addfile(info, fh)
+                        payload += info.size
+                        files += 1
+                    else:
+                        tar.addfile(info)
+            proc.stdin.flush()
+            return writer.bytes, payload, files
+
+        return self._stream_tar("upload", remote_cmd, compress, timeout, host, pump)
+
+    def download_tree(self, remote_dir: str, local_dir: str, compress: Optional[str] = None,
+                      timeout: Optional[float] = None, host: Optional[str] = None) -> SSHTransferResult:
+        """
+        Download the contents of `remote_dir` into `local_dir` as a single tar stream over one ssh channel.
+        The archive is extracted while it is being received (no temporary files).
+        """
+        flag = self._tar_flag(compress)
+        dest = Path(local_dir)
+        dest.mkdir(parents=True, exist_ok=True)
+        remote_cmd = f"tar -c{flag}f - -C {shlex.quote(remote_dir)} ."
+
+        def pump(proc: subprocess.Popen) -> Tuple[int, int, int]:
+            reader = _CountingReader(proc.stdout)
+            payload = files = 0
+            with tarfile.open(fileobj=reader, mode=f"r|{compress or ''}", bufsize=TRANSFER_CHUNK_SIZE) as tar:
+                for member in tar:
+                    # "data" refuses absolute or ../ paths and links leaving `dest` (tarfile.FilterError)
+                    tar.extract(member, path=str(dest), filter="data")
+                    if member.isreg():
+                        payload += member.size
+                        files += 1
+            return reader.bytes, payload, files
+
+        return self._stream_tar("download", remote_cmd, compress, timeout, host, pump)
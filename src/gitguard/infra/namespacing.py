@@ -0,0 +1,65 @@
+"""
+Per-worker resource namespacing for running e2e tests with pytest-xdist.
+
+Every xdist worker gets its own users, repositories, organisations and git identity,
+so tests never race on shared server-side state. Without xdist (worker id "master")
+names are returned unchanged, which keeps serial runs identical to before.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+
+from pathlib import Path
+from typing import Optional
+
+MASTER_WORKER = "master"
+
+
+def worker_id() -> str:
+    """xdist worker id ("gw0", "gw1", ...) or "master" when not running under xdist."""
+    return os.getenv("PYTEST_XDIST_WORKER", MASTER_WORKER)
+
+
+class ResourceNamespace:
+    """
+    Name factory for server-side resources, keyed by the xdist worker id.
+    ns.user("testuser") -> "testuser" (serial) / "testuser-gw3" (worker gw3)
+    """
+
+    def __init__(self, worker: Optional[str] = None, email_domain: str = "example.com"):
+        self.worker = worker or worker_id()
+        self.email_domain = email_domain
+
+    @property
+    def suffix(self) -> str:
+        return "" if self.worker == MASTER_WORKER else f"-{self.worker}"
+
+    def name(self, base: str) -> str:
+        return f"{base}{self.suffix}"
+
+    def user(self, base: str) -> str:
+        return self.name(base)
+
+    def repo(self, base: str) -> str:
+        return self.name(base)
+
+    def org(self, base: str) -> str:
+        return self.name(base)
+
+    def email(self, local_part: str) -> str:
+        """Gitea enforces unique emails, so they are namespaced too."""
+        return f"{self.name(local_part)}@{self.email_domain}"
+
+
+def write_git_config(path: Path, user_name: str, user_email: str) -> Path:
+    """
+    Write a standalone git config file with the given identity, meant to be used as
+    GIT_CONFIG_GLOBAL so each worker has its own "global" config instead of ~/.gitconfig.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    for key, value in (("user.name", user_name), ("user.email", user_email)):
+        subprocess.run(["git", "config", "--file", str(path), key, value], check=True)
+    return path
@@ -0,0 +1,223 @@
+"""
+Readiness prober for the Gitea stack.
+
+Probes the HTTP health endpoint, the SSH banner and the git daemon concurrently with
+exponential backoff (starting at a few milliseconds) and returns as soon as every
+service answers, recording the time-to-ready of each one.
+
+Only the standard library is used so the module can run on a bare CI runner:
+
+    PYTHONPATH=src python3 -m gitguard.infra.readiness --url http://localhost:3000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+from urllib.parse import urlparse
+
+logger = logging.getLogger("gitguard")
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of a single probe."""
+    name: str
+    ready: bool
+    attempts: int
+    time_to_ready: Optional[float]  # seconds since probing started, None if never ready
+    detail: str = ""
+    last_error: Optional[str] = None
+
+
+@dataclass
+class ReadinessReport:
+    """Aggregated outcome of all probes."""
+    results: List[ProbeResult] = field(default_factory=list)
+    elapsed: float = 0.0  # seconds
+
+    def ok(self) -> bool:
+        return all(r.ready for r in self.results)
+
+    def summary(self) -> str:
+        lines = [f"ready={self.ok()} elapsed={self.elapsed:.3f}s"]
+        for r in self.results:
+            ttr = f"{r.time_to_ready:.3f}s" if r.time_to_ready is not None else "-"
+            lines.append(f"  {r.name}: ready={r.ready} time_to_ready={ttr} attempts={r.attempts} "
+                         f"{r.detail or r.last_error or ''}".rstrip())
+        return "\n".join(lines)
+
+
+class Probe:
+    """Base probe. `check()` returns a short detail string or raises when the service is not ready."""
+    name = "probe"
+
+    def check(self, timeout: float) -> str:
+        raise NotImplementedError
+
+
+class HttpProbe(Probe):
+    """Ready when GET `url` answers with `expect_status`."""
+
+    def __init__(self, url: str, expect_status: int = 200, name: str = "http"):
+        self.url = url
+        self.expect_status = expect_status
+        self.name = name
+
+    def check(self, timeout: float) -> str:
+        try:
+            with urllib.request.urlopen(self.url, timeout=timeout) as resp:
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        if status != self.expect_status:
+            raise ConnectionError(f"{self.url} returned HTTP {status}")
+        return f"HTTP {status}"
+
+
+class SshBannerProbe(Probe):
+    """Ready when the SSH server sends its identification banner (`SSH-2.0-...`)."""
+
+    def __init__(self, host: str, port: int = 2222, name: str = "ssh"):
+        self.host = host
+        self.port = port
+        self.name = name
+
+    def check(self, timeout: float) -> str:
+        with socket.create_connection((self.host, self.port), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            banner = sock.makefile("rb").readline(256).strip()
+        if not banner.startswith(b"SSH-"):
+            raise ConnectionError(f"unexpected SSH banner {banner!r}")
+        return banner.decode("ascii", errors="replace")
+
+
+class GitDaemonProbe(Probe):
+    """
+    Ready when git-daemon answers an upload-pack request with a pkt-line.
+    A non-existent path is requested on purpose: with --informative-errors the daemon
+    replies with an `ERR` packet, which is enough to prove it is serving requests.
+    """
+
+    def __init__(self, host: str, port: int = 9418, path: str = "/__gitguard_readiness__.git", name: str = "git"):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.name = name
+
+    def check(self, timeout: float) -> str:
+        payload = f"git-upload-pack {self.path}\0host={self.host}\0".encode()
+        with socket.create_connection((self.host, self.port), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            sock.sendall(f"{len(payload) + 4:04x}".encode() + payload)
+            header = sock.recv(4)
+        if len(header) < 4:
+            raise ConnectionError("git daemon closed the connection without answering")
+        int(header, 16)  # must be a valid pkt-line length, raises ValueError otherwise
+        return f"pkt-line {header.decode()}"
+
+
+def _probe_until_ready(probe: Probe, deadline: float, started: float, initial_delay: float,
+                       max_delay: float, factor: float, attempt_timeout: float) -> ProbeResult:
+    delay = initial_delay
+    attempts = 0
+    last_error: Optional[str] = None
+    while True:
+        attempts += 1
+        remaining = deadline - time.perf_counter()
+        try:
+            detail = probe.check(timeout=max(0.05, min(attempt_timeout, remaining)))
+            return ProbeResult(name=probe.name, ready=True, attempts=attempts,
+                               time_to_ready=time.perf_counter() - started, detail=detail)
+        except (OSError, ValueError) as e:
+            last_error = f"{type(e).__name__}: {e}"
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return ProbeResult(name=probe.name, ready=False, attempts=attempts, time_to_ready=None,
+                               last_error=last_error)
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, max_delay)
+
+
+def wait_until_ready(
+    probes: Sequence[Probe],
+    timeout: float = 180.0,
+    initial_delay: float = 0.005,
+    max_delay: float = 1.0,
+    factor: float = 2.0,
+    attempt_timeout: float = 2.0,
+) -> ReadinessReport:
+    """
+    Run all probes concurrently, each retrying with exponential backoff
+    (`initial_delay` * `factor`^n, capped at `max_delay`) until it succeeds or `timeout` expires.
+    Returns as soon as every probe has finished.
+    """
+    started = time.perf_counter()
+    deadline = started + timeout
+    results: List[Optional[ProbeResult]] = [None] * len(probes)
+
+    def worker(i: int, probe: Probe) -> None:
+        results[i] = _probe_until_ready(probe, deadline, started, initial_delay, max_delay, factor, attempt_timeout)
+
+    threads = [threading.Thread(target=worker, args=(i, p), name=f"ready-{p.name}", daemon=True)
+               for i, p in enumerate(probes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    report = ReadinessReport(results=[r for r in results if r is not None],
+                             elapsed=time.perf_counter() - started)
+    logger.info("Readiness: %s", report.summary())
+    return report
+
+
+def default_probes(
+    base_url: Optional[str] = None,
+    ssh_host: Optional[str] = None,
+    ssh_port: Optional[int] = None,
+    git_host: Optional[str] = None,
+    git_port: int = 9418,
+) -> List[Probe]:
+    """HTTP health + SSH banner + git daemon probes, defaulting to the tester container environment."""
+    base_url = (base_url or os.getenv("GITEA_BASE_URL", "http://gitea:3000")).rstrip("/")
+    host = urlparse(base_url).hostname or "gitea"
+    return [
+        HttpProbe(f"{base_url}/api/healthz"),
+        SshBannerProbe(ssh_host or os.getenv("GITEA_SSH_HOST", host),
+                       int(ssh_port or os.getenv("GITEA_SSH_PORT", "2222"))),
+        GitDaemonProbe(git_host or host, git_port),
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Wait until Gitea HTTP, SSH and git daemon are ready.")
+    parser.add_argument("--url", default=os.getenv("GITEA_URL") or os.getenv("GITEA_BASE_URL"),
+                        help="Gitea base URL (default: $GITEA_URL / $GITEA_BASE_URL)")
+    parser.add_argument("--ssh-host")
+    parser.add_argument("--ssh-port", type=int)
+    parser.add_argument("--git-host")
+    parser.add_argument("--git-port", type=int, default=9418)
+    parser.add_argument("--skip", action="append", default=[], choices=["http", "ssh", "git"],
+                        help="Probe to skip (repeatable)")
+    parser.add_argument("--timeout", type=float, default=180.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="[wait] %(message)s")
+    probes = [p for p in default_probes(args.url, args.ssh_host, args.ssh_port, args.git_host, args.git_port)
+              if p.name not in args.skip]
+    report = wait_until_ready(probes, timeout=args.timeout)
+    return 0 if report.ok() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
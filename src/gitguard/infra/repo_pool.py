@@ -0,0 +1,223 @@
+"""
+Warm pool of pre-provisioned Gitea repositories leased to tests.
+
+The pool keeps `size` repositories ready (empty or seeded). Leasing is a queue pop (O(1));
+returned repositories are recycled by background threads, either by deleting and recreating
+them through the API ("recreate") or by force-pushing a local seed repository over them ("reset"),
+so every lease starts from the same pristine state.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+import queue
+import tempfile
+import threading
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from gitguard.clients.git_client import GitClient
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+
+logger = logging.getLogger("gitguard")
+
+RECYCLE_MODES = ("recreate", "reset")
+
+
+@dataclass
+class PooledRepo:
+    """A repository owned by the pool."""
+    owner: str
+    name: str
+    generation: int = 0  # how many times it has been (re)provisioned
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+
+class RepoPool:
+    """
+    Pool of ready-to-use repositories under `owner`.
+
+    - recycle="recreate": delete + recreate over the API, then seed `seed_files` in one batch commit.
+    - recycle="reset": create once, then reset by `git push --mirror --force` of a local seed repository
+      (requires `git_client` configured with protocol/host able to push to `owner`).
+    """
+
+    def __init__(
+        self,
+        client: GiteaHttpClient,
+        owner: str,
+        size: int = 4,
+        prefix: str = "pool",
+        seed_files: Optional[Dict[str, str]] = None,
+        recycle: str = "recreate",
+        git_client: Optional[GitClient] = None,
+        workers: int = 2,
+        max_failures: int = 3,
+    ):
+        if recycle not in RECYCLE_MODES:
+            raise ValueError(f"Unsupported recycle mode '{recycle}', expected one of {RECYCLE_MODES}")
+        if recycle == "reset" and git_client is None:
+            raise ValueError("recycle='reset' requires a git_client")
+        self.client = client
+        self.owner = owner
+        self.size = size
+        self.prefix = prefix
+        self.seed_files = dict(seed_files or {})
+        self.recycle = recycle
+        self.git_client = git_client
+        self.workers = max(1, workers)
+        self.max_failures = max_failures
+
+        self._ready: "queue.Queue[PooledRepo]" = queue.Queue()
+        self._dirty: "queue.Queue[Optional[PooledRepo]]" = queue.Queue()
+        self._failures: Dict[str, int] = {}
+        self._all: List[PooledRepo] = []
+        self._threads: List[threading.Thread] = []
+        self._seed_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._seed_lock = threading.Lock()
+        self.lease_waits: List[float] = []  # seconds each lease() waited for a ready repo
+
+    # -----------------
+    # Lifecycle
+    # -----------------
+    def start(self) -> "RepoPool":
+        """Schedule provisioning of all repos in the background and return immediately."""
+        if self._threads:
+            return self
+        for i in range(self.size):
+            repo = PooledRepo(owner=self.owner, name=f"{self.prefix}-{i}")
+            self._all.append(repo)
+            self._dirty.put(repo)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._recycle_loop, name=f"repo-pool-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info("[pool] Provisioning %d repos for '%s' (recycle=%s)", self.size, self.owner, self.recycle)
+        return self
+
+    def close(self, delete: bool = True) -> None:
+        """Stop the recycler threads and optionally delete all pool repos from the server."""
+        for _ in self._threads:
+            self._dirty.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        if delete:
+            for repo in self._all:
+                self.client.delete_repo(owner=repo.owner, repo=repo.name)
+        if self._seed_dir:
+            self._seed_dir.cleanup()
+            self._seed_dir = None
+
+    def __enter__(self) -> "RepoPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -----------------
+    # Leasing
+    # -----------------
+    def lease(self, timeout: Optional[float] = 120) -> PooledRepo:
+        """Take a ready repository (blocks only while the pool is still warming up)."""
+        start = time.perf_counter()
+        try:
+            repo = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No pooled repository became ready within {timeout}s") from None
+        self.lease_waits.append(time.perf_counter() - start)
+        return repo
+
+    def release(self, repo: PooledRepo) -> None:
+        """Return a repository; it is recycled in the background before being leased again."""
+        self._dirty.put(repo)
+
+    @contextlib.contextmanager
+    def leased(self, timeout: Optional[float] = 120) -> Iterator[PooledRepo]:
+        repo = self.lease(timeout=timeout)
+        try:
+            yield repo
+        finally:
+            self.release(repo)
+
+    @property
+    def ready_count(self) -> int:
+        return self._ready.qsize()
+
+    # -----------------
+    # Recycling
+    # -----------------
+    def _recycle_loop(self) -> None:
+        while True:
+            repo = self._dirty.get()
+            if repo is None:
+                return
+            try:
+                self._provision(repo)
+            except Exception as e:
+                failures = self._failures.get(repo.name, 0) + 1
+                self._failures[repo.name] = failures
+                logger.error("[pool] Recycling '%s' failed (%d/%d): %s", repo.full_name, failures,
+                             self.max_failures, e)
+                if failures < self.max_failures:
+                    self._dirty.put(repo)
+                continue
+            self._failures.pop(repo.name, None)
+            repo.generation += 1
+            self._ready.put(repo)
+
+    def _provision(self, repo: PooledRepo) -> None:
+        if self.recycle == "recreate" or repo.generation == 0:
+            self._recreate(repo)
+        if self.recycle == "reset":
+            self._reset(repo)
+
+    def _recreate(self, repo: PooledRepo) -> None:
+        r = self.client.delete_repo(owner=repo.owner, repo=repo.name)
+        if not (r.ok() or r.status_code == 404):
+            raise RuntimeError(f"delete {repo.full_name}: {r.status_code} {r.text}")
+        r = self.client.admin_create_repo(username=repo.owner, repo_name=repo.name)
+        if not r.ok():
+            raise RuntimeError(f"create {repo.full_name}: {r.status_code} {r.text}")
+        if self.recycle == "recreate":
+            r = self.client.commit_files(repo.owner, repo.name, "main", self.seed_files, message="Seed repository")
+            if not r.ok():
+                failed = r.responses[-1]
+                raise RuntimeError(f"seed {repo.full_name}: {failed.status_code} {failed.text}")
+
+    def _seed_repo(self) -> Path:
+        """Local repository holding the seed commit, built once and mirrored onto every recycled repo."""
+        with self._seed_lock:
+            if self._seed_dir is None:
+                self._seed_dir = tempfile.TemporaryDirectory(prefix="gitguard-seed-")
+                path = Path(self._seed_dir.name)
+                git = self.git_client
+                checks = [git.init(str(path), workdir=str(path))]
+                for rel, content in self.seed_files.items():
+                    (path / rel).parent.mkdir(parents=True, exist_ok=True)
+                    (path / rel).write_text(content)
+                if self.seed_files:
+                    checks += [git.add(".", workdir=str(path)), git.commit("Seed repository", workdir=str(path)),
+                               git._run(["branch", "-M", "main"], cwd=str(path))]
+                failed = [r for r in checks if not r.ok()]
+                if failed:
+                    raise RuntimeError(f"building seed repository failed: {failed[0].stderr}")
+            return Path(self._seed_dir.name)
+
+    def _reset(self, repo: PooledRepo) -> None:
+        if not self.seed_files:
+            # an empty repo has nothing to reset to; recreate it instead
+            if repo.generation:
+                self._recreate(repo)
+            return
+        seed = self._seed_repo()
+        url = self.git_client._make_repo_url(owner=repo.owner, repo=repo.name)
+        r = self.git_client._run(["push", "--mirror", "--force", url], cwd=str(seed))
+        if not r.ok():
+            raise RuntimeError(f"reset {repo.full_name}: {r.stderr}")
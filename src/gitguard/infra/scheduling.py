@@ -0,0 +1,235 @@
+"""
+Duration-aware scheduling of tests across pytest-xdist workers.
+
+Every run records per-test durations (setup + call + teardown, smoothed over runs) in the
+pytest cache. With `--lpt`, the next `-n N` run dispatches tests longest-first (LPT): each
+worker that runs low on work receives the longest remaining unit, so the slow
+protocol-parametrized e2e flows start first instead of forming the tail.
+
+Tests sharing an expensive fixture (`--lpt-group-fixture NAME` / `lpt_group_fixtures` ini)
+or an `xdist_group` marker are scheduled together as one unit on one worker, so the fixture
+is built once. Group membership is learned during collection and used from the next run on.
+
+Enabled from tests/conftest.py via `pytest_plugins`.
+"""
+from __future__ import annotations
+
+import logging
+import statistics
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+    _HAS_XDIST = True
+except Exception:
+    LoadScheduling = object  # type: ignore[assignment,misc]
+    _HAS_XDIST = False
+
+logger = logging.getLogger("gitguard")
+
+DURATIONS_KEY = "gitguard/durations"
+GROUPS_KEY = "gitguard/groups"
+WORKEROUTPUT_KEY = "gitguard_groups"
+
+# weight of the latest measurement in the exponentially smoothed duration
+SMOOTHING = 0.5
+
+
+def _base_nodeid(nodeid: str) -> str:
+    """xdist --dist loadgroup appends "@group" to node ids; durations are keyed without it."""
+    return nodeid.split("@", 1)[0]
+
+
+def build_units(
+    collection: Sequence[str],
+    durations: Dict[str, float],
+    groups: Dict[str, str],
+) -> List[Tuple[float, List[int]]]:
+    """
+    Split the collection (list of node ids) into scheduling units sorted longest-first.
+    A unit is (estimated seconds, [collection indices]); tests with the same group form one unit.
+    Unknown tests are estimated with the median of known durations.
+    """
+    known = [durations[_base_nodeid(n)] for n in collection if _base_nodeid(n) in durations]
+    default = statistics.median(known) if known else 1.0
+
+    grouped: Dict[str, List[int]] = {}
+    units: List[Tuple[float, List[int]]] = []
+    for index, nodeid in enumerate(collection):
+        group = groups.get(_base_nodeid(nodeid))
+        if group:
+            grouped.setdefault(group, []).append(index)
+        else:
+            units.append((durations.get(_base_nodeid(nodeid), default), [index]))
+    for indices in grouped.values():
+        units.append((sum(durations.get(_base_nodeid(collection[i]), default) for i in indices), indices))
+
+    # stable for equal estimates: keep collection order
+    units.sort(key=lambda u: (-u[0], u[1][0]))
+    return units
+
+
+class DurationScheduling(LoadScheduling):  # type: ignore[misc,valid-type]
+    """
+    LoadScheduling variant dispatching units longest-first to whichever worker runs out of work.
+    A worker is topped up to two pending tests (xdist workers need the next item before they can
+    finish the current one) and shut down once no units are left.
+    """
+
+    def __init__(self, config: pytest.Config, log: Any = None,
+                 durations: Optional[Dict[str, float]] = None, groups: Optional[Dict[str, str]] = None):
+        super().__init__(config, log)
+        self.durations = durations or {}
+        self.groups = groups or {}
+        self.units: List[List[int]] = []
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        units = build_units(self.collection, self.durations, self.groups)
+        self.units = [indices for _, indices in units]
+        self.pending[:] = [i for indices in self.units for i in indices]
+        if units:
+            self.log("LPT schedule: %d units, longest %.2fs" % (len(units), units[0][0]))
+
+        # deal the longest units round-robin so they start on different workers
+        while self.units and any(len(self.node2pending[n]) < 2 for n in self.nodes):
+            for node in self.nodes:
+                if self.units and len(self.node2pending[node]) < 2:
+                    self._send_unit(node)
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def _send_unit(self, node: Any) -> None:
+        unit = self.units.pop(0)
+        for i in unit:
+            self.pending.remove(i)
+        self.node2pending[node].extend(unit)
+        node.send_runtest_some(unit)
+
+    def _sync_units(self) -> None:
+        """Re-queue tests put back into `pending` by xdist (crashed worker / mark_test_pending)."""
+        queued = {i for unit in self.units for i in unit}
+        orphans = [i for i in self.pending if i not in queued]
+        if orphans:
+            self.units[:0] = [[i] for i in orphans]
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        if node.shutting_down:
+            return
+        self._sync_units()
+        while self.units and len(self.node2pending[node]) < 2:
+            self._send_unit(node)
+        if not self.units:
+            node.shutdown()
+
+
+# -----------------
+# pytest hooks
+# -----------------
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("gitguard-scheduling")
+    group.addoption("--lpt", action="store_true", default=False,
+                    help="Schedule xdist workers longest-processing-time first using recorded durations")
+    group.addoption("--lpt-group-fixture", action="append", default=[], metavar="NAME",
+                    help="Schedule tests using this (expensive) fixture on the same worker; repeatable")
+    parser.addini("lpt_group_fixtures", type="linelist", default=[],
+                  help="Fixtures whose tests are scheduled together by --lpt")
+
+
+def _group_fixtures(config: pytest.Config) -> List[str]:
+    return list(config.getini("lpt_group_fixtures")) + list(config.getoption("lpt_group_fixture"))
+
+
+def item_group(item: pytest.Item, fixtures: Sequence[str]) -> Optional[str]:
+    """Scheduling group of an item: xdist_group marker first, then the first listed fixture it uses."""
+    marker = item.get_closest_marker("xdist_group")
+    if marker:
+        return str(marker.args[0] if marker.args else marker.kwargs.get("name", "default"))
+    used = set(getattr(item, "fixturenames", ()))
+    for name in fixtures:
+        if name in used:
+            return f"fixture:{name}"
+    return None
+
+
+class DurationRecorder:
+    """Controller-side plugin object: accumulates durations/groups and persists them in the cache."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        # the cache is missing with -p no:cacheprovider: schedule without history, record nothing
+        self.cache = getattr(config, "cache", None)
+        self.durations: Dict[str, float] = dict(self.cache.get(DURATIONS_KEY, {})) if self.cache else {}
+        self.groups: Dict[str, str] = dict(self.cache.get(GROUPS_KEY, {})) if self.cache else {}
+        self._current: Dict[str, float] = {}
+        self._seen_groups: Dict[str, Optional[str]] = {}
+
+    # serial runs collect in this process; under xdist the workers report via workeroutput
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: List[pytest.Item]) -> None:
+        fixtures = _group_fixtures(self.config)
+        for item in items:
+            self._seen_groups[_base_nodeid(item.nodeid)] = item_group(item, fixtures)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:
+        output = getattr(node, "workeroutput", None) or {}
+        self._seen_groups.update(output.get(WORKEROUTPUT_KEY, {}))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        nodeid = _base_nodeid(report.nodeid)
+        self._current[nodeid] = self._current.get(nodeid, 0.0) + (report.duration or 0.0)
+
+    # tryfirst: xdist's own DSession implementation would otherwise answer first
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config: pytest.Config, log: Any) -> Optional[Any]:
+        if not (_HAS_XDIST and config.getoption("lpt") and config.getvalue("dist") == "load"):
+            return None
+        return DurationScheduling(config, log, durations=self.durations, groups=self.groups)
+
+    def pytest_sessionfinish(self) -> None:
+        if not self.cache:
+            return
+        for nodeid, duration in self._current.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = duration if previous is None else (
+                SMOOTHING * duration + (1 - SMOOTHING) * previous)
+        for nodeid, group in self._seen_groups.items():
+            if group:
+                self.groups[nodeid] = group
+            else:
+                self.groups.pop(nodeid, None)
+        self.cache.set(DURATIONS_KEY, self.durations)
+        self.cache.set(GROUPS_KEY, self.groups)
+
+
+class WorkerGroupReporter:
+    """Worker-side plugin object: reports scheduling groups of collected items to the controller."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+
+    def pytest_collection_modifyitems(self, items: List[pytest.Item]) -> None:
+        fixtures = _group_fixtures(self.config)
+        self.config.workeroutput[WORKEROUTPUT_KEY] = {  # type: ignore[attr-defined]
+            _base_nodeid(item.nodeid): item_group(item, fixtures) for item in items
+        }
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if hasattr(config, "workerinput"):
+        config.pluginmanager.register(WorkerGroupReporter(config), "gitguard-lpt-worker")
+    else:
+        config.pluginmanager.register(DurationRecorder(config), "gitguard-lpt-recorder")
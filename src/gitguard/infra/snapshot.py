@@ -0,0 +1,264 @@
+"""
+Content-addressed snapshots of the Gitea data volume (`./data/gitea`: sqlite DB + repositories).
+
+After provisioning, `save` stores every file once under its sha256 digest plus a manifest keyed by
+a hash of the provisioning spec (compose file, init scripts, ...). Before a run, `restore` rebuilds
+the data directory from the manifest: write-once git objects/packs are hardlinked from the store,
+everything that Gitea may modify in place (sqlite DB, refs, configs) is reflinked where the
+filesystem supports it and copied otherwise. Gitea must be stopped while saving/restoring.
+
+    PYTHONPATH=src python3 -m gitguard.infra.snapshot restore --data-dir data/gitea --spec docker-compose.yml ...
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("gitguard")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Linux FICLONE ioctl (copy-on-write clone of a whole file on btrfs/xfs/...)
+_FICLONE = 0x40049409
+
+# Loose objects and packs inside bare repositories are never modified after being written
+_IMMUTABLE_RE = re.compile(r"\.git/objects/(?:[0-9a-f]{2}/[0-9a-f]{38,}|pack/pack-[0-9a-f]+\.(?:pack|idx|rev))$")
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def spec_key(paths: Sequence[str] = (), extra: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key of a provisioning spec: digest of the given files' contents plus `extra` (JSON)."""
+    h = hashlib.sha256()
+    for p in sorted(str(x) for x in paths):
+        h.update(p.encode() + b"\0")
+        h.update(file_digest(Path(p)).encode() + b"\0")
+    h.update(json.dumps(extra or {}, sort_keys=True).encode())
+    return h.hexdigest()[:32]
+
+
+def is_immutable(rel_path: str) -> bool:
+    """True for files that are safe to share between snapshot store and data dir via hardlinks."""
+    return bool(_IMMUTABLE_RE.search(rel_path.replace(os.sep, "/")))
+
+
+def _reflink_or_copy(src: Path, dst: Path) -> str:
+    """Copy-on-write clone when supported by the filesystem, plain copy otherwise. Returns the method used."""
+    try:
+        import fcntl
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return "reflink"
+    except (ImportError, OSError):
+        shutil.copyfile(src, dst)
+        return "copy"
+
+
+@dataclass
+class SnapshotStats:
+    """Outcome of a save/restore operation."""
+    key: str
+    files: int = 0
+    bytes: int = 0
+    new_objects: int = 0  # save: objects not already in the store
+    methods: Dict[str, int] = field(default_factory=dict)  # restore: hardlink/reflink/copy counts
+    duration: float = 0.0
+
+
+class SnapshotStore:
+    """
+    On-disk layout:
+        <root>/objects/<aa>/<sha256>      file contents, deduplicated across snapshots
+        <root>/manifests/<key>.json       directory tree description of one snapshot
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.manifests = self.root / "manifests"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _manifest_path(self, key: str) -> Path:
+        return self.manifests / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        return self._manifest_path(key).exists()
+
+    def keys(self) -> List[str]:
+        return sorted(p.stem for p in self.manifests.glob("*.json")) if self.manifests.exists() else []
+
+    # -----------------
+    # Save
+    # -----------------
+    def save(self, data_dir: str, key: str) -> SnapshotStats:
+        src = Path(data_dir)
+        if not src.is_dir():
+            raise FileNotFoundError(f"Data directory not found: {src}")
+        start = time.perf_counter()
+        stats = SnapshotStats(key=key)
+        entries: List[Dict[str, Any]] = []
+
+        for dirpath, dirnames, filenames in os.walk(src):
+            dirnames.sort()
+            base = Path(dirpath)
+            for name in dirnames:
+                p = base / name
+                st = p.lstat()
+                if p.is_symlink():
+                    entries.append({"path": str(p.relative_to(src)), "type": "symlink", "target": os.readlink(p)})
+                else:
+                    entries.append({"path": str(p.relative_to(src)), "type": "dir", "mode": st.st_mode & 0o7777,
+                                    "uid": st.st_uid, "gid": st.st_gid})
+            for name in sorted(filenames):
+                p = base / name
+                rel = str(p.relative_to(src))
+                if p.is_symlink():
+                    entries.append({"path": rel, "type": "symlink", "target": os.readlink(p)})
+                    continue
+                st = p.lstat()
+                digest = file_digest(p)
+                obj = self._object_path(digest)
+                if not obj.exists():
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = obj.with_name(f"{digest}.tmp{os.getpid()}")
+                    _reflink_or_copy(p, tmp)
+                    os.chmod(tmp, 0o444)
+                    os.replace(tmp, obj)
+                    stats.new_objects += 1
+                entries.append({"path": rel, "type": "file", "digest": digest, "size": st.st_size,
+                                "mode": st.st_mode & 0o7777, "uid": st.st_uid, "gid": st.st_gid})
+                stats.files += 1
+                stats.bytes += st.st_size
+
+        manifest = {
+            "key": key,
+            "created": datetime.datetime.utcnow().isoformat() + "Z",
+            "source": str(src.resolve()),
+            "entries": entries,
+        }
+        self.manifests.mkdir(parents=True, exist_ok=True)
+        tmp = self._manifest_path(key).with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+        os.replace(tmp, self._manifest_path(key))
+
+        stats.duration = time.perf_counter() - start
+        logger.info("[snapshot] Saved %s: %d files, %d bytes, %d new objects in %.3fs",
+                    key, stats.files, stats.bytes, stats.new_objects, stats.duration)
+        return stats
+
+    # -----------------
+    # Restore
+    # -----------------
+    def restore(self, key: str, data_dir: str) -> SnapshotStats:
+        if not self.has(key):
+            raise KeyError(f"No snapshot '{key}' in {self.root}")
+        manifest = json.loads(self._manifest_path(key).read_text(encoding="utf-8"))
+        dest = Path(data_dir)
+        start = time.perf_counter()
+        stats = SnapshotStats(key=key)
+        chown = hasattr(os, "chown") and hasattr(os, "geteuid") and os.geteuid() == 0
+
+        # start from an empty directory so files created after the snapshot disappear
+        dest.mkdir(parents=True, exist_ok=True)
+        for child in dest.iterdir():
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+
+        dirs = []
+        for entry in manifest["entries"]:
+            target = dest / entry["path"]
+            kind = entry["type"]
+            if kind == "symlink":
+                os.symlink(entry["target"], target)
+                continue
+            if kind == "dir":
+                target.mkdir(exist_ok=True)
+                dirs.append((target, entry))
+                continue
+
+            obj = self._object_path(entry["digest"])
+            method = None
+            if is_immutable(entry["path"]):
+                try:
+                    os.link(obj, target)
+                    method = "hardlink"
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                        raise
+            if method is None:
+                # private copy: the inode is not shared with the store, so mode/owner can be restored
+                method = _reflink_or_copy(obj, target)
+                os.chmod(target, entry["mode"])
+                if chown:
+                    os.chown(target, entry["uid"], entry["gid"])
+            stats.methods[method] = stats.methods.get(method, 0) + 1
+            stats.files += 1
+            stats.bytes += entry["size"]
+
+        # directory modes last, so read-only directories do not block creating their children
+        for target, entry in reversed(dirs):
+            os.chmod(target, entry["mode"])
+            if chown:
+                os.chown(target, entry["uid"], entry["gid"])
+
+        stats.duration = time.perf_counter() - start
+        logger.info("[snapshot] Restored %s into %s: %d files, %d bytes %s in %.3fs",
+                    key, dest, stats.files, stats.bytes, stats.methods, stats.duration)
+        return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Snapshot/restore the Gitea data volume.")
+    parser.add_argument("action", choices=["save", "restore", "key", "list"])
+    parser.add_argument("--data-dir", default="data/gitea")
+    parser.add_argument("--store", default=".gitguard-snapshots")
+    parser.add_argument("--spec", nargs="*", default=[], help="Files describing the provisioning (hashed into the key)")
+    parser.add_argument("--key", help="Explicit snapshot key (default: hash of --spec files)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = SnapshotStore(args.store)
+    key = args.key or spec_key(args.spec)
+
+    if args.action == "key":
+        print(key)
+        return 0
+    if args.action == "list":
+        print("\n".join(store.keys()))
+        return 0
+    if args.action == "save":
+        store.save(args.data_dir, key)
+        return 0
+    if not store.has(key):
+        # distinct exit code: caller should provision from scratch and then `save`
+        logger.info("[snapshot] No snapshot for key %s", key)
+        return 2
+    store.restore(key, args.data_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
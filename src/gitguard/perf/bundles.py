@@ -0,0 +1,267 @@
+"""
+Bundle-based seeding: how much server-side pack generation do bundles avoid?
+
+A repository is bundled once (`git bundle create` from a local mirror) and then obtained three ways:
+
+- server:      plain `git clone` - the server packs the whole history for every clone
+- bundle-file: clone the local bundle, re-point `origin` and fetch only what the bundle lacks
+- bundle-uri:  `git clone --bundle-uri=<http url>` - git downloads the bundle from BundleServer
+               (a local HTTP stand-in for a CDN) before negotiating the rest with the server
+
+For each approach the benchmark reports wall time, the pack bytes the server had to generate and
+the bundle bytes read instead:
+
+    with BundleServer("/tmp/bundles") as server:
+        bench = BundleSeedingBenchmark(git, "/tmp/seeding", "http://gitea:3000/testuser/test-repo.git", server)
+        bench.prepare()
+        print(bench.run(iterations=3).format())
+
+For bundle-uri the server's share is derived from the clone's packs minus the bundle's pack data,
+which slightly over-counts it when incremental (thin) bundles had to be completed locally.
+"""
+from __future__ import annotations
+
+import logging
+import shutil
+import threading
+import time
+
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from gitguard.clients.git_client import GitClient
+from gitguard.perf.stats import Summary
+
+logger = logging.getLogger("gitguard")
+
+APPROACHES = ("server", "bundle-file", "bundle-uri")
+
+
+def bundle_pack_bytes(path: str) -> int:
+    """Size of the pack data inside a bundle file (everything after the header's blank line)."""
+    with open(path, "rb") as fh:
+        header = b""
+        while b"\n\n" not in header:
+            chunk = fh.read(4096)
+            if not chunk:
+                raise ValueError(f"{path} is not a git bundle")
+            header += chunk
+    return Path(path).stat().st_size - (header.index(b"\n\n") + 2)
+
+
+def write_bundle_list(path: str, uris: Mapping[str, str], mode: str = "all") -> Path:
+    """
+    Write a bundle list (git config format) advertising `uris` (bundle id -> absolute URI). With
+    mode "all" git downloads every bundle, so a base bundle plus incremental ones can be chained.
+    """
+    lines = ["[bundle]", "\tversion = 1", f"\tmode = {mode}"]
+    for name, uri in uris.items():
+        lines += [f'[bundle "{name}"]', f"\turi = {uri}"]
+    target = Path(path)
+    target.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return target
+
+
+def _pack_bytes(repo: Path) -> int:
+    pack_dir = repo / ".git" / "objects" / "pack"
+    return sum(p.stat().st_size for p in pack_dir.glob("*.pack")) if pack_dir.is_dir() else 0
+
+
+class _BundleHandler(SimpleHTTPRequestHandler):
+    server: "_BundleHttpServer"
+
+    def copyfile(self, source, outputfile):
+        start = source.tell()
+        super().copyfile(source, outputfile)
+        self.server.owner._count(self.path, source.tell() - start)
+
+    def log_message(self, format, *args):
+        logger.debug("[bundles] " + format, *args)
+
+
+class _BundleHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "BundleServer"
+
+
+class BundleServer:
+    """Static HTTP server for bundle files and bundle lists, counting requests and bytes served."""
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0,
+                 advertise_host: Optional[str] = None):
+        self.directory = Path(directory)
+        self.host = host
+        self.port = port
+        self.advertise_host = advertise_host or host
+        self.requests: Dict[str, int] = {}
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_BundleHttpServer] = None
+
+    def url(self, name: str) -> str:
+        return f"http://{self.advertise_host}:{self.port}/{name}"
+
+    def start(self) -> "BundleServer":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._server = _BundleHttpServer((self.host, self.port),
+                                         partial(_BundleHandler, directory=str(self.directory)))
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                         name="bundle-server", daemon=True).start()
+        logger.info("[bundles] serving %s on %s", self.directory, self.url(""))
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "BundleServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self, path: str, size: int) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.bytes_served += size
+
+
+@dataclass
+class SeedingSample:
+    duration: float
+    server_pack_bytes: int  # pack data generated by the git server for this clone
+    bundle_bytes: int  # bundle pack data used instead (local file or downloaded)
+
+
+@dataclass
+class SeedingResult:
+    approach: str
+    samples: List[SeedingSample] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        return bool(self.samples) and not self.failures
+
+    def durations(self) -> Summary:
+        return Summary.of([s.duration for s in self.samples])
+
+    @property
+    def last(self) -> Optional[SeedingSample]:
+        return self.samples[-1] if self.samples else None
+
+
+@dataclass
+class SeedingReport:
+    results: List[SeedingResult] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        return bool(self.results) and all(r.ok() for r in self.results)
+
+    def get(self, approach: str) -> Optional[SeedingResult]:
+        return next((r for r in self.results if r.approach == approach), None)
+
+    def avoided(self, approach: str) -> int:
+        """Server pack bytes saved by `approach` compared with a plain clone."""
+        base, other = self.get("server"), self.get(approach)
+        if not (base and base.last and other and other.last):
+            return 0
+        return base.last.server_pack_bytes - other.last.server_pack_bytes
+
+    def format(self) -> str:
+        lines = [f"{'approach':<12}  {'n':>3}  {'p50 ms':>9}  {'max ms':>9}  {'server KiB':>11}  "
+                 f"{'bundle KiB':>11}  {'avoided KiB':>11}"]
+        for r in self.results:
+            last, d = r.last, r.durations()
+            if last is None:
+                lines.append(f"{r.approach:<12}  FAILED: {'; '.join(r.failures)[:200]}")
+                continue
+            lines.append(f"{r.approach:<12}  {d.count:>3}  {d.p50 * 1000:>9.1f}  {d.max * 1000:>9.1f}  "
+                         f"{last.server_pack_bytes / 1024:>11.1f}  {last.bundle_bytes / 1024:>11.1f}  "
+                         f"{self.avoided(r.approach) / 1024:>11.1f}")
+        return "\n".join(lines)
+
+
+class BundleSeedingBenchmark:
+    """Compares plain, bundle-file and bundle-uri clones of `repo_url` (see module docstring)."""
+
+    def __init__(self, git: GitClient, workdir: str, repo_url: str, server: BundleServer,
+                 bundle_name: str = "full.bundle"):
+        self.workdir = Path(workdir)
+        self.repo_url = repo_url
+        self.server = server
+        self.bundle = server.directory / bundle_name
+        self.git = GitClient(protocol=git.protocol, host=git.host, workdir=str(self.workdir),
+                             artifacts_dir=str(self.workdir / "artifacts"), enable_trace=False,
+                             attach_logs_always=False, retry_policy=git.retry_policy)
+
+    def prepare(self) -> Path:
+        """Mirror the repository once and bundle every ref of it into the server directory."""
+        source = self.workdir / "source.git"
+        shutil.rmtree(source, ignore_errors=True)
+        res = self.git._run(["clone", "--mirror", self.repo_url, str(source)], cwd=str(self.workdir),
+                            retry_safe=True)
+        if not res.ok():
+            raise RuntimeError(f"Mirroring {self.repo_url} failed: {res.stderr}")
+        self.server.directory.mkdir(parents=True, exist_ok=True)
+        res = self.git.bundle_create(str(self.bundle), ["--all"], workdir=str(source))
+        if not res.ok():
+            raise RuntimeError(f"Creating {self.bundle} failed: {res.stderr}")
+        logger.info("[bundles] %s: %d bytes of pack data", self.bundle, bundle_pack_bytes(str(self.bundle)))
+        return self.bundle
+
+    def measure(self, approach: str, target: Path) -> SeedingSample:
+        shutil.rmtree(target, ignore_errors=True)
+        bundle_bytes = bundle_pack_bytes(str(self.bundle))
+        start = time.perf_counter()
+        try:
+            if approach == "server":
+                res = self.git.clone(target_dir=str(target), repo_url=self.repo_url, reference=False)
+                self._check(res, approach)
+                return SeedingSample(time.perf_counter() - start, _pack_bytes(target), 0)
+            if approach == "bundle-file":
+                res = self.git.clone_from_bundle(str(self.bundle), str(target), origin_url=self.repo_url,
+                                                 fetch=False)
+                self._check(res, approach)
+                from_bundle = _pack_bytes(target)
+                # unpackLimit=1: keep the fetched pack even when small, so it can be measured
+                self._check(self.git._run(["-c", "fetch.unpackLimit=1", "fetch", "--prune", "origin"],
+                                          cwd=str(target), retry_safe=True), approach)
+                return SeedingSample(time.perf_counter() - start, _pack_bytes(target) - from_bundle, bundle_bytes)
+            if approach == "bundle-uri":
+                served = self.server.bytes_served
+                res = self.git.clone(target_dir=str(target), repo_url=self.repo_url,
+                                     bundle_uri=self.server.url(self.bundle.name))
+                self._check(res, approach)
+                if self.server.bytes_served == served:
+                    raise RuntimeError(f"bundle {self.server.url(self.bundle.name)} was not downloaded")
+                return SeedingSample(time.perf_counter() - start,
+                                     max(0, _pack_bytes(target) - bundle_bytes), bundle_bytes)
+            raise ValueError(f"unknown approach {approach!r}, expected one of {APPROACHES}")
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+
+    @staticmethod
+    def _check(result, approach: str) -> None:
+        if not result.ok():
+            raise RuntimeError(f"{approach}: {result.stderr.strip()}")
+
+    def run(self, iterations: int = 3, approaches: Sequence[str] = APPROACHES) -> SeedingReport:
+        report = SeedingReport()
+        for approach in approaches:
+            result = SeedingResult(approach)
+            for i in range(iterations):
+                try:
+                    result.samples.append(self.measure(approach, self.workdir / f"{approach}-{i}"))
+                except RuntimeError as e:
+                    result.failures.append(str(e))
+            report.results.append(result)
+            logger.info("[bundles] %s: p50 %.1fms, server packed %s bytes", approach,
+                        result.durations().p50 * 1000, result.last.server_pack_bytes if result.last else "-")
+        return report
@@ -0,0 +1,162 @@
+"""
+Clone mode benchmark: full vs shallow vs partial (blobless/treeless) vs single-branch vs
+no-checkout vs sparse clones of the same repository, per protocol.
+
+For every (protocol, mode) pair the repository is cloned `iterations` times into a fresh
+directory and the benchmark records wall time, the pack bytes received (size of the packs the
+clone stored, including blobs fetched lazily during checkout of a partial clone), the total
+on-disk size and the number of objects. A filter the server ignores is reported as a warning:
+
+    bench = CloneModeBenchmark(git, workdir="/tmp/clone-modes", owner="testuser", repo="test-repo")
+    print(bench.run(protocols=("http", "ssh"), iterations=3).format())
+"""
+from __future__ import annotations
+
+import logging
+import shutil
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from gitguard.clients.git_client import GitClient
+from gitguard.perf.stats import Summary, dir_size
+
+logger = logging.getLogger("gitguard")
+
+# mode name -> GitClient.clone keyword arguments
+CLONE_MODES: Dict[str, Dict[str, Any]] = {
+    "full": {},
+    "shallow": {"depth": 1},
+    "blobless": {"filter": "blob:none"},
+    "treeless": {"filter": "tree:0"},
+    "single-branch": {"single_branch": True},
+    "no-checkout": {"no_checkout": True},
+    "sparse": {"sparse": ("docs",)},
+}
+
+# warnings git prints when the server ignores a capability the client asked for
+_IGNORED_MARKERS = ("filtering not recognized by server", "is ignored")
+
+
+@dataclass
+class CloneSample:
+    duration: float
+    pack_bytes: int
+    disk_bytes: int
+    objects: int
+    shallow: bool
+    filtered: bool  # a partial clone filter was requested and the server applied it
+
+
+@dataclass
+class CloneModeResult:
+    protocol: str
+    mode: str
+    samples: List[CloneSample] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        return bool(self.samples) and not self.failures
+
+    def durations(self) -> Summary:
+        return Summary.of([s.duration for s in self.samples])
+
+    @property
+    def last(self) -> Optional[CloneSample]:
+        return self.samples[-1] if self.samples else None
+
+
+@dataclass
+class CloneModeReport:
+    results: List[CloneModeResult] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        return bool(self.results) and all(r.ok() for r in self.results)
+
+    def get(self, protocol: str, mode: str) -> Optional[CloneModeResult]:
+        return next((r for r in self.results if r.protocol == protocol and r.mode == mode), None)
+
+    def format(self) -> str:
+        header = (f"{'protocol':<8}  {'mode':<14}  {'n':>3}  {'p50 ms':>9}  {'max ms':>9}  "
+                  f"{'pack KiB':>10}  {'disk KiB':>10}  {'objects':>8}")
+        lines = [header]
+        for r in self.results:
+            last, d = r.last, r.durations()
+            if last is None:
+                lines.append(f"{r.protocol:<8}  {r.mode:<14}  FAILED: {'; '.join(r.failures)[:200]}")
+                continue
+            lines.append(f"{r.protocol:<8}  {r.mode:<14}  {d.count:>3}  {d.p50 * 1000:>9.1f}  {d.max * 1000:>9.1f}  "
+                         f"{last.pack_bytes / 1024:>10.1f}  {last.disk_bytes / 1024:>10.1f}  {last.objects:>8}")
+            lines += [f"    warning: {w}" for w in r.warnings]
+        return "\n".join(lines)
+
+
+class CloneModeBenchmark:
+    """
+    Clones one repository with every mode in `modes` (default CLONE_MODES). Clients run without
+    trace, logs attachment or reference cache, so timings and byte counts only reflect the clone.
+    """
+
+    def __init__(self, git: GitClient, workdir: str, owner: Optional[str] = None, repo: Optional[str] = None,
+                 repo_url: Optional[str] = None, modes: Optional[Mapping[str, Dict[str, Any]]] = None):
+        self.template = git
+        self.workdir = Path(workdir)
+        self.owner = owner or git.owner
+        self.repo = repo or git.repo
+        self.repo_url = repo_url
+        self.modes = dict(modes if modes is not None else CLONE_MODES)
+        self.git = GitClient(protocol=git.protocol, host=git.host, owner=self.owner, repo=self.repo,
+                             workdir=str(self.workdir), artifacts_dir=str(self.workdir / "artifacts"),
+                             enable_trace=False, attach_logs_always=False, retry_policy=git.retry_policy)
+
+    def url_for(self, protocol: str) -> str:
+        return self.repo_url or self.git._make_repo_url(protocol=protocol, owner=self.owner, repo=self.repo)
+
+    def measure(self, protocol: str, mode: str, target: Path) -> CloneModeResult:
+        """Clone once into `target` (removed afterwards) and return a single-sample result."""
+        result = CloneModeResult(protocol=protocol, mode=mode)
+        shutil.rmtree(target, ignore_errors=True)
+        start = time.perf_counter()
+        res = self.git.clone(target_dir=str(target), repo_url=self.url_for(protocol), reference=False,
+                             **self.modes[mode])
+        duration = time.perf_counter() - start
+        try:
+            if not res.ok():
+                result.failures.append(res.stderr.strip().splitlines()[-1] if res.stderr.strip() else "clone failed")
+                return result
+            result.warnings += [line.strip() for line in res.stderr.splitlines()
+                                if any(m in line.lower() for m in _IGNORED_MARKERS)]
+            git_dir = target / ".git"
+            counts = self.git._run(["count-objects", "-v"], cwd=str(target))
+            stats = dict(line.split(": ", 1) for line in counts.stdout.splitlines() if ": " in line)
+            result.samples.append(CloneSample(
+                duration=duration,
+                pack_bytes=sum(p.stat().st_size for p in (git_dir / "objects" / "pack").glob("*.pack")),
+                disk_bytes=dir_size(target),
+                objects=int(stats.get("count", 0)) + int(stats.get("in-pack", 0)),
+                shallow=(git_dir / "shallow").exists(),
+                # git records the promisor remote even when the server ignored the filter
+                filtered="filter" in self.modes[mode] and "filtering not recognized" not in res.stderr,
+            ))
+            return result
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+
+    def run(self, protocols: Sequence[str] = ("http",), iterations: int = 3,
+            modes: Optional[Sequence[str]] = None) -> CloneModeReport:
+        report = CloneModeReport()
+        for protocol in protocols:
+            for mode in modes or list(self.modes):
+                combined = CloneModeResult(protocol=protocol, mode=mode)
+                for i in range(iterations):
+                    one = self.measure(protocol, mode, self.workdir / f"{protocol}-{mode}-{i}")
+                    combined.samples += one.samples
+                    combined.failures += one.failures
+                    combined.warnings += [w for w in one.warnings if w not in combined.warnings]
+                report.results.append(combined)
+                logger.info("clone %s over %s: p50 %.1fms, %s", mode, protocol, combined.durations().p50 * 1000,
+                            f"{combined.last.pack_bytes} pack bytes" if combined.last else "failed")
+        return report
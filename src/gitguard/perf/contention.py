@@ -0,0 +1,215 @@
+"""
+Concurrent same-branch push contention harness.
+
+N clones of one repository push to the same branch at the same time. A push rejected as
+non-fast-forward (or because the server could not lock the ref) is resolved the way a real
+client would: `git pull --rebase`, then push again. Every client only touches its own file,
+so rebases never conflict and every commit eventually lands.
+
+For each N the harness reports accepted pushes per second, retries per accepted push and the
+end-to-end latency of a push (first attempt until accepted, including rebases):
+
+    harness = PushContentionHarness(git, workdir="/tmp/contention", owner="testuser", repo="test-repo")
+    print(harness.sweep([1, 2, 4, 8], pushes_per_client=5).format())
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from gitguard.clients.git_client import GitClient, GitResult
+from gitguard.perf.stats import Summary
+
+logger = logging.getLogger("gitguard")
+
+# stderr fragments of pushes that lost the race and should be rebased and retried
+_REJECTED_MARKERS = ("non-fast-forward", "fetch first", "[rejected]")
+_LOCK_MARKERS = ("cannot lock ref", "failed to update ref", "failed to lock", "unable to lock", "incorrect old value")
+
+
+def push_rejection(result: GitResult) -> Optional[str]:
+    """'rejected' (non-fast-forward), 'lock' (server-side ref lock contention) or None for other outcomes."""
+    if result.ok():
+        return None
+    err = result.stderr.lower()
+    if any(marker in err for marker in _LOCK_MARKERS):
+        return "lock"
+    if any(marker in err for marker in _REJECTED_MARKERS):
+        return "rejected"
+    return None
+
+
+@dataclass
+class ContentionResult:
+    """Outcome of one contention round with `clients` concurrent pushers."""
+    clients: int
+    wall_time: float = 0.0
+    accepted: int = 0
+    retries: int = 0
+    lock_errors: int = 0  # subset of retries caused by ref lock contention on the server
+    failures: List[str] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)  # first attempt -> accepted, per push
+    push_durations: List[float] = field(default_factory=list)  # every single `git push` invocation
+
+    @property
+    def throughput(self) -> float:
+        """Accepted pushes per second."""
+        return self.accepted / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def retries_per_push(self) -> float:
+        return self.retries / self.accepted if self.accepted else 0.0
+
+    def latency(self) -> Summary:
+        return Summary.of(self.latencies)
+
+    def ok(self) -> bool:
+        return not self.failures
+
+
+@dataclass
+class ContentionReport:
+    results: List[ContentionResult] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        return bool(self.results) and all(r.ok() for r in self.results)
+
+    def format(self) -> str:
+        lines = [f"{'clients':>7}  {'pushes/s':>9}  {'retries/push':>12}  {'lock errs':>9}  "
+                 f"{'p50 ms':>9}  {'p90 ms':>9}  {'p99 ms':>9}  {'max ms':>9}  {'failures':>8}"]
+        for r in self.results:
+            s = r.latency()
+            lines.append(f"{r.clients:>7}  {r.throughput:>9.2f}  {r.retries_per_push:>12.2f}  {r.lock_errors:>9}  "
+                         f"{s.p50 * 1000:>9.1f}  {s.p90 * 1000:>9.1f}  {s.p99 * 1000:>9.1f}  "
+                         f"{s.max * 1000:>9.1f}  {len(r.failures):>8}")
+        return "\n".join(lines)
+
+
+class PushContentionHarness:
+    """
+    Drives concurrent pushes to one branch from N independent clones.
+    Clones are created lazily (reused across rounds) and each one gets its own GitClient
+    without tracing/Allure attachments so the client does not distort the timing.
+    `repo_url` overrides the URL built from protocol/host/owner/repo of the template `git` client.
+    """
+
+    def __init__(self, git: GitClient, workdir: str, branch: str = "gitguard-contention",
+                 protocol: Optional[str] = None, owner: Optional[str] = None, repo: Optional[str] = None,
+                 repo_url: Optional[str] = None, max_retries: int = 50, timeout: float = 120.0):
+        self.template = git
+        self.workdir = Path(workdir)
+        self.branch = branch
+        self.repo_url = repo_url or git._make_repo_url(protocol=protocol, owner=owner, repo=repo)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._clones: List[GitClient] = []
+
+    def _client(self, index: int) -> GitClient:
+        clone_dir = self.workdir / f"clone-{index}"
+        return GitClient(protocol=self.template.protocol, host=self.template.host, owner=self.template.owner,
+                         repo=self.template.repo, workdir=str(clone_dir), artifacts_dir=str(self.workdir / "artifacts"),
+                         enable_trace=False, attach_logs_always=False)
+
+    def _check(self, result: GitResult, what: str) -> GitResult:
+        if not result.ok():
+            raise RuntimeError(f"{what} failed: {result.stderr}")
+        return result
+
+    def prepare(self, clients: int) -> List[GitClient]:
+        """Make sure `clients` clones exist, all on the contention branch at the remote tip."""
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        while len(self._clones) < clients:
+            index = len(self._clones)
+            git = self._client(index)
+            self._check(self.template.clone(target_dir=str(git.workdir), repo_url=self.repo_url,
+                                            workdir=str(self.workdir)), f"clone #{index}")
+            has_branch = git._run(["ls-remote", "--exit-code", "--heads", "origin", self.branch])
+            if has_branch.ok():
+                self._check(git._run(["checkout", "-B", self.branch, f"origin/{self.branch}"]), "checkout")
+            else:
+                self._check(git._run(["checkout", "-B", self.branch]), "checkout")
+                self._check(git.push("origin", self.branch), "creating contention branch")
+            self._clones.append(git)
+        for git in self._clones[:clients]:
+            self._check(git.pull("origin", self.branch, rebase=True), f"sync {git.workdir.name}")
+        return self._clones[:clients]
+
+    def _pusher(self, index: int, git: GitClient, pushes: int, start: threading.Barrier,
+                result: ContentionResult, lock: threading.Lock) -> None:
+        path = f"contention/client-{index}.txt"
+        target = git.workdir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        start.wait()
+        for k in range(pushes):
+            with target.open("a") as f:
+                f.write(f"push {k} {time.time_ns()}\n")
+            step = git.add(path)
+            if step.ok():
+                step = git.commit(f"contention client {index} push {k}")
+            if not step.ok():
+                with lock:
+                    result.failures.append(f"client {index} commit {k}: {step.stderr.strip()[-300:]}")
+                return
+            first_attempt = time.perf_counter()
+            for attempt in range(self.max_retries + 1):
+                r = git.push("origin", self.branch)
+                kind = push_rejection(r)
+                with lock:
+                    result.push_durations.append(r.duration)
+                    if r.ok():
+                        result.accepted += 1
+                        result.latencies.append(time.perf_counter() - first_attempt)
+                    elif kind:
+                        result.retries += 1
+                        result.lock_errors += kind == "lock"
+                if r.ok():
+                    break
+                if kind is None or attempt == self.max_retries:
+                    with lock:
+                        result.failures.append(f"client {index} push {k}: {r.stderr.strip()[-300:]}")
+                    return
+                rebase = git.pull("origin", self.branch, rebase=True)
+                if not rebase.ok():
+                    git._run(["rebase", "--abort"])
+                    with lock:
+                        result.failures.append(f"client {index} rebase {k}: {rebase.stderr.strip()[-300:]}")
+                    return
+
+    def run(self, clients: int, pushes_per_client: int = 5) -> ContentionResult:
+        """One round: `clients` clones each push `pushes_per_client` commits, all starting together."""
+        clones = self.prepare(clients)
+        result = ContentionResult(clients=clients)
+        lock = threading.Lock()
+        start = threading.Barrier(clients + 1)
+        threads = [threading.Thread(target=self._pusher, args=(i, git, pushes_per_client, start, result, lock),
+                                    name=f"pusher-{i}", daemon=True) for i, git in enumerate(clones)]
+        for t in threads:
+            t.start()
+        start.wait()
+        began = time.perf_counter()
+        for t in threads:
+            t.join(max(0.0, self.timeout - (time.perf_counter() - began)))
+        result.wall_time = time.perf_counter() - began
+        stuck = [t.name for t in threads if t.is_alive()]
+        if stuck:
+            result.failures.append(f"timed out after {self.timeout}s: {', '.join(stuck)}")
+        logger.info("[contention] clients=%d accepted=%d retries=%d (lock=%d) %.2f pushes/s failures=%d",
+                    clients, result.accepted, result.retries, result.lock_errors, result.throughput,
+                    len(result.failures))
+        return result
+
+    def sweep(self, clients: Sequence[int] = (1, 2, 4, 8), pushes_per_client: int = 5) -> ContentionReport:
+        """Run one round per client count to show how throughput and tail latency scale with N."""
+        return ContentionReport(results=[self.run(n, pushes_per_client) for n in clients])
+
+    def remote_heads(self) -> Dict[str, str]:
+        """Branch -> sha on the remote, as seen by the first clone."""
+        r = self._clones[0]._run(["ls-remote", "--heads", "origin"]) if self._clones else None
+        if not (r and r.ok()):
+            return {}
+        return {ref.removeprefix("refs/heads/"): sha for sha, ref in (l.split("\t") for l in r.stdout.splitlines())}
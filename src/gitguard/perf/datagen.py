@@ -0,0 +1,158 @@
+"""
+Deterministic large test files without holding them in memory.
+
+Content is produced block by block from a seeded PRNG and written in `chunk_size` pieces while
+being hashed, so a multi-GiB file costs one chunk of memory. `compressibility` (0.0 .. 1.0) sets
+the share of every 4 KiB block that is a repeated filler pattern instead of random bytes: 0.0 is
+incompressible, 0.5 deflates to roughly half, which keeps zlib/pack compression realistic.
+All-zero files can be created as sparse holes (no data written) or preallocated with
+posix_fallocate, and variants of an existing file are cloned with copy_file_range (in-kernel,
+reflinked on CoW filesystems) and then patched in a few places, like an edited binary:
+
+    base = write_file(Path("/tmp/data/base.bin"), 2 * 1024**3, seed=1, compressibility=0.3)
+    edited = clone_variant(base.path, Path("/tmp/data/edited.bin"), patches=8, seed=2)
+    tree = write_tree(Path("/tmp/repo/assets"), count=100, size=1024 * 1024, compressibility=0.5)
+
+The same (seed, size, compressibility) always yields the same bytes, whatever `chunk_size` is.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import shutil
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+CHUNK_SIZE = 1024 * 1024
+BLOCK_SIZE = 4096
+# repeated in the compressible part of every block; text-like so deflate sees realistic matches
+_FILLER = b"gitguard test data - the quick brown fox jumps over the lazy dog 0123456789\n"
+
+
+@dataclass(frozen=True)
+class FileSpec:
+    path: Path
+    size: int
+    sha256: str  # also the Git LFS oid of the content
+
+
+def _hash_zeros(size: int, chunk_size: int = CHUNK_SIZE) -> str:
+    digest = hashlib.sha256()
+    zeros = bytes(chunk_size)
+    for offset in range(0, size, chunk_size):
+        digest.update(zeros[:min(chunk_size, size - offset)])
+    return digest.hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_file(path: Path, size: int, seed: int = 0, compressibility: float = 0.0,
+               chunk_size: int = CHUNK_SIZE) -> FileSpec:
+    """Stream `size` deterministic bytes into `path` (see module docstring for `compressibility`)."""
+    if not 0.0 <= compressibility <= 1.0:
+        raise ValueError(f"compressibility must be within 0.0 .. 1.0, got {compressibility}")
+    rng = random.Random(seed)
+    random_part = BLOCK_SIZE - int(BLOCK_SIZE * compressibility)
+    filler = (_FILLER * (BLOCK_SIZE // len(_FILLER) + 1))[:BLOCK_SIZE - random_part]
+    blocks_per_chunk = max(1, chunk_size // BLOCK_SIZE)
+
+    digest = hashlib.sha256()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        remaining = size
+        while remaining > 0:
+            chunk = b"".join(rng.randbytes(random_part) + filler for _ in range(blocks_per_chunk))
+            chunk = chunk[:remaining]
+            fh.write(chunk)
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return FileSpec(path, size, digest.hexdigest())
+
+
+def write_sparse(path: Path, size: int) -> FileSpec:
+    """A `size`-byte all-zero file made of a hole: instant, and no data blocks where supported."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.truncate(size)
+    return FileSpec(path, size, _hash_zeros(size))
+
+
+def write_allocated(path: Path, size: int) -> FileSpec:
+    """
+    A `size`-byte all-zero file with its blocks reserved (posix_fallocate), for when holes would
+    be unrealistic (e.g. measuring disk usage); falls back to a sparse file where unsupported.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        try:
+            if size:
+                os.posix_fallocate(fh.fileno(), 0, size)
+        except (AttributeError, OSError):
+            fh.truncate(size)
+    return FileSpec(path, size, _hash_zeros(size))
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """Copy with copy_file_range (in-kernel, reflink on CoW filesystems), else a buffered copy."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        remaining = os.fstat(fin.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            fin.seek(0)
+            fout.seek(0)
+            fout.truncate()
+            shutil.copyfileobj(fin, fout, CHUNK_SIZE)
+
+
+def clone_variant(src: Path, dst: Path, patches: int = 4, patch_size: int = BLOCK_SIZE, seed: int = 0,
+                  sha256: bool = True) -> FileSpec:
+    """
+    Copy `src` to `dst` and overwrite `patches` seeded random regions of `patch_size` bytes, so
+    the variant deltas well against the original. sha256=False skips re-reading the file to hash it
+    (FileSpec.sha256 is then empty).
+    """
+    copy_file(src, dst)
+    size = dst.stat().st_size
+    rng = random.Random(seed)
+    if size:
+        with open(dst, "r+b") as fh:
+            for _ in range(patches):
+                length = min(patch_size, size)
+                fh.seek(rng.randrange(0, size - length + 1))
+                fh.write(rng.randbytes(length))
+    return FileSpec(dst, size, hash_file(dst) if sha256 else "")
+
+
+def write_tree(directory: Path, count: int, size: int, seed: int = 0, compressibility: float = 0.0,
+               suffix: str = ".bin", kind: str = "random") -> List[FileSpec]:
+    """
+    `count` files `blob-NNNN<suffix>` for push/clone benchmarks, each with distinct content:
+    kind "random" uses seed + i, "sparse" and "allocated" (all zeros) make file i `i` bytes longer.
+    """
+    specs: List[FileSpec] = []
+    for i in range(count):
+        path = directory / f"blob-{i:04d}{suffix}"
+        if kind == "random":
+            specs.append(write_file(path, size, seed=seed + i, compressibility=compressibility))
+        elif kind == "sparse":
+            specs.append(write_sparse(path, size + i))
+        elif kind == "allocated":
+            specs.append(write_allocated(path, size + i))
+        else:
+            raise ValueError(f"unknown file kind {kind!r}, expected 'random', 'sparse' or 'allocated'")
+    return specs
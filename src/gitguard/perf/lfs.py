@@ -0,0 +1,171 @@
+"""
+Git LFS throughput benchmark.
+
+Large test files come from gitguard.perf.datagen (seeded random data streamed chunk by chunk,
+or sparse files that occupy no disk blocks) and are hashed while being written, so multi-GiB
+objects never sit in memory. The benchmark then drives Gitea's LFS API directly through LfsClient:
+
+- batch API latency for upload and download requests
+- upload and download throughput of the basic transfer adapter (parallel transfers)
+- integrity: every downloaded object is streamed through sha256 and compared with its oid
+
+    lfs = LfsClient(gitea, pool_size=8)
+    bench = LfsThroughputBenchmark(lfs, "testuser", "test-repo", workdir="/tmp/lfs")
+    print(bench.run(count=8, size=64 * 1024 * 1024, max_parallel=4).format())
+
+measure_git_lfs_push() covers the same path through git itself (`git lfs track`, commit, push).
+"""
+from __future__ import annotations
+
+import logging
+import shutil
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from gitguard.clients.git_client import GitClient
+from gitguard.clients.lfs_client import LfsClient, LfsObject, LfsTransfer
+from gitguard.perf.datagen import write_tree
+from gitguard.perf.stats import Summary, format_table
+
+logger = logging.getLogger("gitguard")
+
+
+def generate_files(directory: Path, count: int, size: int, kind: str = "random", seed: int = 0,
+                   compressibility: float = 0.0, suffix: str = ".bin") -> Dict[Path, LfsObject]:
+    """`count` generated files of about `size` bytes with distinct oids (see datagen.write_tree)."""
+    return {spec.path: LfsObject(spec.sha256, spec.size)
+            for spec in write_tree(directory, count, size, seed=seed, compressibility=compressibility,
+                                   suffix=suffix, kind=kind)}
+
+
+@dataclass
+class LfsReport:
+    batch_latencies: Dict[str, List[float]] = field(default_factory=dict)  # operation -> seconds
+    transfers: List[LfsTransfer] = field(default_factory=list)
+    phase_times: Dict[str, float] = field(default_factory=dict)  # operation -> wall time of the phase
+    errors: List[str] = field(default_factory=list)
+
+    def _of(self, operation: str) -> List[LfsTransfer]:
+        return [t for t in self.transfers if t.operation == operation]
+
+    def throughput(self, operation: str) -> float:
+        """Aggregate bytes per second of a phase (parallel transfers included)."""
+        wall = self.phase_times.get(operation, 0.0)
+        return sum(t.bytes for t in self._of(operation)) / wall if wall > 0 else 0.0
+
+    @property
+    def integrity_failures(self) -> List[str]:
+        return [t.oid for t in self._of("download") if not t.verified]
+
+    def ok(self) -> bool:
+        return (not self.errors and bool(self._of("download")) and not self.integrity_failures
+                and all(t.ok() for t in self.transfers))
+
+    def format(self) -> str:
+        rows = {f"batch {op}": Summary.of(v) for op, v in self.batch_latencies.items()}
+        rows.update({f"{op} transfer": Summary.of([t.duration for t in self._of(op) if not t.skipped])
+                     for op in ("upload", "download")})
+        lines = [format_table(rows)]
+        for op in ("upload", "download"):
+            moved = sum(t.bytes for t in self._of(op))
+            lines.append(f"{op}: {len(self._of(op))} objects, {moved / (1024 * 1024):.1f} MiB in "
+                         f"{self.phase_times.get(op, 0.0):.2f}s = {self.throughput(op) / (1024 * 1024):.1f} MiB/s"
+                         + (f", {sum(t.skipped for t in self._of(op))} already present" if op == "upload" else ""))
+        lines.append(f"integrity failures: {len(self.integrity_failures)}  errors: {len(self.errors)}")
+        lines += [f"ERROR {e}" for e in self.errors]
+        return "\n".join(lines)
+
+
+class LfsThroughputBenchmark:
+    """Uploads generated files to owner/repo through the LFS API, downloads them back and verifies them."""
+
+    def __init__(self, lfs: LfsClient, owner: str, repo: str, workdir: str):
+        self.lfs = lfs
+        self.owner = owner
+        self.repo = repo
+        self.workdir = Path(workdir)
+
+    def run(self, count: int = 4, size: int = 16 * 1024 * 1024, kind: str = "random", seed: int = 0,
+            max_parallel: int = 4, batch_probes: int = 5, keep_files: bool = False,
+            compressibility: float = 0.0) -> LfsReport:
+        report = LfsReport()
+        source, received = self.workdir / "source", self.workdir / "received"
+        files = generate_files(source, count, size, kind=kind, seed=seed, compressibility=compressibility)
+        objects = list(files.values())
+        try:
+            start = time.perf_counter()
+            batch, transfers = self.lfs.upload_files(self.owner, self.repo, list(files), max_parallel=max_parallel)
+            report.phase_times["upload"] = time.perf_counter() - start
+            report.batch_latencies["upload"] = [batch.duration]
+            report.transfers += transfers
+            if not batch.ok():
+                report.errors.append(f"upload batch: {batch.status_code} {batch.error or batch.errors()}")
+                return report
+
+            # extra batch round-trips with nothing left to upload: pure batch API latency
+            for _ in range(batch_probes):
+                report.batch_latencies["upload"].append(self.lfs.batch(self.owner, self.repo, "upload",
+                                                                       objects).duration)
+
+            start = time.perf_counter()
+            batch, transfers = self.lfs.download_objects(self.owner, self.repo, objects, received,
+                                                         max_parallel=max_parallel)
+            report.phase_times["download"] = time.perf_counter() - start
+            report.batch_latencies["download"] = [batch.duration]
+            report.transfers += transfers
+            if not batch.ok():
+                report.errors.append(f"download batch: {batch.status_code} {batch.error or batch.errors()}")
+            report.errors += [f"{t.operation} {t.oid[:12]}: {t.error}" for t in report.transfers if t.error]
+        finally:
+            if not keep_files:
+                shutil.rmtree(source, ignore_errors=True)
+                shutil.rmtree(received, ignore_errors=True)
+        logger.info("LFS benchmark %s/%s:\n%s", self.owner, self.repo, report.format())
+        return report
+
+
+@dataclass
+class GitLfsPushResult:
+    files: Dict[str, str]  # path in the repo -> oid written locally
+    push_duration: float
+    bytes: int
+    mismatched: List[str] = field(default_factory=list)  # paths whose committed oid differs
+
+    @property
+    def throughput(self) -> float:
+        return self.bytes / self.push_duration if self.push_duration > 0 else 0.0
+
+    def ok(self) -> bool:
+        return bool(self.files) and not self.mismatched
+
+
+def measure_git_lfs_push(git: GitClient, clone_dir: str, count: int, size: int, branch: str = "main",
+                         kind: str = "random", seed: int = 0, subdir: str = "lfs",
+                         compressibility: float = 0.0) -> GitLfsPushResult:
+    """
+    Track `<subdir>/*.bin` with LFS in an existing clone, commit `count` generated files and time
+    `git push` (the pre-push hook uploads the LFS objects). Raises RuntimeError when a git step fails.
+    """
+    repo = Path(clone_dir)
+    r = git.lfs_install(workdir=clone_dir)
+    if r.ok():
+        r = git.lfs_track([f"{subdir}/*.bin"], workdir=clone_dir)
+    if not r.ok():
+        raise RuntimeError(f"git lfs setup failed: {r.stderr}")
+    generated = generate_files(repo / subdir, count, size, kind=kind, seed=seed, compressibility=compressibility)
+    r = git.add(subdir, workdir=clone_dir)
+    if r.ok():
+        r = git.commit(f"add {count} LFS files", workdir=clone_dir)
+    if not r.ok():
+        raise RuntimeError(f"committing LFS files failed: {r.stderr}")
+
+    push = git.push(branch=branch, workdir=clone_dir)
+    if not push.ok():
+        raise RuntimeError(f"git push with LFS objects failed: {push.stderr}")
+    expected = {str(p.relative_to(repo)): o.oid for p, o in generated.items()}
+    committed = git.lfs_files(workdir=clone_dir)
+    return GitLfsPushResult(files=expected, push_duration=push.duration, bytes=sum(o.size for o in generated.values()),
+                            mismatched=[p for p, oid in expected.items() if committed.get(p) != oid])
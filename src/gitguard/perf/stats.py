@@ -0,0 +1,67 @@
+"""
+Small latency statistics helpers shared by the perf probes (percentiles, summaries, text tables,
+on-disk sizes).
+"""
+from __future__ import annotations
+
+import math
+import os
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q-th percentile (0..100) with linear interpolation between closest ranks; nan for no values."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class Summary:
+    """Distribution summary of a series of measurements (seconds unless stated otherwise)."""
+    count: int
+    min: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    mean: float
+
+    @classmethod
+    def of(cls, values: Sequence[float]) -> "Summary":
+        if not values:
+            return cls(0, math.nan, math.nan, math.nan, math.nan, math.nan, math.nan)
+        return cls(count=len(values), min=min(values), p50=percentile(values, 50), p90=percentile(values, 90),
+                   p99=percentile(values, 99), max=max(values), mean=sum(values) / len(values))
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+def format_table(rows: Mapping[str, Summary], scale: float = 1000.0, unit: str = "ms") -> str:
+    """Render summaries as an aligned text table (values multiplied by `scale`)."""
+    label_width = max([len("series")] + [len(k) for k in rows])
+    cols = ("min", "p50", "p90", "p99", "max", "mean")
+    lines = [f"{'series':<{label_width}}  {'n':>5}  " + "  ".join(f"{c + ' ' + unit:>10}" for c in cols)]
+    for label, s in rows.items():
+        values = "  ".join(f"{getattr(s, c) * scale:>10.2f}" for c in cols)
+        lines.append(f"{label:<{label_width}}  {s.count:>5}  {values}")
+    return "\n".join(lines)
+
+
+def dir_size(path: Path) -> int:
+    """Total apparent size (bytes) of the files under `path`; files vanishing meanwhile are skipped."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
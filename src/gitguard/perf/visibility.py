@@ -0,0 +1,250 @@
+"""
+Push-to-API visibility probe.
+
+Pushes a fresh commit with GitClient.push() and polls Gitea until the new head is visible on
+each endpoint (one polling thread per endpoint), recording the lag between the push returning and
+the first poll that observes it:
+
+    branch    GET /api/v1/repos/{owner}/{repo}/branches/{branch}   -> commit.id == pushed sha
+    contents  GET /api/v1/repos/{owner}/{repo}/contents/{path}     -> sha == pushed blob sha
+    web       GET /{owner}/{repo}/src/branch/{branch}              -> page references pushed sha
+
+Polling starts at `min_delay` (a couple of milliseconds) and backs off up to `max_delay` (below
+100ms) on every push, so no earlier sample puts a floor under the lag a faster server reports.
+Every protocol pushes to its own branch, so the iterations never contend with each other:
+
+    PYTHONPATH=src python3 -m gitguard.perf.visibility --url http://localhost:3000 \\
+        --owner testuser --repo test-repo --protocols http,ssh --iterations 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from gitguard.clients.git_client import GitClient
+from gitguard.clients.http_client import HttpClient
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.perf.stats import Summary, format_table
+
+logger = logging.getLogger("gitguard")
+
+ENDPOINTS = ("branch", "contents", "web")
+
+
+@dataclass
+class VisibilitySample:
+    """One push and the time until each endpoint reported it (None: not visible before the timeout)."""
+    protocol: str
+    iteration: int
+    sha: str
+    push_duration: float
+    lag: Dict[str, Optional[float]] = field(default_factory=dict)
+    polls: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class VisibilityReport:
+    samples: List[VisibilitySample] = field(default_factory=list)
+
+    def lags(self, protocol: Optional[str] = None, endpoint: Optional[str] = None) -> List[float]:
+        return [lag for s in self.samples if protocol in (None, s.protocol)
+                for ep, lag in s.lag.items() if endpoint in (None, ep) and lag is not None]
+
+    def timeouts(self) -> int:
+        return sum(1 for s in self.samples for lag in s.lag.values() if lag is None)
+
+    def summary(self) -> Dict[str, Summary]:
+        """Lag distribution per `protocol/endpoint`, plus the push durations per protocol."""
+        rows: Dict[str, Summary] = {}
+        for protocol in dict.fromkeys(s.protocol for s in self.samples):
+            rows[f"{protocol}/push"] = Summary.of([s.push_duration for s in self.samples if s.protocol == protocol])
+            for endpoint in dict.fromkeys(ep for s in self.samples for ep in s.lag):
+                rows[f"{protocol}/{endpoint}"] = Summary.of(self.lags(protocol, endpoint))
+        return rows
+
+    def ok(self) -> bool:
+        return bool(self.samples) and self.timeouts() == 0
+
+    def format(self) -> str:
+        return format_table(self.summary()) + f"\ntimeouts: {self.timeouts()}"
+
+    def as_dict(self) -> dict:
+        return {"samples": [asdict(s) for s in self.samples],
+                "summary": {k: v.as_dict() for k, v in self.summary().items()},
+                "timeouts": self.timeouts()}
+
+
+class VisibilityProbe:
+    """
+    Measures push -> REST API / web UI visibility lag for a repository.
+    `git` supplies host/owner/repo defaults for clone URLs; `api` supplies base URL and token.
+    Polls bypass Allure attachments so long runs do not flood the report.
+    """
+
+    def __init__(self, git: GitClient, api: GiteaHttpClient, owner: str, repo: str, workdir: str,
+                 endpoints: Sequence[str] = ("branch", "contents"), branch_prefix: str = "gitguard-visibility",
+                 path: str = "visibility/probe.txt", timeout: float = 30.0,
+                 min_delay: float = 0.002, max_delay: float = 0.05, factor: float = 1.5):
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"unknown endpoints: {sorted(unknown)}")
+        self.git = git
+        self.owner = owner
+        self.repo = repo
+        self.workdir = Path(workdir)
+        self.endpoints = tuple(endpoints)
+        self.branch_prefix = branch_prefix
+        self.path = path
+        self.timeout = timeout
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self._headers = api._auth_headers()
+        self._api = HttpClient(api.base_url, timeout=api.timeout, attach_to_allure=False)
+        self._web = HttpClient(api.base_url.removesuffix("/api/v1"), timeout=api.timeout, attach_to_allure=False)
+        self._clones: Dict[str, Path] = {}
+
+    def branch(self, protocol: str) -> str:
+        return f"{self.branch_prefix}-{protocol}"
+
+    # ----- setup -----
+
+    def prepare(self, protocol: str) -> Path:
+        """Clone the repo over `protocol` (once) and switch to the protocol's probe branch."""
+        if protocol in self._clones:
+            return self._clones[protocol]
+        clone_dir = self.workdir / protocol
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        r = self.git.clone(target_dir=str(clone_dir), protocol=protocol, owner=self.owner, repo=self.repo,
+                           workdir=str(self.workdir))
+        if not r.ok():
+            raise RuntimeError(f"clone over {protocol} failed: {r.stderr}")
+        r = self.git._run(["checkout", "-B", self.branch(protocol)], cwd=str(clone_dir))
+        if not r.ok():
+            raise RuntimeError(f"checkout {self.branch(protocol)} failed: {r.stderr}")
+        self._clones[protocol] = clone_dir
+        return clone_dir
+
+    def cleanup(self) -> None:
+        """Delete the probe branches from the server."""
+        for protocol in self._clones:
+            self._api.delete(f"repos/{self.owner}/{self.repo}/branches/{self.branch(protocol)}",
+                             headers=self._headers)
+
+    # ----- measurement -----
+
+    def _check(self, endpoint: str, branch: str, sha: str, blob: str) -> bool:
+        if endpoint == "branch":
+            r = self._api.get(f"repos/{self.owner}/{self.repo}/branches/{branch}", headers=self._headers)
+            return r.ok() and ((r.json or {}).get("commit") or {}).get("id") == sha
+        if endpoint == "contents":
+            r = self._api.get(f"repos/{self.owner}/{self.repo}/contents/{self.path}", params={"ref": branch},
+                              headers=self._headers)
+            return r.ok() and isinstance(r.json, dict) and r.json.get("sha") == blob
+        r = self._web.get(f"{self.owner}/{self.repo}/src/branch/{branch}", headers=self._headers)
+        return r.ok() and sha in r.text
+
+    def _poll(self, check: Callable[[str], bool], endpoint: str, pushed_at: float) -> tuple:
+        """Poll one endpoint with backoff until it observed the push; (lag or None, polls)."""
+        polls = 0
+        delay = self.min_delay
+        while True:
+            polls += 1
+            if check(endpoint):
+                return time.perf_counter() - pushed_at, polls
+            if time.perf_counter() - pushed_at > self.timeout:
+                return None, polls
+            time.sleep(delay)
+            delay = min(self.max_delay, delay * self.factor)
+
+    def _wait_visible(self, check: Callable[[str], bool], pushed_at: float) -> tuple:
+        """
+        Poll every endpoint on its own thread, so a slow endpoint's requests never delay (and
+        inflate the lag of) another; returns per-endpoint lag (None on timeout) and poll counts.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.endpoints), thread_name_prefix="visibility") as pool:
+            futures = {e: pool.submit(self._poll, check, e, pushed_at) for e in self.endpoints}
+            results = {e: f.result() for e, f in futures.items()}
+        return {e: r[0] for e, r in results.items()}, {e: r[1] for e, r in results.items()}
+
+    def measure(self, protocol: str, iteration: int) -> VisibilitySample:
+        """Commit a unique change, push it over `protocol` and time its visibility on every endpoint."""
+        clone_dir = str(self.prepare(protocol))
+        target = Path(clone_dir) / self.path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(f"{protocol} {iteration} {time.time_ns()}\n")
+        for r in (self.git.add(self.path, workdir=clone_dir),
+                  self.git.commit(f"visibility probe {protocol} #{iteration}", workdir=clone_dir)):
+            if not r.ok():
+                raise RuntimeError(f"preparing probe commit failed: {r.stderr}")
+        sha = self.git.rev_parse("HEAD", workdir=clone_dir).stdout
+        blob = self.git.rev_parse(f"HEAD:{self.path}", workdir=clone_dir).stdout
+
+        branch = self.branch(protocol)
+        push = self.git.push("origin", branch, workdir=clone_dir)
+        pushed_at = time.perf_counter()
+        if not push.ok():
+            raise RuntimeError(f"push over {protocol} failed: {push.stderr}")
+
+        sample = VisibilitySample(protocol=protocol, iteration=iteration, sha=sha, push_duration=push.duration)
+        sample.lag, sample.polls = self._wait_visible(lambda ep: self._check(ep, branch, sha, blob), pushed_at)
+        logger.info("[visibility] %s #%d %s push=%.3fs lag=%s", protocol, iteration, sha[:10], push.duration,
+                    {k: (round(v * 1000, 1) if v is not None else None) for k, v in sample.lag.items()})
+        return sample
+
+    def run(self, protocols: Sequence[str] = ("http",), iterations: int = 10, warmup: int = 1) -> VisibilityReport:
+        """Interleave protocols per iteration; the first `warmup` iterations are not reported."""
+        report = VisibilityReport()
+        for i in range(warmup + iterations):
+            for protocol in protocols:
+                sample = self.measure(protocol, i)
+                if i >= warmup:
+                    report.samples.append(sample)
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure push -> API visibility lag on Gitea.")
+    parser.add_argument("--url", required=True, help="Gitea base URL, e.g. http://localhost:3000")
+    parser.add_argument("--owner", required=True)
+    parser.add_argument("--repo", required=True)
+    parser.add_argument("--host", help="Git host for clone URLs (default: host of --url)")
+    parser.add_argument("--token")
+    parser.add_argument("--protocols", default="http", help="Comma-separated: http,ssh,git")
+    parser.add_argument("--endpoints", default="branch,contents", help=f"Comma-separated subset of {ENDPOINTS}")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write samples and summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    api = GiteaHttpClient(args.url, token=args.token, attach_to_allure=False)
+    with tempfile.TemporaryDirectory(prefix="gitguard-visibility-") as tmp:
+        git = GitClient(host=args.host or urlparse(args.url).hostname, owner=args.owner, repo=args.repo,
+                        workdir=tmp, enable_trace=False, attach_logs_always=False)
+        probe = VisibilityProbe(git, api, args.owner, args.repo, workdir=tmp,
+                                endpoints=args.endpoints.split(","), timeout=args.timeout)
+        try:
+            report = probe.run(args.protocols.split(","), iterations=args.iterations, warmup=args.warmup)
+        finally:
+            probe.cleanup()
+
+    print(report.format())
+    if args.output:
+        Path(args.output).write_text(json.dumps(report.as_dict(), indent=2))
+    return 0 if report.ok() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
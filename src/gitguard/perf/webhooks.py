@@ -0,0 +1,229 @@
+"""
+Push -> webhook delivery latency measurement.
+
+WebhookReceiver is a local threaded HTTP server that timestamps every webhook delivery the
+moment it arrives (acknowledging immediately so Gitea is never slowed down by the receiver).
+Deliveries are correlated with pushes by commit id (`after` in the push payload), which yields
+delivery latency plus dropped (never delivered) and duplicated (delivered more than once) pushes:
+
+    with WebhookReceiver(secret="s3cret") as receiver:
+        report = measure_webhook_latency(gitea, git, receiver, "testuser", "test-repo", clone_dir, count=100)
+        print(report.format())
+
+The receiver must be reachable from Gitea (`advertise_host`, default: this host's name) and
+Gitea must allow delivering to it (`[webhook] ALLOWED_HOST_LIST`, e.g. `private`).
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import socket
+import threading
+import time
+
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from gitguard.clients.git_client import GitClient
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.perf.stats import Summary, format_table
+
+logger = logging.getLogger("gitguard")
+
+
+@dataclass
+class WebhookDelivery:
+    delivery_id: str
+    event: str
+    ref: Optional[str]
+    after: Optional[str]  # head commit id of a push event
+    received_at: float  # time.perf_counter() of this process
+    signature_ok: Optional[bool] = None  # None when the receiver has no secret
+
+
+class _HookHandler(BaseHTTPRequestHandler):
+    server: "_HookServer"
+
+    def do_POST(self):
+        received_at = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.server.receiver._record(self.path, self.headers, body, received_at)
+
+    def log_message(self, format, *args):
+        logger.debug("[webhook] " + format, *args)
+
+
+class _HookServer(ThreadingHTTPServer):
+    daemon_threads = True
+    receiver: "WebhookReceiver"
+
+
+class WebhookReceiver:
+    """Threaded HTTP endpoint collecting timestamped webhook deliveries."""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 0, secret: Optional[str] = None,
+                 advertise_host: Optional[str] = None, path: str = "/hook"):
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.advertise_host = advertise_host or socket.gethostname()
+        self.path = path
+        self._deliveries: List[WebhookDelivery] = []
+        self._cond = threading.Condition()
+        self._server: Optional[_HookServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.advertise_host}:{self.port}{self.path}"
+
+    def start(self) -> "WebhookReceiver":
+        self._server = _HookServer((self.host, self.port), _HookHandler)
+        self._server.receiver = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="webhook-receiver", daemon=True)
+        self._thread.start()
+        logger.info("[webhook] receiver listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "WebhookReceiver":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _record(self, path: str, headers, body: bytes, received_at: float) -> None:
+        signature_ok = None
+        if self.secret:
+            expected = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            signature_ok = hmac.compare_digest(expected, headers.get("X-Gitea-Signature", ""))
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            payload = {}
+        delivery = WebhookDelivery(delivery_id=headers.get("X-Gitea-Delivery", ""),
+                                   event=headers.get("X-Gitea-Event", ""), ref=payload.get("ref"),
+                                   after=payload.get("after"), received_at=received_at, signature_ok=signature_ok)
+        with self._cond:
+            self._deliveries.append(delivery)
+            self._cond.notify_all()
+
+    @property
+    def deliveries(self) -> List[WebhookDelivery]:
+        with self._cond:
+            return list(self._deliveries)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._deliveries.clear()
+
+    def wait_for(self, shas: Sequence[str], timeout: float) -> bool:
+        """Block until a delivery was seen for every commit id in `shas` (False on timeout)."""
+        wanted = set(shas)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not wanted <= {d.after for d in self._deliveries}:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+
+@dataclass
+class WebhookLatencyReport:
+    latencies: Dict[str, float] = field(default_factory=dict)  # sha -> push start to first delivery
+    dropped: List[str] = field(default_factory=list)
+    duplicates: int = 0  # deliveries beyond the first one for the same commit
+    unexpected: int = 0  # deliveries not matching any push
+    bad_signatures: int = 0
+
+    def summary(self) -> Summary:
+        return Summary.of(list(self.latencies.values()))
+
+    def ok(self) -> bool:
+        return bool(self.latencies) and not self.dropped and not self.bad_signatures
+
+    def format(self) -> str:
+        return (format_table({"push->webhook": self.summary()}) +
+                f"\ndropped: {len(self.dropped)}  duplicates: {self.duplicates}  "
+                f"unexpected: {self.unexpected}  bad signatures: {self.bad_signatures}")
+
+
+def correlate(pushes: Mapping[str, float], deliveries: Sequence[WebhookDelivery]) -> WebhookLatencyReport:
+    """Match deliveries to pushes (commit id -> push start time) by the pushed head commit."""
+    report = WebhookLatencyReport()
+    for d in sorted(deliveries, key=lambda d: d.received_at):
+        if d.signature_ok is False:
+            report.bad_signatures += 1
+        if d.after not in pushes:
+            report.unexpected += 1
+        elif d.after in report.latencies:
+            report.duplicates += 1
+        else:
+            report.latencies[d.after] = d.received_at - pushes[d.after]
+    report.dropped = [sha for sha in pushes if sha not in report.latencies]
+    return report
+
+
+def push_load(git: GitClient, clone_dir: str, count: int, branch: str = "main", rate: Optional[float] = None,
+              path: str = "webhook/probe.txt") -> Dict[str, float]:
+    """
+    Commit and push `count` times (at most `rate` pushes per second when given).
+    Returns commit id -> time.perf_counter() taken right before the push started.
+    """
+    pushes: Dict[str, float] = {}
+    target = Path(clone_dir) / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    for i in range(count):
+        if rate:
+            time.sleep(max(0.0, started + i / rate - time.perf_counter()))
+        target.write_text(f"push {i} {time.time_ns()}\n")
+        for r in (git.add(path, workdir=clone_dir), git.commit(f"webhook probe #{i}", workdir=clone_dir)):
+            if not r.ok():
+                raise RuntimeError(f"preparing commit #{i} failed: {r.stderr}")
+        sha = git.rev_parse("HEAD", workdir=clone_dir).stdout
+        pushed_at = time.perf_counter()
+        r = git.push("origin", branch, workdir=clone_dir)
+        if not r.ok():
+            raise RuntimeError(f"push #{i} failed: {r.stderr}")
+        pushes[sha] = pushed_at
+    return pushes
+
+
+def measure_webhook_latency(gitea: GiteaHttpClient, git: GitClient, receiver: WebhookReceiver, owner: str,
+                            repo: str, clone_dir: str, count: int = 20, branch: str = "main",
+                            rate: Optional[float] = None, grace: float = 30.0) -> WebhookLatencyReport:
+    """Register a push hook pointing at `receiver`, drive `count` pushes and correlate the deliveries."""
+    r = gitea.create_hook(owner, repo, receiver.url, events=["push"], secret=receiver.secret,
+                          branch_filter=branch)
+    if not r.ok():
+        raise RuntimeError(f"create_hook failed: {r.status_code} {r.text}")
+    hook_id = r.json["id"]
+    try:
+        receiver.clear()
+        pushes = push_load(git, clone_dir, count, branch=branch, rate=rate)
+        if not receiver.wait_for(list(pushes), timeout=grace):
+            logger.warning("[webhook] not every push was delivered within %.1fs", grace)
+        # short settle period so late duplicates are counted too
+        time.sleep(min(1.0, grace))
+    finally:
+        gitea.delete_hook(owner, repo, hook_id)
+    report = correlate(pushes, receiver.deliveries)
+    logger.info("[webhook] %s/%s push -> webhook latency:\n%s", owner, repo, report.format())
+    return report
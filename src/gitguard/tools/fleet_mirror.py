@@ -0,0 +1,285 @@
+"""
+Fleet mirror: keep local `--mirror` copies of every repository on a Gitea instance.
+
+Repositories are enumerated page by page through repos/search, ordered by `updated_at` (most
+recently updated first), then synced with bounded concurrency: missing mirrors are cloned with
+`git clone --mirror`, existing ones are refreshed with `git fetch --prune`. Progress is written to
+a JSON state file after every repository, so an interrupted run resumes where it stopped and
+repositories whose `updated_at` did not change since their last successful sync are skipped:
+
+    api = GiteaHttpClient("http://gitea:3000", token=token)
+    git = GitClient(workdir="/srv/mirrors", artifacts_dir="/var/log/gitguard", enable_trace=False,
+                    attach_logs_always=False)
+    fleet = FleetMirror(api, git, "/srv/mirrors", "/srv/mirrors/fleet.json")
+    report = fleet.run(max_parallel=8)
+    print(report.format())
+
+or from the command line:
+
+    python -m gitguard.tools.fleet_mirror --url http://gitea:3000 --token "$TOKEN" --root /srv/mirrors -j 8
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from gitguard.clients.git_client import GitClient, GitResult
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.perf.stats import dir_size
+
+logger = logging.getLogger("gitguard")
+
+STATE_FILE_NAME = "fleet-state.json"
+
+
+@dataclass(frozen=True)
+class MirrorJob:
+    full_name: str  # owner/name
+    url: str
+    updated_at: str  # ISO timestamp as reported by Gitea; sorts chronologically
+
+    @property
+    def owner(self) -> str:
+        return self.full_name.split("/", 1)[0]
+
+    @property
+    def name(self) -> str:
+        return self.full_name.split("/", 1)[1]
+
+
+@dataclass
+class MirrorOutcome:
+    job: MirrorJob
+    action: str  # "clone" or "fetch"
+    ok: bool
+    duration: float  # seconds
+    bytes_delta: int  # growth of the mirror directory, a proxy for transferred pack data
+    error: str = ""
+
+
+@dataclass
+class FleetReport:
+    outcomes: List[MirrorOutcome] = field(default_factory=list)
+    skipped: int = 0  # up to date according to the state file
+    discovered: int = 0
+    wall_time: float = 0.0
+
+    def ok(self) -> bool:
+        return all(o.ok for o in self.outcomes)
+
+    @property
+    def failed(self) -> List[MirrorOutcome]:
+        return [o for o in self.outcomes if not o.ok]
+
+    @property
+    def bytes_total(self) -> int:
+        return sum(o.bytes_delta for o in self.outcomes if o.ok)
+
+    @property
+    def repos_per_second(self) -> float:
+        return len(self.outcomes) / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_total / self.wall_time if self.wall_time > 0 else 0.0
+
+    def format(self) -> str:
+        clones = sum(1 for o in self.outcomes if o.action == "clone")
+        lines = [
+            f"repos: {self.discovered} discovered, {len(self.outcomes)} synced "
+            f"({clones} cloned, {len(self.outcomes) - clones} fetched), {self.skipped} up to date, "
+            f"{len(self.failed)} failed",
+            f"wall: {self.wall_time:.2f}s  {self.repos_per_second:.2f} repos/s  "
+            f"{self.bytes_total / (1024 * 1024):.1f} MiB  {self.bytes_per_second / (1024 * 1024):.2f} MiB/s",
+        ]
+        lines += [f"FAILED {o.job.full_name} ({o.action}): {o.error}" for o in self.failed]
+        return "\n".join(lines)
+
+
+class FleetMirror:
+    """
+    Mirrors every repository visible to `api` into `root/<owner>/<name>.git`.
+
+    `url_for` maps a repos/search entry to the URL to clone from; by default `clone_url` is used
+    for protocol "http" and `ssh_url` for "ssh", any other protocol goes through
+    GitClient._make_repo_url (e.g. "git" for the git daemon). HTTP(S) clones and fetches
+    authenticate with the API token, so private repositories enumerated by an admin token mirror too.
+    """
+
+    def __init__(self, api: GiteaHttpClient, git: GitClient, root: str, state_file: Optional[str] = None,
+                 protocol: str = "http", url_for: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 page_size: int = 50):
+        self.api = api
+        self.git = git
+        self.root = Path(root)
+        self.state_file = Path(state_file) if state_file else self.root / STATE_FILE_NAME
+        self.protocol = protocol
+        self.url_for = url_for or self._default_url
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._state: Dict[str, dict] = {}
+        if self.state_file.exists():
+            self._state = json.loads(self.state_file.read_text(encoding="utf-8"))
+
+    def _default_url(self, repo: Dict[str, Any]) -> str:
+        if self.protocol in ("http", "https"):
+            return repo["clone_url"]
+        if self.protocol == "ssh":
+            return repo["ssh_url"]
+        return self.git._make_repo_url(protocol=self.protocol, owner=repo["owner"]["login"], repo=repo["name"])
+
+    def _auth_env(self) -> Dict[str, str]:
+        """
+        Basic auth with the API token as an http.extraHeader. It is passed through the environment
+        (GIT_CONFIG_*), so it is neither stored in the mirror's config nor shown in the logged command.
+        """
+        token = getattr(self.api, "token", None)
+        if self.protocol not in ("http", "https") or not token:
+            return {}
+        basic = base64.b64encode(f"{token}:x-oauth-basic".encode()).decode()
+        return {"GIT_CONFIG_COUNT": "1", "GIT_CONFIG_KEY_0": "http.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {basic}"}
+
+    # ---------- state ----------
+    def _save(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_name(self.state_file.name + ".tmp")
+        tmp.write_text(json.dumps(self._state, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.state_file)
+
+    def _record(self, outcome: MirrorOutcome) -> None:
+        with self._lock:
+            entry = self._state.setdefault(outcome.job.full_name, {})
+            entry.update({"action": outcome.action, "ok": outcome.ok, "duration": round(outcome.duration, 3),
+                          "attempted_at": time.time(), "error": outcome.error})
+            if outcome.ok:
+                entry["updated_at"] = outcome.job.updated_at
+                entry["synced_at"] = entry["attempted_at"]
+            self._save()
+
+    def state(self, full_name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state.get(full_name) or {})
+
+    # ---------- planning ----------
+    def mirror_path(self, job: MirrorJob) -> Path:
+        return self.root / job.owner / f"{job.name}.git"
+
+    def discover(self) -> List[MirrorJob]:
+        """All repositories, most recently updated first."""
+        jobs = [MirrorJob(full_name=r["full_name"], url=self.url_for(r), updated_at=r.get("updated_at") or "")
+                for r in self.api.iter_repos(limit=self.page_size, sort="updated", order="desc")]
+        jobs.sort(key=lambda j: j.updated_at, reverse=True)
+        return jobs
+
+    def is_current(self, job: MirrorJob) -> bool:
+        """True when the last successful sync saw the same `updated_at` and the mirror still exists."""
+        entry = self.state(job.full_name)
+        return (entry.get("updated_at") == job.updated_at and bool(job.updated_at)
+                and self.mirror_path(job).is_dir())
+
+    def plan(self, force: bool = False) -> List[MirrorJob]:
+        return [job for job in self.discover() if force or not self.is_current(job)]
+
+    # ---------- sync ----------
+    def sync_one(self, job: MirrorJob, timeout: Optional[float] = 600) -> MirrorOutcome:
+        """
+        Clone or fetch one mirror. Clones go to `<name>.git.partial` and are renamed on success,
+        so an interrupted clone is never mistaken for an existing mirror on the next run.
+        """
+        dest = self.mirror_path(job)
+        start = time.perf_counter()
+        if dest.is_dir():
+            action, before = "fetch", dir_size(dest)
+            result = self.git._run(["fetch", "--prune", "origin"], extra_env=self._auth_env(), cwd=str(dest),
+                                   timeout=timeout, retry_safe=True)
+            after = dir_size(dest) if result.ok() else before
+        else:
+            action, before = "clone", 0
+            partial = dest.with_name(dest.name + ".partial")
+            shutil.rmtree(partial, ignore_errors=True)
+            partial.parent.mkdir(parents=True, exist_ok=True)
+            result = self.git._run(["clone", "--mirror", job.url, str(partial)], extra_env=self._auth_env(),
+                                   cwd=str(partial.parent), timeout=timeout, retry_safe=True,
+                                   before_retry=lambda: shutil.rmtree(partial, ignore_errors=True))
+            if result.ok():
+                partial.replace(dest)
+                after = dir_size(dest)
+            else:
+                shutil.rmtree(partial, ignore_errors=True)
+                after = 0
+        outcome = MirrorOutcome(job=job, action=action, ok=result.ok(), duration=time.perf_counter() - start,
+                                bytes_delta=max(0, after - before), error="" if result.ok() else _error(result))
+        self._record(outcome)
+        if outcome.ok:
+            logger.info("fleet: %s %s in %.2fs (+%d bytes)", action, job.full_name, outcome.duration,
+                        outcome.bytes_delta)
+        else:
+            logger.error("fleet: %s %s failed: %s", action, job.full_name, outcome.error)
+        return outcome
+
+    def run(self, max_parallel: int = 4, force: bool = False, limit: Optional[int] = None,
+            jobs: Optional[Iterable[MirrorJob]] = None) -> FleetReport:
+        """
+        Sync the whole fleet. Jobs are submitted in priority order, so with a bounded pool the
+        most recently updated repositories are synced first; `limit` caps the number of syncs.
+        """
+        start = time.perf_counter()
+        discovered = list(jobs) if jobs is not None else self.discover()
+        todo = [job for job in discovered if force or not self.is_current(job)]
+        report = FleetReport(discovered=len(discovered), skipped=len(discovered) - len(todo))
+        if limit is not None:
+            todo = todo[:limit]
+        by_name = {job.full_name: i for i, job in enumerate(todo)}
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            futures = [pool.submit(self.sync_one, job) for job in todo]
+            report.outcomes = [f.result() for f in as_completed(futures)]
+        report.outcomes.sort(key=lambda o: by_name[o.job.full_name])
+        report.wall_time = time.perf_counter() - start
+        logger.info("fleet: %s", report.format().replace("\n", "; "))
+        return report
+
+
+def _error(result: GitResult) -> str:
+    lines = [line for line in (result.stderr or "").splitlines() if line.strip()]
+    return lines[-1] if lines else f"exit code {result.returncode}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mirror every repository of a Gitea instance")
+    parser.add_argument("--url", default=os.environ.get("GITEA_BASE_URL", "http://gitea:3000"))
+    parser.add_argument("--token", default=os.environ.get("GITEA_TOKEN"))
+    parser.add_argument("--root", required=True, help="directory holding <owner>/<name>.git mirrors")
+    parser.add_argument("--state", help=f"progress file (default: <root>/{STATE_FILE_NAME})")
+    parser.add_argument("--artifacts", default="artifacts", help="git client log directory (keep it outside --root)")
+    parser.add_argument("--protocol", default="http", choices=("http", "https", "ssh", "git"))
+    parser.add_argument("-j", "--parallel", type=int, default=4)
+    parser.add_argument("--limit", type=int, help="sync at most this many repositories")
+    parser.add_argument("--force", action="store_true", help="sync repositories even if up to date")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    api = GiteaHttpClient(args.url, token=args.token)
+    # no trace or Allure attachment: one client serves every worker, and its log lives outside the mirrors
+    git = GitClient(workdir=args.root, host=args.url.split("://", 1)[-1].split(":", 1)[0],
+                    artifacts_dir=args.artifacts, enable_trace=False, attach_logs_always=False)
+    fleet = FleetMirror(api, git, args.root, state_file=args.state, protocol=args.protocol)
+    report = fleet.run(max_parallel=args.parallel, force=args.force, limit=args.limit)
+    print(report.format())
+    return 0 if report.ok() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
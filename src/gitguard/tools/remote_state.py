@@ -0,0 +1,142 @@
+"""
+Remote ref-state cache: detect which refs of a remote moved without fetching.
+
+Every poll is a single `git ls-remote` (protocol v2, heads/tags filtered server-side via
+ref-prefix), compared with the snapshot stored by the previous poll. Only refs that were
+created, updated or deleted need a fetch, so polling many repositories stays cheap:
+
+    cache = RemoteStateCache(GitClient(...), state_file="remote-state.json")
+    changes = cache.changed_refs("http://gitea:3000/testuser/test-repo.git")
+    cache.fetch_changed("/srv/mirrors/test-repo.git", mirror=True)   # fetch just what moved
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from gitguard.clients.git_client import GitClient, GitResult
+
+logger = logging.getLogger("gitguard")
+
+DEFAULT_PREFIXES = ("refs/heads/", "refs/tags/")
+
+
+@dataclass(frozen=True)
+class RefChange:
+    ref: str
+    old: Optional[str]  # None: ref did not exist in the previous snapshot
+    new: Optional[str]  # None: ref was deleted on the remote
+
+    @property
+    def kind(self) -> str:
+        if self.old is None:
+            return "created"
+        return "deleted" if self.new is None else "updated"
+
+
+def diff_refs(old: Dict[str, str], new: Dict[str, str]) -> List[RefChange]:
+    """Changes turning snapshot `old` into `new`, sorted by ref name."""
+    return [RefChange(ref, old.get(ref), new.get(ref))
+            for ref in sorted(old.keys() | new.keys()) if old.get(ref) != new.get(ref)]
+
+
+class RemoteStateCache:
+    """
+    Stores the last seen ref -> sha snapshot per remote (URL or remote name, see `key`),
+    optionally persisted as JSON in `state_file` so polls survive process restarts.
+    Thread-safe: poll_many() checks several remotes concurrently.
+    """
+
+    def __init__(self, git: GitClient, state_file: Optional[str] = None,
+                 prefixes: Sequence[str] = DEFAULT_PREFIXES):
+        self.git = git
+        self.state_file = Path(state_file) if state_file else None
+        self.prefixes = tuple(prefixes)
+        self._lock = threading.Lock()
+        self._state: Dict[str, dict] = {}
+        if self.state_file and self.state_file.exists():
+            self._state = json.loads(self.state_file.read_text(encoding="utf-8"))
+
+    def _save(self) -> None:
+        if self.state_file:
+            tmp = self.state_file.with_name(self.state_file.name + ".tmp")
+            tmp.write_text(json.dumps(self._state, indent=1, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.state_file)
+
+    def previous(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            return dict((self._state.get(key) or {}).get("refs", {}))
+
+    def snapshot(self, remote: str, workdir: Optional[str] = None) -> Dict[str, str]:
+        """Current refs of `remote` (one ls-remote round-trip)."""
+        return self.git.remote_refs(remote, prefixes=self.prefixes, workdir=workdir)
+
+    def _store(self, key: str, refs: Dict[str, str]) -> None:
+        with self._lock:
+            self._state[key] = {"refs": refs, "checked_at": time.time()}
+            self._save()
+
+    def changed_refs(self, remote: str, workdir: Optional[str] = None, key: Optional[str] = None,
+                     update: bool = True) -> List[RefChange]:
+        """
+        Refs of `remote` that changed since the previous call for the same `key` (default: `remote`).
+        The first call for a key reports every ref as created. With update=False the stored
+        snapshot is left untouched (peek).
+        """
+        key = key or remote
+        current = self.snapshot(remote, workdir=workdir)
+        changes = diff_refs(self.previous(key), current)
+        if update:
+            self._store(key, current)
+        return changes
+
+    def fetch_changed(self, workdir: str, remote: str = "origin",
+                      mirror: bool = False) -> Tuple[List[RefChange], Optional[GitResult]]:
+        """
+        Update the repository in `workdir` with only the refs of `remote` that moved.
+        Refs land in refs/remotes/<remote>/ (heads) and refs/tags/, or under the same name with
+        mirror=True; deleted refs are removed locally. The snapshot is only stored once the fetch
+        succeeded, so a failed fetch is retried on the next call.
+        """
+        url = self.git._run(["remote", "get-url", remote], cwd=workdir)
+        key = url.stdout if url.ok() and url.stdout else f"{workdir}#{remote}"
+        current = self.snapshot(remote, workdir=workdir)
+        changes = diff_refs(self.previous(key), current)
+
+        def local_ref(ref: str) -> str:
+            if mirror or not ref.startswith("refs/heads/"):
+                return ref
+            return f"refs/remotes/{remote}/{ref[len('refs/heads/'):]}"
+
+        refspecs = [f"+{c.ref}:{local_ref(c.ref)}" for c in changes if c.new is not None]
+        result = None
+        if refspecs:
+            result = self.git._run(["fetch", "--no-tags", remote, *refspecs], cwd=workdir, retry_safe=True)
+            if not result.ok():
+                logger.error("Fetching %d changed refs from %s failed: %s", len(refspecs), remote, result.stderr)
+                return changes, result
+        for change in changes:
+            if change.new is None:
+                self.git._run(["update-ref", "-d", local_ref(change.ref)], cwd=workdir)
+        self._store(key, current)
+        logger.info("%s: %d refs changed, fetched %d", key, len(changes), len(refspecs))
+        return changes, result
+
+    def poll_many(self, remotes: Sequence[str], max_parallel: int = 8) -> Dict[str, List[RefChange]]:
+        """changed_refs() for many remotes concurrently; remotes whose ls-remote failed are left out."""
+        def poll(remote: str) -> Tuple[str, Optional[List[RefChange]]]:
+            try:
+                return remote, self.changed_refs(remote)
+            except RuntimeError as e:
+                logger.warning("Polling %s failed: %s", remote, e)
+                return remote, None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            return {remote: changes for remote, changes in pool.map(poll, remotes) if changes is not None}
@@ -1,15 +1,21 @@
 import os
 import pytest
-import base64
 import logging
-import subprocess
 
 from gitguard.clients.http_gitea_client import GiteaHttpClient
-from gitguard.clients.git_client import GitClient
+from gitguard.clients.git_client import GitClient, RetryPolicy
+from gitguard.clients.reference_cache import ReferenceCache
+from gitguard.infra.namespacing import ResourceNamespace, write_git_config
+from gitguard.infra.readiness import default_probes, wait_until_ready
+from gitguard.infra.repo_pool import PooledRepo, RepoPool
+from gitguard.perf.webhooks import WebhookReceiver
 
 
 logger = logging.getLogger("gitguard")
 
+# duration-aware (LPT) xdist scheduling, enabled with --lpt
+pytest_plugins = ["gitguard.infra.scheduling"]
+
 
 @pytest.fixture(scope="session")
 def gitea_base_url():
@@ -33,7 +39,38 @@ def gitea_token():
 
 
 @pytest.fixture(scope="session")
-def gitea_client(gitea_base_url, gitea_token) -> GiteaHttpClient:
+def ns() -> ResourceNamespace:
+    """Per-xdist-worker name factory for users/repos/orgs (unchanged names in serial runs)."""
+    return ResourceNamespace()
+
+
+@pytest.fixture(scope="session")
+def e2e_user(ns) -> str:
+    return ns.user("testuser")
+
+
+@pytest.fixture(scope="session")
+def e2e_repo(ns) -> str:
+    return ns.repo("test-repo")
+
+
+@pytest.fixture(scope="session")
+def gitea_ready(gitea_base_url, gitea_host):
+    """
+    Wait until Gitea HTTP health, SSH and git daemon all answer (probed concurrently).
+    The report carries per-service time-to-ready.
+    """
+    report = wait_until_ready(
+        default_probes(base_url=gitea_base_url, git_host=gitea_host),
+        timeout=float(os.getenv("GITEA_READY_TIMEOUT", "120")),
+    )
+    logger.info("[setup] Gitea readiness after %.3fs:\n%s", report.elapsed, report.summary())
+    assert report.ok(), f"Gitea stack not ready:\n{report.summary()}"
+    return report
+
+
+@pytest.fixture(scope="session")
+def gitea_client(gitea_base_url, gitea_token, gitea_ready) -> GiteaHttpClient:
     client = GiteaHttpClient(base_url=gitea_base_url, token=gitea_token)
     version = client.version()
     assert version.ok(), f"Gitea server not reachable at {gitea_base_url} (status={version.status_code})"
@@ -41,18 +78,18 @@ def gitea_client(gitea_base_url, gitea_token) -> GiteaHttpClient:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment(gitea_client):
+def setup_test_environment(gitea_client, ns, e2e_user, e2e_repo):
     """
     Prepare a reusable test environment for E2E:
       - ensure test user exists
       - ensure test repo exists (under that user)
       - ensure README.md file is present
-    Runs once per CI session.
+    Runs once per session, i.e. once per xdist worker, each with its own namespaced user/repo.
     """
-    username = "testuser"
-    email = "testuser@example.com"
+    username = e2e_user
+    email = ns.email("testuser")
     password = "Password123!"
-    repo_name = "test-repo"
+    repo_name = e2e_repo
 
     # --- 1. Ensure test user exists ---
     logger.info("[setup] Ensuring test user '%s' exists", username)
@@ -75,15 +112,12 @@ def setup_test_environment(gitea_client):
 
     # --- 4. Create README.md if missing ---
     logger.info("[setup] Creating README.md in '%s/%s'", username, repo_name)
-    content = base64.b64encode(b"# Test Repository\n\nAuto-created for GitGuard E2E tests.\n").decode("utf-8")
-    payload = {
-        "content": content,
-        "message": "Add initial README.md"
-    }
-    r = gitea_client.post(f"repos/{username}/{repo_name}/contents/README.md",
-                          json=payload, headers=gitea_client._auth_headers())
+    r = gitea_client.commit_files(username, repo_name, "main",
+                                  {"README.md": "# Test Repository\n\nAuto-created for GitGuard E2E tests.\n"},
+                                  message="Add initial README.md")
     if not r.ok():
-        raise RuntimeError(f"Failed to create README.md: {r.status_code} {r.text}")
+        failed = r.responses[-1]
+        raise RuntimeError(f"Failed to create README.md: {failed.status_code} {failed.text}")
 
     logger.info("[setup] Repo '%s/%s' ready for testing", username, repo_name)
 
@@ -98,14 +132,76 @@ def setup_test_environment(gitea_client):
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_git_identity():
-    """Ensure git identity matches the test user created in setup_test_environment."""
-    subprocess.run(["git", "config", "--global", "user.email", "testuser@example.com"], check=False)
-    subprocess.run(["git", "config", "--global", "user.name", "testuser"], check=False)
+def setup_git_identity(tmp_path_factory, ns, e2e_user):
+    """
+    Ensure git identity matches the test user created in setup_test_environment.
+    Each worker writes its own config file and points GIT_CONFIG_GLOBAL at it
+    instead of mutating the shared ~/.gitconfig.
+    """
+    config_path = write_git_config(tmp_path_factory.getbasetemp() / "gitconfig",
+                                   user_name=e2e_user, user_email=ns.email("testuser"))
+    previous = os.environ.get("GIT_CONFIG_GLOBAL")
+    os.environ["GIT_CONFIG_GLOBAL"] = str(config_path)
+    yield config_path
+    if previous is None:
+        os.environ.pop("GIT_CONFIG_GLOBAL", None)
+    else:
+        os.environ["GIT_CONFIG_GLOBAL"] = previous
+
+
+@pytest.fixture(scope="session")
+def repo_pool(gitea_client, ns, e2e_user, setup_test_environment) -> RepoPool:
+    """
+    Warm pool of seeded repos owned by the (per-worker) test user.
+    Size is configurable via GITGUARD_REPO_POOL_SIZE; returned repos are recycled in the background.
+    """
+    pool = RepoPool(
+        gitea_client,
+        owner=e2e_user,
+        size=int(os.getenv("GITGUARD_REPO_POOL_SIZE", "4")),
+        prefix=ns.repo("pool"),
+        seed_files={"README.md": "# Pooled Repository\n\nLeased by GitGuard E2E tests.\n"},
+    ).start()
+    yield pool
+    pool.close()
 
 
 @pytest.fixture
-def git_client(tmp_path) -> GitClient:
-    # default git client with workdir per-test
-    c = GitClient(workdir=str(tmp_path))
+def pooled_repo(repo_pool) -> PooledRepo:
+    """A fresh seeded repository leased for the duration of one test."""
+    with repo_pool.leased() as repo:
+        yield repo
+
+
+@pytest.fixture(scope="session")
+def reference_cache(tmp_path_factory):
+    """
+    Reference mirrors shared by all xdist workers of a run (flock-protected), so repeated clones of
+    the same repo only transfer new objects. GITGUARD_REFERENCE_CACHE=<dir> relocates it, =off disables it.
+    """
+    location = os.getenv("GITGUARD_REFERENCE_CACHE", "")
+    if location.lower() in ("0", "off", "false", "no"):
+        return None
+    # under xdist the basetemp is <run>/popen-gwN, so its parent is common to all workers
+    return ReferenceCache(location or str(tmp_path_factory.getbasetemp().parent / "reference-cache"))
+
+
+@pytest.fixture
+def git_client(request, tmp_path) -> GitClient:
+    # default git client with workdir per-test; GITGUARD_GIT_RETRIES=N retries transient network failures,
+    # e2e tests clone through the shared reference cache (unit tests stay hermetic)
+    retries = int(os.getenv("GITGUARD_GIT_RETRIES", "0"))
+    cache = request.getfixturevalue("reference_cache") if request.node.get_closest_marker("e2e") else None
+    c = GitClient(workdir=str(tmp_path), retry_policy=RetryPolicy(max_attempts=retries + 1) if retries else None,
+                  reference_cache=cache)
     return c
+
+
+@pytest.fixture
+def webhook_receiver(ns) -> WebhookReceiver:
+    """
+    Local threaded webhook endpoint (signed deliveries) for the duration of one test.
+    Gitea reaches it via GITGUARD_WEBHOOK_HOST (default: this container's hostname).
+    """
+    with WebhookReceiver(secret=f"gitguard-{ns.worker}", advertise_host=os.getenv("GITGUARD_WEBHOOK_HOST")) as r:
+        yield r
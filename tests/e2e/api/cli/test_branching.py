@@ -3,15 +3,15 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_create_and_switch_branch(git_client, gitea_host, protocol, tmp_path):
+def test_create_and_switch_branch(git_client, gitea_host, protocol, tmp_path, e2e_user, e2e_repo):
     """
     E2E: clone repo, create new branch, switch to it and back to main.
     """
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(tmp_path)
 
     # 1. Clone repository
@@ -19,12 +19,12 @@ def test_create_and_switch_branch(git_client, gitea_host, protocol, tmp_path):
     assert clone_result.ok(), f"Clone failed: {clone_result.stderr}"
 
     # 2. Work in cloned repo
-    repo_dir = tmp_path / "test-repo"
+    repo_dir = tmp_path / e2e_repo
     branch_client = type(git_client)(
         protocol=protocol,
         host=gitea_host,
-        owner="testuser",
-        repo="test-repo",
+        owner=e2e_user,
+        repo=e2e_repo,
         workdir=str(repo_dir),
     )
 
@@ -43,15 +43,15 @@ def test_create_and_switch_branch(git_client, gitea_host, protocol, tmp_path):
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_checkout_nonexistent_branch(git_client, gitea_host, protocol, tmp_path):
+def test_checkout_nonexistent_branch(git_client, gitea_host, protocol, tmp_path, e2e_user, e2e_repo):
     """
     E2E: attempting to checkout a non-existent branch should fail.
     """
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(tmp_path)
 
     # 1. Clone
@@ -59,12 +59,12 @@ def test_checkout_nonexistent_branch(git_client, gitea_host, protocol, tmp_path)
     assert clone_result.ok(), f"Clone failed: {clone_result.stderr}"
 
     # 2. Attempt checkout to non-existent branch
-    repo_dir = tmp_path / "test-repo"
+    repo_dir = tmp_path / e2e_repo
     branch_client = type(git_client)(
         protocol=protocol,
         host=gitea_host,
-        owner="testuser",
-        repo="test-repo",
+        owner=e2e_user,
+        repo=e2e_repo,
         workdir=str(repo_dir),
     )
 
@@ -0,0 +1,35 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.perf.bundles import BundleSeedingBenchmark, BundleServer
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.parametrize("protocol", ["http", "ssh"])
+def test_bundles_avoid_server_pack_generation(git_client, gitea_client, gitea_host, tmp_path, pooled_repo,
+                                              protocol):
+    """Bundle-file and bundle-uri clones must leave the server far less to pack than a plain clone."""
+    for n in range(int(os.getenv("GITGUARD_BUNDLE_SEED_COMMITS", "5"))):
+        files = {f"data/part{i}.txt": f"{n}:{i}\n" * 4000 for i in range(8)}
+        assert gitea_client.commit_files(pooled_repo.owner, pooled_repo.name, "main", files, f"seed {n}").ok()
+    repo_url = git_client._make_repo_url(protocol=protocol, host=gitea_host, owner=pooled_repo.owner,
+                                         repo=pooled_repo.name)
+
+    with BundleServer(str(tmp_path / "bundles")) as server:
+        bench = BundleSeedingBenchmark(git_client, str(tmp_path / "seeding"), repo_url, server)
+        bench.prepare()
+        # one more commit after the bundle was cut: bundle clones still have to fetch it from Gitea
+        assert gitea_client.commit_files(pooled_repo.owner, pooled_repo.name, "main",
+                                         {"late.txt": "after the bundle\n"}, "late").ok()
+        report = bench.run(iterations=int(os.getenv("GITGUARD_BUNDLE_ITERATIONS", "3")))
+
+    logger.info("Bundle seeding over %s:\n%s", protocol, report.format())
+    assert report.ok(), report.format()
+    full = report.get("server").last.server_pack_bytes
+    for approach in ("bundle-file", "bundle-uri"):
+        assert report.get(approach).last.server_pack_bytes < full / 2, report.format()
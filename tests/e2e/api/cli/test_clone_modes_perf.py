@@ -0,0 +1,34 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.perf.clone_modes import CloneModeBenchmark
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
+def test_clone_modes_bytes_and_time(git_client, gitea_client, gitea_host, tmp_path, pooled_repo, protocol):
+    """Every clone mode succeeds; shallow and filtered clones must transfer less than a full clone."""
+    # a few commits touching a docs/ + src/ layout, so history, blobs and the sparse cone all matter
+    for n in range(int(os.getenv("GITGUARD_CLONE_MODES_COMMITS", "5"))):
+        files = {f"src/mod{i}.py": f"VALUE = {n * 100 + i}\n" * 2000 for i in range(10)}
+        files.update({f"docs/page{i}.md": f"revision {n}\n" * 500 for i in range(3)})
+        assert gitea_client.commit_files(pooled_repo.owner, pooled_repo.name, "main", files, f"seed {n}").ok()
+
+    git_client.host = gitea_host
+    bench = CloneModeBenchmark(git_client, workdir=str(tmp_path / "clone-modes"), owner=pooled_repo.owner,
+                               repo=pooled_repo.name)
+    report = bench.run(protocols=(protocol,), iterations=int(os.getenv("GITGUARD_CLONE_MODES_ITERATIONS", "3")))
+
+    logger.info("Clone modes over %s:\n%s", protocol, report.format())
+    assert report.ok(), report.format()
+    full = report.get(protocol, "full").last
+    assert report.get(protocol, "shallow").last.pack_bytes < full.pack_bytes
+    for mode in ("blobless", "treeless"):
+        sample = report.get(protocol, mode).last
+        if sample.filtered:
+            assert sample.pack_bytes < full.pack_bytes, report.format()
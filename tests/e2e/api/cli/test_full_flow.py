@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_full_git_flow(git_client, gitea_host, protocol, tmp_path):
+def test_full_git_flow(git_client, gitea_host, protocol, tmp_path, e2e_user, e2e_repo):
     """
     Full lifecycle:
     1. init local repo
@@ -23,8 +23,8 @@ def test_full_git_flow(git_client, gitea_host, protocol, tmp_path):
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(repo_dir)
 
     init_result = git_client.init()
@@ -61,20 +61,20 @@ def test_full_git_flow(git_client, gitea_host, protocol, tmp_path):
     cloner = git_client.__class__(
         protocol=protocol,
         host=gitea_host,
-        owner="testuser",
-        repo="test-repo",
+        owner=e2e_user,
+        repo=e2e_repo,
         workdir=str(clone_dir)
     )
 
     clone_result = cloner.clone()
     assert clone_result.ok(), f"Clone failed: {clone_result.stderr}"
 
-    repo_cloned_dir = clone_dir / "test-repo"
+    repo_cloned_dir = clone_dir / e2e_repo
     clone2 = git_client.__class__(
         protocol=protocol,
         host=gitea_host,
-        owner="testuser",
-        repo="test-repo",
+        owner=e2e_user,
+        repo=e2e_repo,
         workdir=str(repo_cloned_dir)
     )
 
@@ -3,14 +3,14 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_init_and_commit(git_client, gitea_host, protocol, tmp_path):
+def test_init_and_commit(git_client, gitea_host, protocol, tmp_path, e2e_user, e2e_repo):
     repo_dir = tmp_path / "local"
     repo_dir.mkdir()
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(repo_dir)
 
     # init
@@ -30,14 +30,14 @@ def test_init_and_commit(git_client, gitea_host, protocol, tmp_path):
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_commit_without_add(git_client, gitea_host, protocol, tmp_path):
+def test_commit_without_add(git_client, gitea_host, protocol, tmp_path, e2e_user, e2e_repo):
     repo_dir = tmp_path / "local"
     repo_dir.mkdir()
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(repo_dir)
 
     git_client.init()
@@ -0,0 +1,51 @@
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from gitguard.perf.datagen import clone_variant, write_tree
+
+logger = logging.getLogger("gitguard")
+
+MIB = 1024 * 1024
+
+
+def _pack_bytes(repo: Path) -> int:
+    return sum(p.stat().st_size for p in (repo / ".git" / "objects" / "pack").glob("*.pack"))
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.parametrize("compressibility", [0.0, 0.6])
+def test_large_file_push_and_clone(git_client, gitea_host, tmp_path, pooled_repo, compressibility):
+    """Push generated binaries plus an edited variant; the clone's pack must reflect compression and deltas."""
+    count = int(os.getenv("GITGUARD_DATAGEN_FILES", "4"))
+    size = int(os.getenv("GITGUARD_DATAGEN_FILE_MIB", "8")) * MIB
+    clone_dir = tmp_path / "clone"
+    r = git_client.clone(target_dir=str(clone_dir), protocol="http", host=gitea_host,
+                         owner=pooled_repo.owner, repo=pooled_repo.name)
+    assert r.ok(), f"Clone failed: {r.stderr}"
+
+    specs = write_tree(clone_dir / "data", count, size, seed=11, compressibility=compressibility)
+    assert git_client.add("data", workdir=str(clone_dir)).ok()
+    assert git_client.commit(f"add {count} generated files", workdir=str(clone_dir)).ok()
+    first = git_client.push(workdir=str(clone_dir))
+    assert first.ok(), first.stderr
+
+    # an edited copy of the first file: the second push should send a small delta, not the whole file
+    clone_variant(specs[0].path, specs[0].path.with_suffix(".tmp"), patches=4, seed=12, sha256=False)
+    os.replace(specs[0].path.with_suffix(".tmp"), specs[0].path)
+    assert git_client.add("data", workdir=str(clone_dir)).ok()
+    assert git_client.commit("edit one generated file", workdir=str(clone_dir)).ok()
+    second = git_client.push(workdir=str(clone_dir))
+    assert second.ok(), second.stderr
+
+    check_dir = tmp_path / "check"
+    r = git_client.clone(target_dir=str(check_dir), protocol="http", host=gitea_host,
+                         owner=pooled_repo.owner, repo=pooled_repo.name, reference=False)
+    assert r.ok(), f"Clone failed: {r.stderr}"
+    raw, packed = count * size, _pack_bytes(check_dir)
+    logger.info("compressibility %.1f: %d MiB raw -> %.1f MiB packed; pushes %.2fs + %.2fs (edit)",
+                compressibility, raw // MIB, packed / MIB, first.duration, second.duration)
+    assert packed < raw * (1 - compressibility) + size // 2, f"{packed} pack bytes for {raw} raw bytes"
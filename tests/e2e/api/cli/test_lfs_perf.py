@@ -0,0 +1,46 @@
+import logging
+import os
+import shutil
+
+import pytest
+
+from gitguard.clients.lfs_client import LfsClient
+from gitguard.perf.lfs import LfsThroughputBenchmark, measure_git_lfs_push
+
+logger = logging.getLogger("gitguard")
+
+MIB = 1024 * 1024
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.parametrize("kind", ["random", "sparse"])
+def test_lfs_api_throughput_and_integrity(gitea_client, tmp_path, pooled_repo, kind):
+    """Upload generated objects through the LFS batch API, download them back and verify every sha256."""
+    parallel = int(os.getenv("GITGUARD_LFS_PARALLEL", "4"))
+    bench = LfsThroughputBenchmark(LfsClient(gitea_client, pool_size=parallel), pooled_repo.owner,
+                                   pooled_repo.name, str(tmp_path / "lfs"))
+
+    report = bench.run(count=int(os.getenv("GITGUARD_LFS_OBJECTS", "4")),
+                       size=int(os.getenv("GITGUARD_LFS_OBJECT_MIB", "16")) * MIB, kind=kind, max_parallel=parallel)
+
+    logger.info("LFS API throughput (%s files):\n%s", kind, report.format())
+    assert report.ok(), report.format()
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.skipif(shutil.which("git-lfs") is None, reason="git-lfs is not installed")
+def test_git_lfs_push_throughput(git_client, gitea_host, tmp_path, pooled_repo):
+    """git push of LFS-tracked files: every committed pointer must reference the generated content."""
+    clone_dir = tmp_path / "clone"
+    r = git_client.clone(target_dir=str(clone_dir), protocol="http", host=gitea_host,
+                         owner=pooled_repo.owner, repo=pooled_repo.name)
+    assert r.ok(), f"Clone failed: {r.stderr}"
+
+    result = measure_git_lfs_push(git_client, str(clone_dir), count=int(os.getenv("GITGUARD_LFS_OBJECTS", "4")),
+                                  size=int(os.getenv("GITGUARD_LFS_OBJECT_MIB", "16")) * MIB)
+
+    logger.info("git lfs push: %d files, %.1f MiB in %.2fs (%.1f MiB/s)", len(result.files), result.bytes / MIB,
+                result.push_duration, result.throughput / MIB)
+    assert result.ok(), result.mismatched
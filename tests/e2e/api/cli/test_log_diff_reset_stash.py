@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_git_log_diff_reset_stash(git_client, gitea_host, tmp_path, protocol):
+def test_git_log_diff_reset_stash(git_client, gitea_host, tmp_path, protocol, ns):
     """
     Scenario:
     1. init repo
@@ -23,8 +23,8 @@ def test_git_log_diff_reset_stash(git_client, gitea_host, tmp_path, protocol):
     # Configure fixture client dynamically for this test
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "bob"
-    git_client.repo = "hist-demo"
+    git_client.owner = ns.user("bob")
+    git_client.repo = ns.repo("hist-demo")
     git_client.workdir = str(workdir)
 
     # 1. init repo
@@ -0,0 +1,26 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.perf.contention import PushContentionHarness
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+@pytest.mark.parametrize("protocol", ["http", "ssh"])
+def test_same_branch_push_contention(git_client, gitea_host, tmp_path, pooled_repo, protocol):
+    """N clones push to one branch concurrently; every push must land after rebase/retry."""
+    clients = [int(n) for n in os.getenv("GITGUARD_CONTENTION_CLIENTS", "1,2,4,8").split(",")]
+    pushes = int(os.getenv("GITGUARD_CONTENTION_PUSHES", "5"))
+    git_client.host = gitea_host
+    harness = PushContentionHarness(git_client, workdir=str(tmp_path / "contention"), protocol=protocol,
+                                    owner=pooled_repo.owner, repo=pooled_repo.name)
+
+    report = harness.sweep(clients, pushes_per_client=pushes)
+
+    logger.info("Same-branch push contention over %s:\n%s", protocol, report.format())
+    assert report.ok(), [r.failures for r in report.results]
+    assert [r.accepted for r in report.results] == [n * pushes for n in clients]
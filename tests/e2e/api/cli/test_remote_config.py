@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_git_remote_configuration(git_client, gitea_host, tmp_path, protocol):
+def test_git_remote_configuration(git_client, gitea_host, tmp_path, protocol, ns):
     """
     Scenario:
     1. init repo
@@ -15,8 +15,8 @@ def test_git_remote_configuration(git_client, gitea_host, tmp_path, protocol):
     """
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "alice"
-    git_client.repo = "remote-demo"
+    git_client.owner = ns.user("alice")
+    git_client.repo = ns.repo("remote-demo")
     git_client.workdir = str(tmp_path / "repo")
 
     # init repo
@@ -3,21 +3,21 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_status_clean_repo(git_client, gitea_host, tmp_path, protocol):
+def test_status_clean_repo(git_client, gitea_host, tmp_path, protocol, e2e_user, e2e_repo):
     """
     Check that freshly cloned repository has a clean working tree.
     """
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(tmp_path)
 
     # Clone repo
     result = git_client.clone()
     assert result.ok(), f"Clone failed: {result.stderr}"
 
-    repo_dir = tmp_path / "test-repo"
+    repo_dir = tmp_path / e2e_repo
     git_client.workdir = str(repo_dir)
 
     # Check status
@@ -31,21 +31,21 @@ def test_status_clean_repo(git_client, gitea_host, tmp_path, protocol):
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_fetch_from_origin(git_client, gitea_host, tmp_path, protocol):
+def test_fetch_from_origin(git_client, gitea_host, tmp_path, protocol, e2e_user, e2e_repo):
     """
     Fetch from origin should complete successfully.
     """
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "testuser"
-    git_client.repo = "test-repo"
+    git_client.owner = e2e_user
+    git_client.repo = e2e_repo
     git_client.workdir = str(tmp_path)
 
     # Clone repo
     result = git_client.clone()
     assert result.ok(), f"Clone failed: {result.stderr}"
 
-    repo_dir = tmp_path / "test-repo"
+    repo_dir = tmp_path / e2e_repo
     git_client.workdir = str(repo_dir)
 
     # Fetch
@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.e2e
 @pytest.mark.parametrize("protocol", ["http", "ssh", "git"])
-def test_git_tags(git_client, gitea_host, tmp_path, protocol):
+def test_git_tags(git_client, gitea_host, tmp_path, protocol, ns):
     """
     Scenario:
     1. init repo
@@ -21,8 +21,8 @@ def test_git_tags(git_client, gitea_host, tmp_path, protocol):
 
     git_client.protocol = protocol
     git_client.host = gitea_host
-    git_client.owner = "bob"
-    git_client.repo = "tag-demo"
+    git_client.owner = ns.user("bob")
+    git_client.repo = ns.repo("tag-demo")
     git_client.workdir = str(workdir)
 
     # 1. init repo
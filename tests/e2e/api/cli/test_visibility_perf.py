@@ -0,0 +1,26 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.perf.visibility import VisibilityProbe
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+def test_push_to_api_visibility_lag(git_client, gitea_client, gitea_host, tmp_path, e2e_user, e2e_repo):
+    """Push repeatedly over http/ssh and report how long until branch head and contents API show the commit."""
+    git_client.host = gitea_host
+    iterations = int(os.getenv("GITGUARD_VISIBILITY_ITERATIONS", "5"))
+    probe = VisibilityProbe(git_client, gitea_client, e2e_user, e2e_repo, workdir=str(tmp_path / "visibility"),
+                            endpoints=("branch", "contents", "web"))
+    try:
+        report = probe.run(["http", "ssh"], iterations=iterations)
+    finally:
+        probe.cleanup()
+
+    logger.info("Push -> API visibility lag:\n%s", report.format())
+    assert report.ok(), f"Pushes not visible within {probe.timeout}s:\n{report.format()}"
+    assert len(report.samples) == 2 * iterations
@@ -0,0 +1,28 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.perf.webhooks import measure_webhook_latency
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+def test_push_to_webhook_delivery_latency(git_client, gitea_client, gitea_host, tmp_path, pooled_repo,
+                                          webhook_receiver):
+    """Sustained pushes to a fresh repo; every push must be delivered exactly once to the local receiver."""
+    clone_dir = tmp_path / "clone"
+    r = git_client.clone(target_dir=str(clone_dir), protocol="http", host=gitea_host,
+                         owner=pooled_repo.owner, repo=pooled_repo.name)
+    assert r.ok(), f"Clone failed: {r.stderr}"
+
+    report = measure_webhook_latency(gitea_client, git_client, webhook_receiver, pooled_repo.owner,
+                                     pooled_repo.name, str(clone_dir),
+                                     count=int(os.getenv("GITGUARD_WEBHOOK_PUSHES", "20")),
+                                     rate=float(os.getenv("GITGUARD_WEBHOOK_RATE", "5")))
+
+    logger.info("Push -> webhook delivery latency:\n%s", report.format())
+    assert report.ok(), report.format()
+    assert report.duplicates == 0, report.format()
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.mark.e2e
+@pytest.mark.parametrize("protocol", ["http", "ssh"])
+def test_two_actors_share_one_clone(git_client, gitea_host, protocol, tmp_path, pooled_repo):
+    """
+    Two users working on one repository with a single clone: actor A works in the clone on main,
+    actor B in a worktree on its own branch. Both push; A then sees B's work after a fetch.
+    """
+    git_client.host = gitea_host
+    clone = git_client.clone(target_dir="clone", protocol=protocol, owner=pooled_repo.owner, repo=pooled_repo.name)
+    assert clone.ok(), f"Clone failed: {clone.stderr}"
+    repo_dir = tmp_path / "clone"
+    git_client.workdir = str(repo_dir)
+
+    with git_client.worktree("feature/actor-b", create=True, start_point="origin/main") as actor_b:
+        (actor_b / "b.txt").write_text("from actor b")
+        assert git_client.add("b.txt", workdir=str(actor_b)).ok()
+        assert git_client.commit("actor b", workdir=str(actor_b)).ok()
+        push_b = git_client.push(branch="feature/actor-b", workdir=str(actor_b))
+        assert push_b.ok(), f"Push from worktree failed: {push_b.stderr}"
+
+    (repo_dir / "a.txt").write_text("from actor a")
+    assert git_client.add("a.txt").ok() and git_client.commit("actor a").ok()
+    push_a = git_client.push(branch="main")
+    assert push_a.ok(), f"Push from clone failed: {push_a.stderr}"
+
+    assert git_client.fetch().ok()
+    with git_client.worktree(start_point="origin/feature/actor-b", detach=True) as review:
+        assert (review / "b.txt").read_text() == "from actor b"
+        assert not (review / "a.txt").exists()
+    assert (repo_dir / "a.txt").exists() and not (repo_dir / "b.txt").exists()
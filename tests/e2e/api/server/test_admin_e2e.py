@@ -2,7 +2,7 @@ import pytest
 
 
 @pytest.mark.e2e
-def test_admin_create_edit_delete_user(gitea_client):
+def test_admin_create_edit_delete_user(gitea_client, ns):
     """
     Full admin user lifecycle:
     1. Create new user as admin
@@ -12,8 +12,8 @@ def test_admin_create_edit_delete_user(gitea_client):
     5. Confirm deletion
     """
 
-    username = "admin_testuser"
-    email = "admin_test@example.com"
+    username = ns.user("admin_testuser")
+    email = ns.email("admin_test")
     password = "Password123!"
 
     # 1. Create new user
@@ -27,7 +27,7 @@ def test_admin_create_edit_delete_user(gitea_client):
     assert username in usernames, f"Expected {username} in {usernames}"
 
     # 3. Edit user email
-    new_email = "admin_updated@example.com"
+    new_email = ns.email("admin_updated")
     resp = gitea_client.edit_user(username, email=new_email)
     assert resp.ok(), f"Edit user failed: {resp.status_code} {resp.text}"
     user_data = gitea_client.get_user(username).json
@@ -44,7 +44,7 @@ def test_admin_create_edit_delete_user(gitea_client):
 
 
 @pytest.mark.e2e
-def test_admin_create_repo_for_user(gitea_client):
+def test_admin_create_repo_for_user(gitea_client, ns):
     """
     Admin repository lifecycle:
     1. Create new user
@@ -52,10 +52,10 @@ def test_admin_create_repo_for_user(gitea_client):
     3. Fetch repo
     """
 
-    username = "admin_repo_owner"
-    email = "repo_owner@example.com"
+    username = ns.user("admin_repo_owner")
+    email = ns.email("repo_owner")
     password = "Password123!"
-    repo_name = "admin-test-repo"
+    repo_name = ns.repo("admin-test-repo")
 
     # 1. Create user if not exists
     resp = gitea_client.create_user(username=username, email=email, password=password)
@@ -85,10 +85,10 @@ def test_admin_list_unadopted_repos(gitea_client):
 
 
 @pytest.mark.e2e
-def test_admin_duplicate_user_creation(gitea_client):
+def test_admin_duplicate_user_creation(gitea_client, ns):
     """Negative case: creating the same user twice should fail the second time."""
-    username = "dup_admin_user"
-    email = "dup_admin@example.com"
+    username = ns.user("dup_admin_user")
+    email = ns.email("dup_admin")
     password = "Password123!"
 
     # First attempt
@@ -17,16 +17,16 @@ def test_version(gitea_client):
 
 
 @pytest.mark.e2e
-def test_repo_rename_and_delete(gitea_client):
+def test_repo_rename_and_delete(gitea_client, ns):
     """
     Create a repo for a test user, rename it, verify rename, then delete and verify deletion.
     """
 
-    username = "misc_repo_owner"
-    email = "misc_repo_owner@example.com"
+    username = ns.user("misc_repo_owner")
+    email = ns.email("misc_repo_owner")
     password = "Password123!"
-    original_repo = "misc-repo"
-    renamed_repo = "misc-repo-renamed"
+    original_repo = ns.repo("misc-repo")
+    renamed_repo = ns.repo("misc-repo-renamed")
 
     # Ensure owner exists
     resp = gitea_client.create_user(username=username, email=email, password=password)
@@ -86,13 +86,13 @@ def test_list_unadopted_and_adopt_negative(gitea_client):
 
 
 @pytest.mark.e2e
-def test_create_repo_invalid_payload(gitea_client):
+def test_create_repo_invalid_payload(gitea_client, ns):
     """
     Negative: creating a repository with invalid body (empty name) must fail.
     """
 
-    username = "invalid_payload_user"
-    email = "invalid_payload@example.com"
+    username = ns.user("invalid_payload_user")
+    email = ns.email("invalid_payload")
     password = "Password123!"
 
     # Prepare user
@@ -2,7 +2,7 @@ import pytest
 
 
 @pytest.mark.e2e
-def test_org_lifecycle(gitea_client):
+def test_org_lifecycle(gitea_client, ns):
     """
     Full organization lifecycle:
     1. create organization
@@ -12,10 +12,10 @@ def test_org_lifecycle(gitea_client):
     5. (optional) delete organization — skipped if unsupported
     """
 
-    username = "org_owner"
-    email = "org_owner@example.com"
+    username = ns.user("org_owner")
+    email = ns.email("org_owner")
     password = "Password123!"
-    org_name = "sample-org"
+    org_name = ns.org("sample-org")
 
     # Ensure user exists
     resp = gitea_client.create_user(username=username, email=email, password=password)
@@ -58,15 +58,15 @@ def test_org_lifecycle(gitea_client):
 
 
 @pytest.mark.e2e
-def test_create_duplicate_org(gitea_client):
+def test_create_duplicate_org(gitea_client, ns):
     """
     Negative case: creating an organization with the same name twice should fail.
     """
 
-    username = "dup_org_owner"
-    email = "dup_org@example.com"
+    username = ns.user("dup_org_owner")
+    email = ns.email("dup_org")
     password = "Password123!"
-    org_name = "dup-org"
+    org_name = ns.org("dup-org")
 
     # Ensure owner exists
     resp = gitea_client.create_user(username=username, email=email, password=password)
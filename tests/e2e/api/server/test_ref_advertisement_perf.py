@@ -0,0 +1,31 @@
+import logging
+import os
+
+import pytest
+
+from gitguard.clients.smart_http_client import SmartHttpClient
+from gitguard.perf.stats import Summary, format_table
+
+logger = logging.getLogger("gitguard")
+
+
+@pytest.mark.e2e
+@pytest.mark.perf
+def test_ls_refs_advertisement_latency(gitea_client, e2e_user, e2e_repo):
+    """Protocol v2 ls-refs over keep-alive HTTP: refs must match the API and latency is reported."""
+    client = SmartHttpClient(gitea_client)
+    iterations = int(os.getenv("GITGUARD_LS_REFS_ITERATIONS", "50"))
+
+    results = [client.ls_refs(e2e_user, e2e_repo, prefixes=["refs/heads/"]) for _ in range(iterations)]
+
+    failed = [r for r in results if not r.ok()]
+    assert not failed, f"ls-refs failed: {failed[0].status_code} {failed[0].error}"
+    branches = gitea_client.get(f"repos/{e2e_user}/{e2e_repo}/branches", headers=gitea_client._auth_headers())
+    assert branches.ok()
+    api_heads = {f"refs/heads/{b['name']}": b["commit"]["id"] for b in branches.json}
+    assert results[-1].refs == api_heads
+
+    logger.info("ls-refs advertisement latency:\n%s", format_table({
+        "ls-refs total": Summary.of([r.duration for r in results]),
+        "ls-refs ttfb": Summary.of([r.ttfb for r in results]),
+    }))
@@ -2,7 +2,7 @@ import pytest
 
 
 @pytest.mark.e2e
-def test_repo_lifecycle(gitea_client):
+def test_repo_lifecycle(gitea_client, ns):
     """
     Full repository lifecycle:
     1. create repository
@@ -12,10 +12,10 @@ def test_repo_lifecycle(gitea_client):
     5. delete repository
     6. verify deletion
     """
-    username = "testuser_repo"
-    email = "testuser_repo@example.com"
+    username = ns.user("testuser_repo")
+    email = ns.email("testuser_repo")
     password = "Password123!"
-    repo_name = "sample-repo"
+    repo_name = ns.repo("sample-repo")
 
     # Ensure user exists
     r = gitea_client.create_user(username=username, email=email, password=password)
@@ -62,14 +62,14 @@ def test_repo_lifecycle(gitea_client):
 
 
 @pytest.mark.e2e
-def test_create_duplicate_repo(gitea_client):
+def test_create_duplicate_repo(gitea_client, ns):
     """
     Negative case: creating a repository with the same name twice should fail.
     """
-    username = "dup_repo_user"
-    email = "dup@example.com"
+    username = ns.user("dup_repo_user")
+    email = ns.email("dup")
     password = "Password123!"
-    repo_name = "dup-repo"
+    repo_name = ns.repo("dup-repo")
 
     # Ensure user exists
     r = gitea_client.create_user(username=username, email=email, password=password)
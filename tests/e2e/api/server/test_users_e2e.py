@@ -2,7 +2,7 @@ import pytest
 
 
 @pytest.mark.e2e
-def test_user_lifecycle(gitea_client):
+def test_user_lifecycle(gitea_client, ns):
     """
     Full user lifecycle:
     1. create user
@@ -13,8 +13,8 @@ def test_user_lifecycle(gitea_client):
     6. verify deletion
     """
 
-    username = "e2e_test_user"
-    email = "e2e_user@example.com"
+    username = ns.user("e2e_test_user")
+    email = ns.email("e2e_user")
     password = "Password123!"
 
     # Create user (handle already-exists gracefully)
@@ -28,7 +28,7 @@ def test_user_lifecycle(gitea_client):
     assert user_data.get("username") == username, f"Expected username '{username}', got {user_data}"
 
     # Update user email
-    new_email = "updated_e2e_user@example.com"
+    new_email = ns.email("updated_e2e_user")
     r = gitea_client.edit_user(username=username, email=new_email)
     assert r.ok(), f"Edit user failed: {r.status_code} {getattr(r,'text','')}"
     r = gitea_client.get_user(username)
@@ -52,13 +52,13 @@ def test_user_lifecycle(gitea_client):
 
 
 @pytest.mark.e2e
-def test_create_duplicate_user(gitea_client):
+def test_create_duplicate_user(gitea_client, ns):
     """
     Negative case: creating a user with the same username twice should fail.
     """
 
-    username = "dup_user_e2e"
-    email = "dup_user_e2e@example.com"
+    username = ns.user("dup_user_e2e")
+    email = ns.email("dup_user_e2e")
     password = "Password123!"
 
     # First creation (might already exist)
@@ -0,0 +1,82 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def client(tmp_path):
+    return GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False,
+                     attach_logs_always=False)
+
+
+@pytest.fixture
+def origin(tmp_path, client):
+    repo = tmp_path / "origin.git"
+    _git("init", "-q", "--bare", "-b", "main", str(repo))
+    res = client.build_history([HistoryCommit("one", {"a": "1"}, label="one"), HistoryCommit("two", {"a": "2"})],
+                               workdir=str(repo))
+    assert res.ok(), res.stderr
+    return repo
+
+
+def _advance(client, origin):
+    res = client.build_history([HistoryCommit("three", {"a": "3"}, parent="refs/heads/main^0")],
+                               workdir=str(origin), base_timestamp=1800000000)
+    assert res.ok(), res.stderr
+    return res.commits[0]
+
+
+@pytest.mark.unit
+def test_full_and_incremental_bundles(client, origin, tmp_path):
+    full = tmp_path / "full.bundle"
+    assert client.bundle_create(str(full), ["--all"], workdir=str(origin)).ok()
+    old_head = client.bundle_heads(str(full))["refs/heads/main"]
+
+    new_head = _advance(client, origin)
+    incr = tmp_path / "incr.bundle"
+    res = client.bundle_create(str(incr), ["main"], exclude=[old_head], workdir=str(origin))
+
+    assert res.ok(), res.stderr
+    assert client.bundle_heads(str(incr)) == {"refs/heads/main": new_head}
+    assert client.bundle_create(str(tmp_path / "empty.bundle"), ["main"], exclude=[new_head],
+                                workdir=str(origin)).code != 0
+
+    clone = tmp_path / "c"
+    assert client.clone_from_bundle(str(full), str(clone)).ok()
+    assert client.bundle_verify(str(incr), workdir=str(clone)).ok()
+    with pytest.raises(RuntimeError):
+        client.bundle_heads(str(tmp_path / "missing.bundle"))
+
+
+@pytest.mark.unit
+def test_clone_from_bundle_repoints_origin_and_fetches_delta(client, origin, tmp_path):
+    bundle = tmp_path / "full.bundle"
+    assert client.bundle_create(str(bundle), ["--all"], workdir=str(origin)).ok()
+    new_head = _advance(client, origin)
+
+    res = client.clone_from_bundle(str(bundle), "c", origin_url=f"file://{origin}", branch="main")
+
+    assert res.ok(), res.stderr
+    checkout = tmp_path / "c"
+    assert _git("-C", str(checkout), "remote", "get-url", "origin") == f"file://{origin}"
+    assert _git("-C", str(checkout), "rev-parse", "refs/remotes/origin/main") == new_head
+    assert (checkout / "a").read_text() == "2"  # working tree is the bundle's; fetch does not merge
+
+
+@pytest.mark.unit
+def test_clone_with_bundle_uri(client, origin, tmp_path):
+    from gitguard.perf.bundles import BundleServer
+
+    with BundleServer(str(tmp_path / "served")) as server:
+        assert client.bundle_create(str(server.directory / "full.bundle"), ["--all"], workdir=str(origin)).ok()
+        res = client.clone(target_dir="c", repo_url=f"file://{origin}", bundle_uri=server.url("full.bundle"))
+
+    assert res.ok(), res.stderr
+    assert server.requests == {"/full.bundle": 1}
+    assert "refs/bundles/main" in _git("-C", str(tmp_path / "c"), "for-each-ref", "--format=%(refname)")
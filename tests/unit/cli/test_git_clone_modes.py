@@ -0,0 +1,74 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.clients.reference_cache import ReferenceCache
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """file:// remote (local paths ignore --depth) with filters allowed, two branches and a docs/src layout."""
+    repo = tmp_path / "origin.git"
+    _git("init", "-q", "--bare", "-b", "main", str(repo))
+    _git("--git-dir", str(repo), "config", "uploadpack.allowFilter", "true")
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    res = git.build_history([HistoryCommit("one", {"docs/a.md": "a", "src/x.py": "x = 1\n", "README": "r"}),
+                             HistoryCommit("two", {"src/x.py": "x = 2\n"}),
+                             HistoryCommit("side", {"side.txt": "s"}, branch="feature")], workdir=str(repo))
+    assert res.ok(), res.stderr
+    return f"file://{repo}"
+
+
+@pytest.fixture
+def client(tmp_path):
+    return GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False,
+                     attach_logs_always=False)
+
+
+@pytest.mark.unit
+def test_shallow_single_branch_clone(client, origin, tmp_path):
+    res = client.clone(target_dir="c", repo_url=origin, depth=1, single_branch=True)
+
+    assert res.ok(), res.stderr
+    assert _git("-C", str(tmp_path / "c"), "rev-list", "--count", "HEAD") == "1"
+    assert (tmp_path / "c" / ".git" / "shallow").exists()
+    remotes = _git("-C", str(tmp_path / "c"), "for-each-ref", "--format=%(refname)", "refs/remotes/").split()
+    assert "refs/remotes/origin/main" in remotes and "refs/remotes/origin/feature" not in remotes
+
+
+@pytest.mark.unit
+def test_blobless_clone_records_promisor(client, origin, tmp_path):
+    res = client.clone(target_dir="c", repo_url=origin, filter="blob:none", no_checkout=True)
+
+    assert res.ok(), res.stderr
+    assert _git("-C", str(tmp_path / "c"), "config", "remote.origin.promisor") == "true"
+    assert _git("-C", str(tmp_path / "c"), "config", "remote.origin.partialclonefilter") == "blob:none"
+    assert not (tmp_path / "c" / "src").exists()
+
+
+@pytest.mark.unit
+def test_sparse_clone_checks_out_only_the_cone(client, origin, tmp_path):
+    res = client.clone(target_dir="c", repo_url=origin, branch="main", sparse=["docs"])
+
+    assert res.ok(), res.stderr
+    checkout = tmp_path / "c"
+    assert (checkout / "docs" / "a.md").read_text() == "a"
+    assert (checkout / "README").exists()  # cone mode always includes top-level files
+    assert not (checkout / "src").exists()
+
+
+@pytest.mark.unit
+def test_reduced_clones_skip_reference_cache(tmp_path, origin):
+    cache = ReferenceCache(str(tmp_path / "cache"))
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False, reference_cache=cache)
+
+    assert git.clone(target_dir="c", repo_url=origin, depth=1).ok()
+
+    assert not (tmp_path / "cache").exists()
+    with pytest.raises(ValueError):
+        git.clone(target_dir="d", repo_url=origin, filter="tree:0", reference=True)
@@ -1,9 +1,13 @@
+import subprocess
+
 import pytest
 
+from gitguard.clients.git_client import GitClient
+
 
 @pytest.mark.unit
 def test_init_repo(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 0
     mock_run.return_value.stdout = "Initialized empty Git repo"
     mock_run.return_value.stderr = ""
@@ -16,7 +20,7 @@ def test_init_repo(mocker, git_client):
 
 @pytest.mark.unit
 def test_init_timeout(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=TimeoutError("init timed out"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=TimeoutError("init timed out"))
 
     with pytest.raises(TimeoutError):
         git_client.init(str(git_client.workdir))
@@ -24,7 +28,7 @@ def test_init_timeout(mocker, git_client):
 
 @pytest.mark.unit
 def test_init_permission_error(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=PermissionError("Permission denied"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=PermissionError("Permission denied"))
 
     with pytest.raises(PermissionError):
         git_client.init("/restricted/repo")
@@ -32,7 +36,7 @@ def test_init_permission_error(mocker, git_client):
 
 @pytest.mark.unit
 def test_checkout_branch_failure(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 1
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "error: pathspec 'nonexistent' did not match any file(s) known to git"
@@ -45,14 +49,14 @@ def test_checkout_branch_failure(mocker, git_client):
 
 @pytest.mark.unit
 def test_checkout_branch_timeout(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=TimeoutError("checkout timed out"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=TimeoutError("checkout timed out"))
 
     with pytest.raises(TimeoutError):
         git_client.checkout(str(git_client.workdir), "feature/timeout")
 
 
 def test_checkout_oserror(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=OSError("git not found"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=OSError("git not found"))
 
     with pytest.raises(OSError):
         git_client.checkout(str(git_client.workdir), "develop")
@@ -60,7 +64,7 @@ def test_checkout_oserror(mocker, git_client):
 
 @pytest.mark.unit
 def test_checkout_invalid_branch(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 1
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "fatal: invalid reference: '***'"
@@ -69,3 +73,19 @@ def test_checkout_invalid_branch(mocker, git_client):
 
     assert result.returncode == 1
     assert "invalid reference" in result.stderr
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("trace", [True, False])
+def test_ssh_host_key_checks_disabled_with_and_without_trace(fake_ssh, tmp_path, trace):
+    origin = tmp_path / "origin.git"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(origin)], check=True)
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=trace,
+                    attach_logs_always=False)
+
+    result = git._run(["ls-remote", f"ssh://git@localhost{origin}"])
+
+    assert result.ok(), result.stderr
+    options = fake_ssh.read_text().split()
+    assert "StrictHostKeyChecking=no" in options and "UserKnownHostsFile=/dev/null" in options
+    assert ("-v" in options) is trace
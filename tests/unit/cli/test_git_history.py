@@ -0,0 +1,65 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+
+
+def _git(repo, *args) -> str:
+    return subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path) -> GitClient:
+    (tmp_path / "repo").mkdir()
+    client = GitClient(workdir=str(tmp_path / "repo"), artifacts_dir=str(tmp_path / "artifacts"),
+                       enable_trace=False, attach_logs_always=False)
+    assert client.init().ok()
+    return client
+
+
+@pytest.mark.unit
+def test_build_history_linear_branches_merge_and_tags(repo):
+    commits = [HistoryCommit("init", {"README.md": "# demo\n"}, label="root", tag="v0")]
+    commits += [HistoryCommit(f"commit {i}", {f"f{i % 10}.txt": f"v{i}\n"}) for i in range(200)]
+    commits += [
+        HistoryCommit("feature", {"feat.bin": b"\x00\x01"}, branch="feature", parent="root", label="feat"),
+        {"message": "merge feature", "files": {"README.md": None, "feat.bin": b"\x00\x01"}, "merge": ["feat"], "tag": "v1"},
+    ]
+
+    res = repo.build_history(commits, checkout=True)
+    assert res.ok(), res.stderr
+    assert len(res.commits) == len(commits)
+    assert res.labels == {"root": res.commits[0], "feat": res.commits[-2]}
+
+    wd = repo.workdir
+    assert _git(wd, "rev-parse", "main").strip() == res.commits[-1]
+    assert _git(wd, "rev-list", "--count", "main").strip() == str(len(commits))
+    assert _git(wd, "tag").split() == ["v0", "v1"]
+    assert _git(wd, "rev-list", "--parents", "-n1", "main").split()[1:] == [res.commits[-3], res.commits[-2]]
+    assert (wd / "feat.bin").read_bytes() == b"\x00\x01"
+    assert not (wd / "README.md").exists()
+    assert _git(wd, "status", "--porcelain", "--untracked-files=no") == ""
+
+
+@pytest.mark.unit
+def test_build_history_is_deterministic_and_extends_existing_branch(tmp_path, repo):
+    spec = [HistoryCommit("one", {"a.txt": "1"}), HistoryCommit("two", {"a.txt": "2"})]
+    first = repo.build_history(spec)
+
+    (tmp_path / "other").mkdir()
+    other = GitClient(workdir=str(tmp_path / "other"), artifacts_dir=str(tmp_path / "artifacts"),
+                      enable_trace=False, attach_logs_always=False)
+    assert other.init().ok()
+    assert other.build_history(spec).commits == first.commits
+
+    more = repo.build_history([HistoryCommit("three", {"b.txt": "3"}, parent="refs/heads/main^0")])
+    assert more.ok(), more.stderr
+    assert _git(repo.workdir, "rev-list", "--count", "main").strip() == "3"
+
+
+@pytest.mark.unit
+def test_build_history_reports_fast_import_failure(repo):
+    res = repo.build_history([HistoryCommit("orphan", {"a.txt": "x"}, parent="no-such-label")])
+    assert not res.ok()
+    assert res.commits == []
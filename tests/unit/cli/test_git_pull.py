@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.unit
 def test_pull_success(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 0
     mock_run.return_value.stdout = "Already up to date."
     mock_run.return_value.stderr = ""
@@ -16,7 +16,7 @@ def test_pull_success(mocker, git_client):
 
 @pytest.mark.unit
 def test_pull_conflict(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 1
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "CONFLICT (content): Merge conflict"
@@ -29,7 +29,7 @@ def test_pull_conflict(mocker, git_client):
 
 @pytest.mark.unit
 def test_pull_not_a_repo(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 128
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "fatal: not a git repository"
@@ -42,7 +42,7 @@ def test_pull_not_a_repo(mocker, git_client):
 
 @pytest.mark.unit
 def test_pull_timeout(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=TimeoutError("pull timed out"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=TimeoutError("pull timed out"))
 
     with pytest.raises(TimeoutError):
         git_client.pull(str(git_client.workdir))
@@ -50,7 +50,7 @@ def test_pull_timeout(mocker, git_client):
 
 @pytest.mark.unit
 def test_pull_git_not_found(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=OSError("git not found"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=OSError("git not found"))
 
     with pytest.raises(OSError):
         git_client.pull(str(git_client.workdir))
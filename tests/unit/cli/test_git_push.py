@@ -3,7 +3,7 @@ import pytest
 
 @pytest.mark.unit
 def test_push_success(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 0
     mock_run.return_value.stdout = "Pushed"
     mock_run.return_value.stderr = ""
@@ -16,7 +16,7 @@ def test_push_success(mocker, git_client):
 
 @pytest.mark.unit
 def test_push_rejected(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 1
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "[rejected] main -> main (fetch first)"
@@ -29,7 +29,7 @@ def test_push_rejected(mocker, git_client):
 
 @pytest.mark.unit
 def test_push_permission_denied(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 128
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = (
@@ -44,7 +44,7 @@ def test_push_permission_denied(mocker, git_client):
 
 @pytest.mark.unit
 def test_push_not_a_repo(mocker, git_client):
-    mock_run = mocker.patch("subprocess.run")
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process")
     mock_run.return_value.returncode = 128
     mock_run.return_value.stdout = ""
     mock_run.return_value.stderr = "fatal: not a git repository"
@@ -57,7 +57,7 @@ def test_push_not_a_repo(mocker, git_client):
 
 @pytest.mark.unit
 def test_push_timeout(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=TimeoutError("push timed out"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=TimeoutError("push timed out"))
 
     with pytest.raises(TimeoutError):
         git_client.push(str(git_client.workdir))
@@ -65,7 +65,7 @@ def test_push_timeout(mocker, git_client):
 
 @pytest.mark.unit
 def test_push_git_not_found(mocker, git_client):
-    mocker.patch("subprocess.run", side_effect=OSError("git not found"))
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=OSError("git not found"))
 
     with pytest.raises(OSError):
         git_client.push(str(git_client.workdir))
@@ -0,0 +1,121 @@
+import pytest
+
+from gitguard.clients.git_client import RetryPolicy, classify_failure
+
+
+def _completed(mocker, code, stderr="", stdout=""):
+    res = mocker.Mock()
+    res.returncode, res.stdout, res.stderr = code, stdout, stderr
+    return res
+
+
+@pytest.fixture
+def no_sleep(mocker):
+    return mocker.patch("time.sleep")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("stderr, expected", [
+    ("error: RPC failed; HTTP 502 curl 22 The requested URL returned error: 502", ("transient", "http_5xx")),
+    ("fatal: early EOF\nfatal: index-pack failed", ("transient", "early_eof")),
+    ("fatal: unable to access 'http://gitea:3000/a/b.git/': Connection reset by peer", ("transient", "connection")),
+    ("kex_exchange_identification: read: Connection reset by peer", ("transient", "connection")),
+    ("kex_exchange_identification: Connection closed by remote host", ("transient", "ssh")),
+    ("remote: Repository not found.\nfatal: repository 'x' not found", ("permanent", "not_found")),
+    ("fatal: unable to access 'http://gitea:3000/a/b.git/': The requested URL returned error: 404",
+     ("permanent", "not_found")),
+    ("debug1: identity file /root/.ssh/id_rsa type -1\ndebug1: No xauth program; not found\n"
+     "fatal: the remote end hung up unexpectedly", ("transient", "early_eof")),
+    ("fatal: Authentication failed for 'http://gitea:3000/a/b.git/'", ("permanent", "auth")),
+    (" ! [rejected]        main -> main (fetch first)", ("permanent", "rejected")),
+    ("something else entirely", ("unknown", None)),
+])
+def test_classify_failure(stderr, expected):
+    assert classify_failure(stderr) == expected
+
+
+@pytest.mark.unit
+def test_fetch_retries_transient_failure(mocker, git_client, no_sleep):
+    git_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.1, jitter=0.0)
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process", side_effect=[
+        _completed(mocker, 128, "error: RPC failed; HTTP 503 curl 22"),
+        _completed(mocker, 128, "fatal: early EOF"),
+        _completed(mocker, 0),
+    ])
+
+    result = git_client.fetch()
+
+    assert result.ok()
+    assert result.attempts == 3
+    assert result.transient_errors == ["http_5xx", "early_eof"]
+    assert mock_run.call_count == 3
+    assert [c.args[0] for c in no_sleep.call_args_list] == [0.1, 0.2]
+
+
+@pytest.mark.unit
+def test_traced_transient_failure_is_still_retried(mocker, git_client, no_sleep):
+    traced = ("12:00:00.000000 git.c:455               trace: built-in: git fetch\n"
+              "debug1: Will attempt key: /root/.ssh/id_ed25519 not found\n"
+              "== Info: Could not find the cookie file, not found\n"
+              "kex_exchange_identification: Connection closed by remote host\n")
+    git_client.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.1, jitter=0.0)
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=[
+        _completed(mocker, 128, traced),
+        _completed(mocker, 0),
+    ])
+
+    result = git_client.fetch()
+
+    assert result.ok() and result.attempts == 2
+    assert result.transient_errors == ["ssh"]
+
+
+@pytest.mark.unit
+def test_permanent_failure_is_not_retried(mocker, git_client, no_sleep):
+    git_client.retry_policy = RetryPolicy()
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process", return_value=_completed(mocker, 1, " ! [rejected] main -> main"))
+
+    result = git_client.push()
+
+    assert not result.ok() and result.attempts == 1
+    assert mock_run.call_count == 1
+    no_sleep.assert_not_called()
+
+
+@pytest.mark.unit
+def test_unsafe_operations_and_default_client_do_not_retry(mocker, git_client, no_sleep):
+    mock_run = mocker.patch("gitguard.clients.git_client.run_process", return_value=_completed(mocker, 128, "fatal: early EOF"))
+
+    assert git_client.fetch().attempts == 1  # no policy configured
+
+    git_client.retry_policy = RetryPolicy()
+    assert git_client.pull().attempts == 1  # pull may leave a half-applied merge behind
+    assert mock_run.call_count == 2
+
+
+@pytest.mark.unit
+def test_retried_clone_starts_from_fresh_directory(mocker, git_client, tmp_path, no_sleep):
+    git_client.retry_policy = RetryPolicy(max_attempts=2)
+    target = tmp_path / "clone"
+    seen = []
+
+    def fake_clone(cmd, **kwargs):
+        seen.append(target.exists())
+        if len(seen) == 1:
+            (target / ".git").mkdir(parents=True)  # partial clone left behind
+            return _completed(mocker, 128, "fatal: the remote end hung up unexpectedly")
+        return _completed(mocker, 0)
+
+    mocker.patch("gitguard.clients.git_client.run_process", side_effect=fake_clone)
+
+    result = git_client.clone(target_dir=str(target), repo_url="http://gitea:3000/a/b.git")
+
+    assert result.ok() and result.attempts == 2
+    assert seen == [False, False]
+
+
+@pytest.mark.unit
+def test_retry_delay_backoff_and_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0, jitter=0.5)
+    for attempt, cap in [(1, 1.0), (2, 2.0), (3, 3.0), (6, 3.0)]:
+        assert cap * 0.5 <= policy.delay(attempt) <= cap
@@ -0,0 +1,93 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.infra.namespacing import write_git_config
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> GitClient:
+    config = tmp_path / "gitconfig"
+    write_git_config(config, "Parser", "parser@example.com")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(config))
+    (tmp_path / "repo").mkdir()
+    client = GitClient(workdir=str(tmp_path / "repo"), artifacts_dir=str(tmp_path / "artifacts"),
+                       enable_trace=False, attach_logs_always=False)
+    _git(client.workdir, "init", "-q", "-b", "main")
+    return client
+
+
+@pytest.mark.unit
+def test_status_porcelain_parses_every_entry_kind(repo):
+    wd = repo.workdir
+    (wd / "keep.txt").write_text("keep")
+    (wd / "old name.txt").write_text("rename me\n" * 20)
+    (wd / "edit.txt").write_text("v1")
+    _git(wd, "add", ".")
+    _git(wd, "commit", "-q", "-m", "base")
+    (wd / "edit.txt").write_text("v2")
+    _git(wd, "mv", "old name.txt", "new\nname.txt")
+    (wd / "staged.txt").write_text("new")
+    _git(wd, "add", "staged.txt")
+    (wd / "untracked file.txt").write_text("?")
+
+    report = repo.status_porcelain()
+
+    assert report.branch == "main" and len(report.oid) == 40 and report.upstream is None
+    by_path = {e.path: e for e in report.entries}
+    assert by_path["edit.txt"].kind == "1" and by_path["edit.txt"].xy == ".M" and by_path["edit.txt"].unstaged
+    assert by_path["staged.txt"].staged and by_path["staged.txt"].xy == "A."
+    renamed = by_path["new\nname.txt"]
+    assert (renamed.kind, renamed.orig_path, renamed.score) == ("2", "old name.txt", "R100")
+    assert by_path["untracked file.txt"].untracked
+    assert not report.clean and report.conflicts == []
+
+
+@pytest.mark.unit
+def test_status_porcelain_clean_and_initial(repo):
+    report = repo.status_porcelain()
+    assert report.clean and report.oid is None and report.entries == []
+
+
+@pytest.mark.unit
+def test_iter_log_streams_typed_records(repo):
+    history = repo.build_history(
+        [HistoryCommit(f"commit {i}", {"f.txt": str(i)}) for i in range(300)]
+        + [HistoryCommit("multi\n\nbody with\nnewlines", {"g.txt": "x"})])
+    assert history.ok(), history.stderr
+
+    entries = repo.iter_log("main", fields=("parents", "author_time", "subject", "body"))
+    first = next(entries)
+    assert first.sha == history.commits[-1] and first.subject == "multi"
+    assert first.body.strip() == "body with\nnewlines"
+    assert first.parents == [history.commits[-2]] and isinstance(first.author_time, int)
+    assert first.author_name is None
+    entries.close()  # stop early: git is killed, not drained
+
+    shas = [e.sha for e in repo.iter_log("main", fields=())]
+    assert shas == history.commits[::-1]
+    assert [e.subject for e in repo.iter_log("main", fields=["subject"], max_count=2)] == ["multi", "commit 299"]
+
+    with pytest.raises(ValueError):
+        next(repo.iter_log(fields=["nope"]))
+
+
+@pytest.mark.unit
+def test_iter_refs_and_failures(repo):
+    history = repo.build_history([HistoryCommit("one", {"a": "1"}, tag="light"), HistoryCommit("two", {"a": "2"})])
+    _git(repo.workdir, "tag", "-a", "annotated", "-m", "note", history.commits[0])
+
+    refs = {r.name: r for r in repo.iter_refs()}
+
+    assert refs["refs/heads/main"].sha == history.commits[1] and refs["refs/heads/main"].type == "commit"
+    assert refs["refs/tags/light"].peeled is None and refs["refs/tags/light"].short == "light"
+    assert refs["refs/tags/annotated"].type == "tag" and refs["refs/tags/annotated"].peeled == history.commits[0]
+    assert [r.short for r in repo.iter_refs(["refs/heads"])] == ["main"]
+
+    with pytest.raises(RuntimeError, match="failed"):
+        list(repo.iter_log("no-such-branch"))
@@ -0,0 +1,69 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def clone(tmp_path):
+    """A clone of a bare origin with main and feature branches."""
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False,
+                    attach_logs_always=False)
+    origin = tmp_path / "origin.git"
+    _git("init", "-q", "--bare", "-b", "main", str(origin))
+    assert git.build_history([HistoryCommit("one", {"a.txt": "main"}, label="one"),
+                              HistoryCommit("feat", {"a.txt": "feature"}, branch="feature", parent="one")],
+                             workdir=str(origin)).ok()
+    assert git.clone(target_dir="clone", repo_url=str(origin)).ok()
+    git.workdir = tmp_path / "clone"
+    return git
+
+
+def _worktrees(repo) -> list:
+    return [line.split(" ", 1)[1] for line in _git("-C", str(repo), "worktree", "list", "--porcelain").splitlines()
+            if line.startswith("worktree ")]
+
+
+@pytest.mark.unit
+def test_worktree_tracks_remote_branch_and_is_removed(clone):
+    with clone.worktree("feature") as wt:
+        assert (wt / "a.txt").read_text() == "feature"
+        assert (clone.workdir / "a.txt").read_text() == "main"  # the clone's checkout is untouched
+        assert _git("-C", str(wt), "rev-parse", "--abbrev-ref", "feature@{upstream}") == "origin/feature"
+        assert str(wt) in _worktrees(clone.workdir)
+        # shared object store: a commit made in the worktree is visible from the clone at once
+        (wt / "b.txt").write_text("b")
+        assert clone.add("b.txt", workdir=str(wt)).ok() and clone.commit("b", workdir=str(wt)).ok()
+        head = clone.rev_parse("HEAD", workdir=str(wt)).stdout
+
+    assert not wt.exists()
+    assert _worktrees(clone.workdir) == [str(clone.workdir)]
+    assert clone.rev_parse("feature").stdout == head
+
+
+@pytest.mark.unit
+def test_second_actor_on_same_branch_needs_new_branch_or_detach(clone, tmp_path):
+    with pytest.raises(RuntimeError, match="worktree add"):
+        with clone.worktree("main"):
+            pass
+    assert not list(tmp_path.glob("clone-wt-*"))
+
+    with clone.worktree("actor-b", create=True, start_point="origin/main") as b, \
+            clone.worktree(start_point="origin/feature", detach=True) as c:
+        assert _git("-C", str(b), "symbolic-ref", "--short", "HEAD") == "actor-b"
+        assert (c / "a.txt").read_text() == "feature"
+        assert len(_worktrees(clone.workdir)) == 3
+
+
+@pytest.mark.unit
+def test_keep_and_explicit_path(clone, tmp_path):
+    path = tmp_path / "kept"
+    with clone.worktree("feature", path=str(path), keep=True) as wt:
+        (wt / "dirty.txt").write_text("uncommitted")
+
+    assert path.exists() and str(path) in _worktrees(clone.workdir)
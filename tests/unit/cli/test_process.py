@@ -0,0 +1,53 @@
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from gitguard.clients.git_client import GitTimeoutError
+from gitguard.clients.process import run_process
+
+
+def _alive(pid: int) -> bool:
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except (FileNotFoundError, ProcessLookupError):
+        return False
+    return state != "Z"
+
+
+@pytest.mark.unit
+def test_run_process_captures_output():
+    res = run_process(["sh", "-c", "echo out; echo err >&2; exit 3"])
+
+    assert (res.returncode, res.stdout, res.stderr) == (3, "out\n", "err\n")
+
+
+@pytest.mark.unit
+def test_timeout_kills_whole_group_and_keeps_partial_output():
+    script = "sleep 30 & echo child=$!; echo working >&2; wait"
+    start = time.monotonic()
+
+    with pytest.raises(subprocess.TimeoutExpired) as exc:
+        run_process(["sh", "-c", script], timeout=0.5, grace=0.5)
+
+    assert time.monotonic() - start < 5
+    assert exc.value.stderr == "working\n"
+    grandchild = int(exc.value.stdout.strip().split("=")[1])
+    deadline = time.monotonic() + 2
+    while _alive(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.unit
+def test_git_timeout_raises_with_partial_output(git_client):
+    args = ["-c", "alias.slow=!echo partial-out; echo partial-err >&2; sleep 30", "slow"]
+
+    with pytest.raises(TimeoutError) as exc:
+        git_client._run(args, timeout=0.5)
+
+    assert isinstance(exc.value, GitTimeoutError)
+    assert exc.value.stdout == "partial-out"
+    assert exc.value.stderr.endswith("partial-err")
+    assert exc.value.duration < 5
@@ -0,0 +1,93 @@
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.clients.reference_cache import ReferenceCache
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path):
+    repo = tmp_path / "origin.git"
+    _git("init", "-q", "--bare", "-b", "main", str(repo))
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    assert git.build_history([HistoryCommit("one", {"a.txt": "1"})], workdir=str(repo)).ok()
+    return repo
+
+
+def _client(tmp_path, cache):
+    return GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False,
+                     attach_logs_always=False, reference_cache=cache)
+
+
+@pytest.mark.unit
+def test_clone_borrows_objects_from_cache(tmp_path, origin):
+    cache = ReferenceCache(str(tmp_path / "cache"))
+    git = _client(tmp_path, cache)
+
+    res = git.clone(target_dir="c1", repo_url=str(origin))
+
+    assert res.ok(), res.stderr
+    mirror = cache.path_for(str(origin))
+    assert mirror.is_dir() and mirror.name.startswith("origin-")
+    alternates = (tmp_path / "c1" / ".git" / "objects" / "info" / "alternates").read_text()
+    assert str(mirror / "objects") in alternates
+    assert (tmp_path / "c1" / "a.txt").read_text() == "1"
+
+
+@pytest.mark.unit
+def test_stale_cache_is_refreshed_and_dissociate_drops_alternates(tmp_path, origin):
+    cache = ReferenceCache(str(tmp_path / "cache"), refresh_interval=0, dissociate=True)
+    git = _client(tmp_path, cache)
+    assert git.clone(target_dir="c1", repo_url=str(origin)).ok()
+
+    new = git.build_history([HistoryCommit("two", {"a.txt": "2"}, parent="refs/heads/main^0")],
+                            workdir=str(origin), base_timestamp=1800000000).commits[0]
+    res = git.clone(target_dir="c2", repo_url=str(origin))
+
+    assert res.ok(), res.stderr
+    assert _git("--git-dir", str(cache.path_for(str(origin))), "rev-parse", "main") == new
+    assert not (tmp_path / "c2" / ".git" / "objects" / "info" / "alternates").exists()
+    assert _git("-C", str(tmp_path / "c2"), "fsck", "--connectivity-only") == ""
+
+
+@pytest.mark.unit
+def test_unreachable_remote_falls_back_to_plain_clone(tmp_path):
+    cache = ReferenceCache(str(tmp_path / "cache"))
+    git = _client(tmp_path, cache)
+
+    res = git.clone(target_dir="c1", repo_url=str(tmp_path / "missing.git"))
+
+    assert not res.ok()
+    assert "does not exist" in res.stderr or "not found" in res.stderr.lower()
+    assert not cache.path_for(str(tmp_path / "missing.git")).exists()
+    assert not list((tmp_path / "cache").glob("*.partial"))
+
+
+@pytest.mark.unit
+def test_concurrent_clones_share_one_mirror(tmp_path, origin):
+    cache = ReferenceCache(str(tmp_path / "cache"))
+
+    def clone(i):
+        return _client(tmp_path, cache).clone(target_dir=f"c{i}", repo_url=str(origin))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(clone, range(6)))
+
+    assert all(r.ok() for r in results), [r.stderr for r in results]
+    assert [p.name for p in (tmp_path / "cache").glob("*.git")] == [cache.path_for(str(origin)).name]
+
+
+@pytest.mark.unit
+def test_lock_times_out_while_held_exclusively(tmp_path):
+    cache = ReferenceCache(str(tmp_path / "cache"), lock_timeout=0.1)
+    with cache.locked("http://gitea:3000/a/b.git"):
+        with pytest.raises(TimeoutError):
+            with cache.locked("http://gitea:3000/a/b.git", exclusive=False):
+                pass
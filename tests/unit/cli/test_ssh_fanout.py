@@ -0,0 +1,83 @@
+import subprocess
+import time
+
+import pytest
+
+from gitguard.clients.ssh_client import SSHClient, TIMEOUT_RC
+
+
+@pytest.fixture
+def ssh_client(tmp_path) -> SSHClient:
+    return SSHClient(host="gitea", port=2222, artifacts_dir=str(tmp_path), attach_logs_always=False)
+
+
+def _fake_proc(mocker, rc=0, out="", err=""):
+    proc = mocker.Mock()
+    proc.communicate.return_value = (out, err)
+    proc.returncode = rc
+    return proc
+
+
+@pytest.mark.unit
+def test_run_timeout_kills_child(mocker, ssh_client):
+    proc = mocker.Mock()
+    proc.communicate.side_effect = [subprocess.TimeoutExpired("ssh", 1), ("partial", "")]
+    mocker.patch("subprocess.Popen", return_value=proc)
+
+    result = ssh_client.run("sleep 100", check=False, timeout=1)
+
+    proc.kill.assert_called_once()
+    assert result.timed_out
+    assert result.code == TIMEOUT_RC
+    assert result.stdout == "partial"
+
+
+@pytest.mark.unit
+def test_run_timeout_raises_with_check(mocker, ssh_client):
+    proc = mocker.Mock()
+    proc.communicate.side_effect = [subprocess.TimeoutExpired("ssh", 1), ("", "")]
+    mocker.patch("subprocess.Popen", return_value=proc)
+
+    with pytest.raises(TimeoutError):
+        ssh_client.run("sleep 100", timeout=1)
+
+
+@pytest.mark.unit
+def test_run_many_fans_out_over_hosts(mocker, ssh_client):
+    popen = mocker.patch("subprocess.Popen", side_effect=lambda cmd, **kw: _fake_proc(mocker, out=cmd[-2]))
+    streamed = []
+
+    batch = ssh_client.run_many("uptime", hosts=["h1", "h2", "h3"], max_parallel=2, on_result=streamed.append)
+
+    assert popen.call_count == 3
+    assert batch.ok()
+    assert len(streamed) == 3
+    assert {r.host for r in batch.results} == {"h1", "h2", "h3"}
+    assert all(r.stdout == f"git@{r.host}" for r in batch.results)
+    assert set(batch.durations_by_host()) == {"h1", "h2", "h3"}
+
+
+@pytest.mark.unit
+def test_run_many_is_concurrent(mocker, ssh_client):
+    def slow_proc(cmd, **kw):
+        proc = mocker.Mock()
+        proc.communicate.side_effect = lambda timeout=None: (time.sleep(0.2), ("", ""))[1]
+        proc.returncode = 0
+        return proc
+
+    mocker.patch("subprocess.Popen", side_effect=slow_proc)
+
+    batch = ssh_client.run_many(["true", "true"], hosts=["h1", "h2"], max_parallel=4)
+
+    assert len(batch.results) == 4
+    assert batch.wall_time < batch.serial_time
+
+
+@pytest.mark.unit
+def test_run_many_reports_failures(mocker, ssh_client):
+    mocker.patch("subprocess.Popen", return_value=_fake_proc(mocker, rc=255, err="Connection refused"))
+
+    batch = ssh_client.run_many("uptime", hosts=["down"])
+
+    assert not batch.ok()
+    assert batch.failed[0].stderr == "Connection refused"
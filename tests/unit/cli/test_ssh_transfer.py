@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from gitguard.clients.ssh_client import SSHClient
+
+
+@pytest.fixture
+def local_ssh(fake_ssh, tmp_path) -> SSHClient:
+    """SSHClient whose `ssh` binary is the stub executing the remote command locally."""
+    return SSHClient(host="localhost", artifacts_dir=str(tmp_path / "artifacts"), attach_logs_always=False)
+
+
+def _make_tree(root):
+    (root / "sub" / "deeper").mkdir(parents=True)
+    (root / "a.txt").write_text("alpha\n" * 1000)
+    (root / "sub" / "b.bin").write_bytes(os.urandom(64 * 1024))
+    (root / "sub" / "deeper" / "c.txt").write_text("gamma")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compress", [None, "gz"])
+def test_upload_download_roundtrip(local_ssh, tmp_path, compress):
+    src = tmp_path / "src"
+    _make_tree(src)
+    remote = tmp_path / "remote"
+    back = tmp_path / "back"
+
+    up = local_ssh.upload_tree(str(src), str(remote), compress=compress, timeout=30)
+    assert up.ok(), up.stderr
+    assert up.files == 3
+    assert up.payload_bytes == 6000 + 64 * 1024 + 5
+    assert up.bytes_transferred > 0 and up.throughput > 0
+
+    down = local_ssh.download_tree(str(remote), str(back), compress=compress, timeout=30)
+    assert down.ok(), down.stderr
+    assert down.files == 3
+    for rel in ("a.txt", "sub/b.bin", "sub/deeper/c.txt"):
+        assert (back / rel).read_bytes() == (src / rel).read_bytes()
+
+
+@pytest.mark.unit
+def test_compression_reduces_wire_bytes(local_ssh, tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "log.txt").write_text("same line over and over\n" * 20000)
+
+    plain = local_ssh.upload_tree(str(src), str(tmp_path / "r1"))
+    packed = local_ssh.upload_tree(str(src), str(tmp_path / "r2"), compress="gz")
+
+    assert plain.ok() and packed.ok()
+    assert packed.bytes_transferred < plain.bytes_transferred / 10
+
+
+@pytest.mark.unit
+def test_download_missing_remote_dir_fails(local_ssh, tmp_path):
+    result = local_ssh.download_tree(str(tmp_path / "does-not-exist"), str(tmp_path / "out"))
+
+    assert not result.ok()
+    assert result.stderr
+
+
+@pytest.mark.unit
+def test_download_refuses_links_outside_destination(local_ssh, tmp_path):
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    (remote / "ok.txt").write_text("fine")
+    (remote / "passwd").symlink_to("/etc/passwd")
+
+    result = local_ssh.download_tree(str(remote), str(tmp_path / "out"))
+
+    assert not result.ok()
+    assert not (tmp_path / "out" / "passwd").is_symlink()
+
+
+@pytest.mark.unit
+def test_unsupported_compression(local_ssh, tmp_path):
+    with pytest.raises(ValueError):
+        local_ssh.upload_tree(str(tmp_path), "/tmp/x", compress="zstd")
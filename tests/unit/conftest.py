@@ -0,0 +1,21 @@
+import os
+import stat
+
+import pytest
+
+
+@pytest.fixture
+def fake_ssh(tmp_path, monkeypatch):
+    """
+    `ssh` stub on PATH that appends its arguments to the returned log file and runs the remote
+    command (its last argument) locally, so ssh transports work without an ssh server.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "ssh-calls.log"
+    stub = bin_dir / "ssh"
+    stub.write_text(f'#!/bin/sh\necho "$@" >> {calls}\nfor last; do :; done\nexec sh -c "$last"\n')
+    stub.chmod(stub.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.delenv("GIT_SSH_COMMAND", raising=False)
+    return calls
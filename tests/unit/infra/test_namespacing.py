@@ -0,0 +1,39 @@
+import subprocess
+
+import pytest
+
+from gitguard.infra.namespacing import ResourceNamespace, worker_id, write_git_config
+
+
+@pytest.mark.unit
+def test_serial_run_keeps_names(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    ns = ResourceNamespace()
+
+    assert worker_id() == "master"
+    assert ns.user("testuser") == "testuser"
+    assert ns.repo("test-repo") == "test-repo"
+    assert ns.email("testuser") == "testuser@example.com"
+
+
+@pytest.mark.unit
+def test_names_are_keyed_by_xdist_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    ns = ResourceNamespace()
+
+    assert ns.user("bob") == "bob-gw3"
+    assert ns.repo("tag-demo") == "tag-demo-gw3"
+    assert ns.org("test-org") == "test-org-gw3"
+    assert ns.email("bob") == "bob-gw3@example.com"
+    assert ResourceNamespace(worker="gw4").user("bob") != ns.user("bob")
+
+
+@pytest.mark.unit
+def test_write_git_config_used_as_global(tmp_path, monkeypatch):
+    path = write_git_config(tmp_path / "gw0" / "gitconfig", user_name="testuser-gw0",
+                            user_email="testuser-gw0@example.com")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(path))
+
+    out = subprocess.run(["git", "config", "--global", "user.name"], capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip() == "testuser-gw0"
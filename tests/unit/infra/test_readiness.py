@@ -0,0 +1,124 @@
+import socket
+import socketserver
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gitguard.infra.readiness import (
+    GitDaemonProbe,
+    HttpProbe,
+    SshBannerProbe,
+    wait_until_ready,
+)
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == "/api/healthz" else 404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _BannerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.sendall(b"SSH-2.0-Go\r\n")
+
+
+class _GitDaemonHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.recv(1024)
+        msg = b"ERR access denied or repository not exported"
+        self.request.sendall(f"{len(msg) + 4:04x}".encode() + msg)
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def local_stack():
+    servers = [
+        _serve(ThreadingHTTPServer(("127.0.0.1", 0), _HealthHandler)),
+        _serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), _BannerHandler)),
+        _serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), _GitDaemonHandler)),
+    ]
+    yield [s.server_address[1] for s in servers]
+    for s in servers:
+        s.shutdown()
+        s.server_close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.unit
+def test_all_probes_ready(local_stack):
+    http_port, ssh_port, git_port = local_stack
+
+    report = wait_until_ready([
+        HttpProbe(f"http://127.0.0.1:{http_port}/api/healthz"),
+        SshBannerProbe("127.0.0.1", ssh_port),
+        GitDaemonProbe("127.0.0.1", git_port),
+    ], timeout=5)
+
+    assert report.ok(), report.summary()
+    assert [r.name for r in report.results] == ["http", "ssh", "git"]
+    assert all(r.time_to_ready is not None and r.time_to_ready < 5 for r in report.results)
+    assert report.results[1].detail == "SSH-2.0-Go"
+
+
+@pytest.mark.unit
+def test_wrong_http_status_is_not_ready(local_stack):
+    http_port = local_stack[0]
+
+    report = wait_until_ready([HttpProbe(f"http://127.0.0.1:{http_port}/missing")], timeout=0.3)
+
+    assert not report.ok()
+    assert report.results[0].attempts > 1
+    assert "404" in report.results[0].last_error
+
+
+@pytest.mark.unit
+def test_closed_port_backs_off_until_timeout():
+    started = time.perf_counter()
+
+    report = wait_until_ready([SshBannerProbe("127.0.0.1", _free_port())], timeout=0.5, initial_delay=0.005)
+
+    elapsed = time.perf_counter() - started
+    assert not report.ok()
+    assert report.results[0].time_to_ready is None
+    # exponential backoff from 5ms: several attempts, but far fewer than a busy loop
+    assert 3 <= report.results[0].attempts <= 15
+    assert elapsed < 2
+
+
+@pytest.mark.unit
+def test_service_coming_up_late_is_detected():
+    port = _free_port()
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", port), _BannerHandler, bind_and_activate=False)
+    server.allow_reuse_address = True
+
+    def start_later():
+        time.sleep(0.2)
+        server.server_bind()
+        server.server_activate()
+        server.serve_forever(poll_interval=0.05)
+
+    threading.Thread(target=start_later, daemon=True).start()
+    try:
+        report = wait_until_ready([SshBannerProbe("127.0.0.1", port)], timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report.ok(), report.summary()
+    assert 0.2 <= report.results[0].time_to_ready < 2
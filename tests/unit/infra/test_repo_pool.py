@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from gitguard.infra.repo_pool import RepoPool
+
+
+def _ok(mocker, status=201):
+    res = mocker.Mock()
+    res.ok.return_value = True
+    res.status_code = status
+    return res
+
+
+@pytest.fixture
+def api(mocker):
+    client = mocker.Mock()
+    client.delete_repo.return_value = _ok(mocker, 204)
+    client.admin_create_repo.return_value = _ok(mocker)
+    client.commit_files.return_value = _ok(mocker)
+    client._auth_headers.return_value = {}
+    return client
+
+
+@pytest.mark.unit
+def test_lease_and_recycle(api):
+    with RepoPool(api, owner="testuser", size=2, prefix="pool", seed_files={"README.md": "# seed"}) as pool:
+        first = pool.lease(timeout=5)
+        second = pool.lease(timeout=5)
+        assert {first.name, second.name} == {"pool-0", "pool-1"}
+        assert first.generation == 1
+
+        pool.release(first)
+        again = pool.lease(timeout=5)
+
+        assert again is first
+        assert again.generation == 2
+
+    # 2 initial provisions + 1 recycle, each seeded with one file
+    assert api.admin_create_repo.call_count == 3
+    assert api.commit_files.call_count == 3
+    assert api.commit_files.call_args.args[:4] == ("testuser", "pool-0", "main", {"README.md": "# seed"})
+
+
+@pytest.mark.unit
+def test_close_deletes_pool_repos(api):
+    pool = RepoPool(api, owner="testuser", size=3).start()
+    pool.lease(timeout=5)
+    api.delete_repo.reset_mock()
+
+    pool.close()
+
+    deleted = sorted(c.kwargs["repo"] for c in api.delete_repo.call_args_list)
+    assert deleted == ["pool-0", "pool-1", "pool-2"]
+
+
+@pytest.mark.unit
+def test_lease_times_out_when_provisioning_fails(api, mocker):
+    failed = mocker.Mock()
+    failed.ok.return_value = False
+    failed.status_code = 500
+    failed.text = "boom"
+    api.admin_create_repo.return_value = failed
+
+    with RepoPool(api, owner="testuser", size=1, max_failures=2) as pool:
+        with pytest.raises(TimeoutError):
+            pool.lease(timeout=0.3)
+
+    assert api.admin_create_repo.call_count == 2
+
+
+@pytest.mark.unit
+def test_leases_are_exclusive_under_concurrency(api):
+    leased = []
+    lock = threading.Lock()
+
+    with RepoPool(api, owner="testuser", size=4) as pool:
+        def take():
+            repo = pool.lease(timeout=5)
+            with lock:
+                leased.append(repo.name)
+
+        threads = [threading.Thread(target=take) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert sorted(leased) == ["pool-0", "pool-1", "pool-2", "pool-3"]
+
+
+@pytest.mark.unit
+def test_reset_mode_requires_git_client(api):
+    with pytest.raises(ValueError):
+        RepoPool(api, owner="testuser", recycle="reset")
+
+
+@pytest.mark.unit
+def test_reset_mode_force_pushes_seed(api, git_client, tmp_path, mocker, monkeypatch):
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "testuser")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "testuser@example.com")
+    remote = tmp_path / "remote.git"
+    assert git_client._run(["init", "--bare", str(remote)]).ok()
+    mocker.patch.object(git_client, "_make_repo_url", return_value=str(remote))
+
+    with RepoPool(api, owner="testuser", size=1, recycle="reset", git_client=git_client,
+                  seed_files={"README.md": "# seed"}) as pool:
+        repo = pool.lease(timeout=10)
+        # simulate a test dirtying the remote with an extra branch
+        assert git_client._run(["branch", "dirty", "main"], cwd=str(remote)).ok()
+        pool.release(repo)
+        pool.lease(timeout=10)
+
+    branches = git_client._run(["branch", "--format=%(refname:short)"], cwd=str(remote)).stdout.split()
+    assert branches == ["main"]
+    assert api.admin_create_repo.call_count == 1
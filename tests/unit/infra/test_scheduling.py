@@ -0,0 +1,90 @@
+import pytest
+
+from gitguard.infra.scheduling import DurationScheduling, build_units
+
+
+class _Gateway:
+    def __init__(self, name):
+        self.id = name
+
+
+class _FakeNode:
+    def __init__(self, name):
+        self.gateway = _Gateway(name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+@pytest.fixture
+def sched_config(mocker):
+    config = mocker.Mock()
+    config.getvalue.side_effect = lambda name: {"tx": ["2*popen"]}[name]
+    config.getoption.side_effect = lambda name: None
+    return config
+
+
+COLLECTION = ["t.py::a", "t.py::b", "t.py::c", "t.py::d", "t.py::e"]
+DURATIONS = {"t.py::a": 1.0, "t.py::b": 9.0, "t.py::c": 2.0, "t.py::d": 7.0, "t.py::e": 0.5}
+
+
+@pytest.mark.unit
+def test_build_units_longest_first():
+    units = build_units(COLLECTION, DURATIONS, groups={})
+
+    assert [u[1] for u in units] == [[1], [3], [2], [0], [4]]
+
+
+@pytest.mark.unit
+def test_build_units_groups_and_unknown_tests():
+    durations = {"t.py::a": 1.0, "t.py::b": 3.0, "t.py::c": 5.0}
+    groups = {"t.py::a": "fixture:repo_pool", "t.py::c": "fixture:repo_pool"}
+
+    units = build_units(COLLECTION + ["t.py::new@grp"], durations, groups)
+
+    assert units[0] == (6.0, [0, 2])
+    # unknown tests (d, e, new) get the median of known durations
+    assert sorted(u[0] for u in units[1:]) == [3.0, 3.0, 3.0, 3.0]
+
+
+@pytest.mark.unit
+def test_scheduler_deals_longest_units_to_different_workers(sched_config):
+    sched = DurationScheduling(sched_config, durations=DURATIONS)
+    n0, n1 = _FakeNode("gw0"), _FakeNode("gw1")
+    for node in (n0, n1):
+        sched.add_node(node)
+        sched.add_node_collection(node, COLLECTION)
+
+    sched.schedule()
+
+    assert n0.sent == [1, 2]  # b (9s), c (2s)
+    assert n1.sent == [3, 0]  # d (7s), a (1s)
+    assert sched.units == [[4]]
+
+    sched.mark_test_complete(n1, 3)
+    assert n1.sent == [3, 0, 4]
+    assert n1.shutting_down
+    assert not sched.pending
+
+
+@pytest.mark.unit
+def test_scheduler_requeues_tests_of_crashed_worker(sched_config):
+    sched = DurationScheduling(sched_config, durations=DURATIONS)
+    n0, n1 = _FakeNode("gw0"), _FakeNode("gw1")
+    for node in (n0, n1):
+        sched.add_node(node)
+        sched.add_node_collection(node, COLLECTION)
+    sched.schedule()
+
+    crashed = sched.remove_node(n0)
+
+    assert crashed == "t.py::b"
+    # c (still queued on the crashed worker) goes back to the front of the queue
+    assert sched.units[0] == [2]
+    sched.mark_test_complete(n1, 3)
+    assert n1.sent == [3, 0, 2]
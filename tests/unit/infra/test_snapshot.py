@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from gitguard.infra.snapshot import SnapshotStore, is_immutable, main, spec_key
+
+PACK = "git/repositories/testuser/test-repo.git/objects/pack/pack-" + "a" * 40 + ".pack"
+LOOSE = "git/repositories/testuser/test-repo.git/objects/ab/" + "c" * 38
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    root = tmp_path / "data"
+    for rel, content in {
+        "gitea/gitea.db": b"SQLite format 3\0" + b"x" * 4096,
+        "gitea/conf/app.ini": b"[server]\nDOMAIN=gitea\n",
+        "git/repositories/testuser/test-repo.git/HEAD": b"ref: refs/heads/main\n",
+        PACK: os.urandom(8192),
+        LOOSE: b"loose object",
+    }.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return root
+
+
+def _tree(root):
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+@pytest.mark.unit
+def test_save_restore_roundtrip(data_dir, tmp_path):
+    store = SnapshotStore(str(tmp_path / "store"))
+    original = _tree(data_dir)
+
+    saved = store.save(str(data_dir), "k1")
+    # mutate the environment the way a test run would
+    (data_dir / "gitea" / "gitea.db").write_bytes(b"changed")
+    (data_dir / "gitea" / "new-file").write_text("created during run")
+
+    restored = store.restore("k1", str(data_dir))
+
+    assert saved.files == restored.files == 5
+    assert _tree(data_dir) == original
+    assert not (data_dir / "gitea" / "new-file").exists()
+
+
+@pytest.mark.unit
+def test_restore_hardlinks_only_immutable_files(data_dir, tmp_path):
+    store = SnapshotStore(str(tmp_path / "store"))
+    store.save(str(data_dir), "k1")
+    target = tmp_path / "restored"
+
+    stats = store.restore("k1", str(target))
+
+    assert stats.methods.get("hardlink") == 2
+    assert (target / PACK).stat().st_nlink > 1
+    assert (target / LOOSE).stat().st_nlink > 1
+    # the sqlite DB must be a private copy: Gitea writes it in place
+    assert (target / "gitea" / "gitea.db").stat().st_nlink == 1
+    (target / "gitea" / "gitea.db").write_bytes(b"mutated")
+    assert store.restore("k1", str(tmp_path / "again")).files == 5
+    assert (tmp_path / "again" / "gitea" / "gitea.db").read_bytes().startswith(b"SQLite format 3")
+
+
+@pytest.mark.unit
+def test_objects_are_deduplicated(data_dir, tmp_path):
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    first = store.save(str(data_dir), "k1")
+    (data_dir / "gitea" / "conf" / "app.ini").write_text("[server]\nDOMAIN=other\n")
+    second = store.save(str(data_dir), "k2")
+
+    assert first.new_objects == 5
+    assert second.new_objects == 1
+    assert store.keys() == ["k1", "k2"]
+
+
+@pytest.mark.unit
+def test_spec_key_tracks_spec_contents(tmp_path):
+    spec = tmp_path / "init_gitea.sh"
+    spec.write_text("echo v1")
+    k1 = spec_key([str(spec)])
+
+    assert spec_key([str(spec)]) == k1
+    assert spec_key([str(spec)], extra={"gitea": "1.22"}) != k1
+    spec.write_text("echo v2")
+    assert spec_key([str(spec)]) != k1
+
+
+@pytest.mark.unit
+def test_is_immutable():
+    assert is_immutable(PACK)
+    assert is_immutable(LOOSE)
+    assert not is_immutable("git/repositories/testuser/test-repo.git/objects/info/packs")
+    assert not is_immutable("git/repositories/testuser/test-repo.git/refs/heads/main")
+    assert not is_immutable("gitea/gitea.db")
+
+
+@pytest.mark.unit
+def test_cli_restore_missing_snapshot(tmp_path):
+    rc = main(["restore", "--store", str(tmp_path / "store"), "--data-dir", str(tmp_path / "d"), "--key", "nope"])
+
+    assert rc == 2
@@ -0,0 +1,70 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.perf.bundles import APPROACHES, BundleSeedingBenchmark, BundleServer, bundle_pack_bytes, write_bundle_list
+
+
+@pytest.fixture
+def setup(tmp_path):
+    origin = tmp_path / "origin.git"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(origin)], check=True)
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    history = [HistoryCommit(f"c{n}", {f"f{i}.txt": f"{n}-{i}\n" * 300 for i in range(10)}, label=f"c{n}")
+               for n in range(5)]
+    assert git.build_history(history, workdir=str(origin)).ok()
+    return git, origin
+
+
+@pytest.mark.unit
+def test_bundle_pack_bytes_skips_header(tmp_path, setup):
+    git, origin = setup
+    bundle = tmp_path / "b.bundle"
+    assert git.bundle_create(str(bundle), ["--all"], workdir=str(origin)).ok()
+
+    size = bundle_pack_bytes(str(bundle))
+
+    assert 0 < size < bundle.stat().st_size
+    assert bundle.read_bytes()[-size:][:4] == b"PACK"
+
+
+@pytest.mark.unit
+def test_benchmark_shows_avoided_server_packing(tmp_path, setup):
+    git, origin = setup
+    with BundleServer(str(tmp_path / "served")) as server:
+        bench = BundleSeedingBenchmark(git, str(tmp_path / "bench"), f"file://{origin}", server)
+        bench.prepare()
+        # the remote moves on after the bundle was cut: only the delta comes from the server
+        assert git.build_history([HistoryCommit("late", {"late.txt": "x"}, parent="refs/heads/main^0")],
+                                 workdir=str(origin), base_timestamp=1800000000).ok()
+        report = bench.run(iterations=2)
+
+    assert report.ok(), report.format()
+    assert [r.approach for r in report.results] == list(APPROACHES)
+    full = report.get("server").last.server_pack_bytes
+    for approach in ("bundle-file", "bundle-uri"):
+        assert 0 < report.get(approach).last.server_pack_bytes < full / 4, report.format()
+        assert report.avoided(approach) > 0
+    assert server.requests["/full.bundle"] == 2
+    assert "avoided" in report.format()
+
+
+@pytest.mark.unit
+def test_bundle_list_chains_base_and_incremental(tmp_path, setup):
+    git, origin = setup
+    subprocess.run(["git", "--git-dir", str(origin), "branch", "-f", "base", "main~2"], check=True)
+    with BundleServer(str(tmp_path / "served")) as server:
+        assert git.bundle_create(str(server.directory / "base.bundle"), ["base"], workdir=str(origin)).ok()
+        assert git.bundle_create(str(server.directory / "incr.bundle"), ["main"], exclude=["base"],
+                                 workdir=str(origin)).ok()
+        write_bundle_list(str(server.directory / "list.cfg"),
+                          {"base": server.url("base.bundle"), "incr": server.url("incr.bundle")})
+
+        res = git.clone(target_dir="c", repo_url=f"file://{origin}", bundle_uri=server.url("list.cfg"))
+
+    assert res.ok(), res.stderr
+    assert set(server.requests) == {"/list.cfg", "/base.bundle", "/incr.bundle"}
+    refs = subprocess.run(["git", "-C", str(tmp_path / "c"), "for-each-ref", "--format=%(refname)", "refs/bundles/"],
+                          check=True, capture_output=True, text=True).stdout.split()
+    assert refs == ["refs/bundles/base", "refs/bundles/main"]
@@ -0,0 +1,53 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.perf.clone_modes import CLONE_MODES, CloneModeBenchmark
+
+
+@pytest.fixture
+def origin(tmp_path):
+    repo = tmp_path / "origin.git"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(repo)], check=True)
+    subprocess.run(["git", "--git-dir", str(repo), "config", "uploadpack.allowFilter", "true"], check=True)
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    files = {f"docs/page{i}.md": f"page {i}\n" * 200 for i in range(5)}
+    files.update({f"src/mod{i}.py": f"VALUE = {i}\n" * 500 for i in range(20)})
+    history = [HistoryCommit("init", files)]
+    history += [HistoryCommit(f"edit {n}", {"src/mod0.py": f"VALUE = {n}\n" * 500}) for n in range(5)]
+    assert git.build_history(history, workdir=str(repo)).ok()
+    return f"file://{repo}"
+
+
+@pytest.mark.unit
+def test_benchmark_compares_every_mode(tmp_path, origin):
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    bench = CloneModeBenchmark(git, workdir=str(tmp_path / "bench"), repo_url=origin)
+
+    report = bench.run(protocols=("file",), iterations=2)
+
+    assert report.ok(), report.format()
+    assert [r.mode for r in report.results] == list(CLONE_MODES)
+    full, shallow = report.get("file", "full").last, report.get("file", "shallow").last
+    blobless = report.get("file", "blobless").last
+    assert shallow.shallow and shallow.objects < full.objects
+    assert blobless.filtered and blobless.pack_bytes < full.pack_bytes
+    assert report.get("file", "sparse").last.disk_bytes < full.disk_bytes
+    assert report.get("file", "no-checkout").last.disk_bytes < full.disk_bytes
+    assert all(len(r.samples) == 2 for r in report.results)
+    assert not list((tmp_path / "bench").glob("file-*"))  # clones are removed after measuring
+    assert "blobless" in report.format()
+
+
+@pytest.mark.unit
+def test_refused_filter_is_reported(tmp_path, origin):
+    subprocess.run(["git", "--git-dir", origin[len("file://"):], "config", "uploadpack.allowFilter", "false"],
+                   check=True)
+    git = GitClient(workdir=str(tmp_path), enable_trace=False, attach_logs_always=False)
+    bench = CloneModeBenchmark(git, workdir=str(tmp_path / "bench"), repo_url=origin)
+
+    result = bench.run(protocols=("file",), iterations=1, modes=["blobless"]).results[0]
+
+    assert result.ok() and not result.last.filtered
+    assert any("filtering not recognized" in w for w in result.warnings)
@@ -0,0 +1,88 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, GitResult
+from gitguard.infra.namespacing import write_git_config
+from gitguard.perf.contention import PushContentionHarness, push_rejection
+
+
+@pytest.fixture
+def origin(tmp_path, monkeypatch):
+    """Bare repository with one commit on main, plus a private git identity."""
+    config = tmp_path / "gitconfig"
+    write_git_config(config, "Contention", "contention@example.com")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(config))
+    bare = tmp_path / "origin.git"
+    seed = tmp_path / "seed"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(bare)], check=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(seed)], check=True)
+    (seed / "README.md").write_text("seed")
+    for cmd in (["add", "."], ["commit", "-q", "-m", "seed"], ["push", "-q", str(bare), "main"]):
+        subprocess.run(["git", "-C", str(seed), *cmd], check=True)
+    return bare
+
+
+@pytest.mark.unit
+def test_push_rejection_classification():
+    def res(code, err):
+        return GitResult(code=code, stdout="", stderr=err, duration=0.0)
+
+    assert push_rejection(res(0, "")) is None
+    assert push_rejection(res(1, " ! [rejected]        main -> main (fetch first)")) == "rejected"
+    assert push_rejection(res(1, " ! [remote rejected] main -> main (failed to update ref)")) == "lock"
+    assert push_rejection(res(128, "fatal: Authentication failed")) is None
+
+
+@pytest.mark.unit
+def test_concurrent_pushes_all_land(tmp_path, origin):
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"),
+                    enable_trace=False, attach_logs_always=False)
+    harness = PushContentionHarness(git, workdir=str(tmp_path / "contention"), repo_url=str(origin), timeout=60)
+
+    report = harness.sweep([1, 4], pushes_per_client=3)
+
+    assert report.ok(), [r.failures for r in report.results]
+    single, many = report.results
+    assert (single.accepted, single.retries) == (3, 0)
+    assert many.accepted == 12 and many.throughput > 0
+    assert len(many.latencies) == 12
+    assert len(many.push_durations) == 12 + many.retries
+    commits = subprocess.run(["git", "--git-dir", str(origin), "rev-list", "--count", "gitguard-contention"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+    assert commits == str(1 + 3 + 12)
+    assert harness.remote_heads()["gitguard-contention"]
+    assert "clients" in report.format().splitlines()[0]
+
+
+@pytest.mark.unit
+def test_failed_commit_is_recorded_instead_of_pushed(tmp_path, origin, mocker):
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"),
+                    enable_trace=False, attach_logs_always=False)
+    harness = PushContentionHarness(git, workdir=str(tmp_path / "contention"), repo_url=str(origin), timeout=60)
+    harness.prepare(1)
+    mocker.patch.object(GitClient, "commit", return_value=GitResult(code=1, stdout="", stderr="nothing to commit",
+                                                                    duration=0.0))
+    push = mocker.spy(GitClient, "push")
+
+    result = harness.run(1, pushes_per_client=2)
+
+    assert result.accepted == 0 and not result.push_durations
+    assert result.failures == ["client 0 commit 0: nothing to commit"]
+    push.assert_not_called()
+
+
+@pytest.mark.unit
+def test_failed_add_is_reported_and_commit_skipped(tmp_path, origin, mocker):
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"),
+                    enable_trace=False, attach_logs_always=False)
+    harness = PushContentionHarness(git, workdir=str(tmp_path / "contention"), repo_url=str(origin), timeout=60)
+    harness.prepare(1)
+    mocker.patch.object(GitClient, "add", return_value=GitResult(code=128, stdout="", stderr="index.lock exists",
+                                                                 duration=0.0))
+    commit = mocker.spy(GitClient, "commit")
+
+    result = harness.run(1, pushes_per_client=1)
+
+    assert result.failures == ["client 0 commit 0: index.lock exists"]
+    commit.assert_not_called()
@@ -0,0 +1,74 @@
+import os
+import zlib
+
+import pytest
+
+from gitguard.clients.lfs_client import file_oid
+from gitguard.perf.datagen import (
+    clone_variant,
+    copy_file,
+    hash_file,
+    write_allocated,
+    write_file,
+    write_sparse,
+    write_tree,
+)
+
+
+@pytest.mark.unit
+def test_files_are_seeded_independent_of_chunk_size_and_hashed_while_written(tmp_path):
+    size = 3 * 1024 * 1024 + 5
+    a = write_file(tmp_path / "a.bin", size, seed=7, compressibility=0.4, chunk_size=64 * 1024)
+    b = write_file(tmp_path / "b.bin", size, seed=7, compressibility=0.4)
+    c = write_file(tmp_path / "c.bin", size, seed=8, compressibility=0.4)
+
+    assert a.sha256 == b.sha256 == file_oid(a.path).oid != c.sha256
+    assert a.size == b.size == a.path.stat().st_size == size
+    with pytest.raises(ValueError):
+        write_file(tmp_path / "bad.bin", 10, compressibility=1.5)
+
+
+@pytest.mark.unit
+def test_compressibility_controls_deflate_ratio(tmp_path):
+    ratios = {}
+    for level in (0.0, 0.5, 0.9):
+        data = write_file(tmp_path / f"{level}.bin", 512 * 1024, seed=1, compressibility=level).path.read_bytes()
+        ratios[level] = len(zlib.compress(data)) / len(data)
+
+    assert ratios[0.0] > 0.99
+    assert 0.45 < ratios[0.5] < 0.6
+    assert ratios[0.9] < 0.2
+
+
+@pytest.mark.unit
+def test_zero_files_are_sparse_or_allocated(tmp_path):
+    sparse = write_sparse(tmp_path / "s.bin", 64 * 1024 * 1024)
+    allocated = write_allocated(tmp_path / "f.bin", 4 * 1024 * 1024)
+
+    assert sparse.sha256 == hash_file(sparse.path)
+    assert sparse.path.stat().st_blocks * 512 < sparse.size  # no data blocks allocated
+    assert allocated.sha256 == hash_file(allocated.path) and allocated.path.stat().st_size == allocated.size
+
+
+@pytest.mark.unit
+def test_variants_are_copies_with_a_few_patched_blocks(tmp_path):
+    base = write_file(tmp_path / "base.bin", 1024 * 1024, seed=3)
+    copy_file(base.path, tmp_path / "copy.bin")
+    variant = clone_variant(base.path, tmp_path / "variant.bin", patches=2, patch_size=100, seed=9)
+    again = clone_variant(base.path, tmp_path / "again.bin", patches=2, patch_size=100, seed=9, sha256=False)
+
+    assert hash_file(tmp_path / "copy.bin") == base.sha256
+    assert variant.size == base.size and variant.sha256 != base.sha256
+    assert again.sha256 == "" and hash_file(again.path) == variant.sha256
+    original, changed = base.path.read_bytes(), variant.path.read_bytes()
+    assert 0 < sum(x != y for x, y in zip(original, changed)) <= 200
+
+
+@pytest.mark.unit
+def test_tree_files_have_distinct_content(tmp_path):
+    for kind in ("random", "sparse", "allocated"):
+        specs = write_tree(tmp_path / kind, 3, 1024, kind=kind, compressibility=0.5)
+        assert sorted(os.listdir(tmp_path / kind)) == ["blob-0000.bin", "blob-0001.bin", "blob-0002.bin"]
+        assert len({s.sha256 for s in specs}) == 3
+    with pytest.raises(ValueError):
+        write_tree(tmp_path / "bad", 1, 10, kind="zip")
@@ -0,0 +1,100 @@
+import hashlib
+import shutil
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, GitResult
+from gitguard.clients.lfs_client import LfsBatchResult, LfsTransfer, file_oid
+from gitguard.infra.namespacing import write_git_config
+from gitguard.perf.datagen import write_file
+from gitguard.perf.lfs import LfsThroughputBenchmark, generate_files, measure_git_lfs_push
+
+
+class FakeLfs:
+    """In-memory stand-in for LfsClient: uploads copy file contents, downloads hash them back."""
+
+    def __init__(self, corrupt=False):
+        self.store = {}
+        self.corrupt = corrupt
+        self.batches = []
+
+    def batch(self, owner, repo, operation, objects, ref=None):
+        self.batches.append(operation)
+        return LfsBatchResult(200, operation, [{"oid": o.oid, "size": o.size} for o in objects], duration=0.001)
+
+    def upload_files(self, owner, repo, paths, max_parallel=4):
+        transfers = []
+        for p in paths:
+            obj = file_oid(p)
+            skipped = obj.oid in self.store
+            self.store[obj.oid] = p.read_bytes()
+            transfers.append(LfsTransfer(obj.oid, obj.size, "upload", 200, 0 if skipped else obj.size, 0.01,
+                                         skipped=skipped))
+        return self.batch(owner, repo, "upload", []), transfers
+
+    def download_objects(self, owner, repo, objects, dest_dir, max_parallel=4):
+        transfers = []
+        for o in objects:
+            data = self.store[o.oid] + (b"x" if self.corrupt else b"")
+            transfers.append(LfsTransfer(o.oid, o.size, "download", 200, len(data), 0.01,
+                                         sha256=hashlib.sha256(data).hexdigest()))
+        return self.batch(owner, repo, "download", objects), transfers
+
+
+@pytest.mark.unit
+def test_generated_files_have_distinct_oids(tmp_path):
+    files = generate_files(tmp_path / "many", 3, 1024, kind="sparse")
+
+    assert len({o.oid for o in files.values()}) == 3
+    assert all(o == file_oid(p) for p, o in files.items())
+
+
+@pytest.mark.unit
+def test_benchmark_round_trip_and_cleanup(tmp_path):
+    lfs = FakeLfs()
+    bench = LfsThroughputBenchmark(lfs, "bob", "repo", str(tmp_path / "lfs"))
+
+    report = bench.run(count=3, size=256 * 1024, batch_probes=2)
+
+    assert report.ok(), report.format()
+    assert len(report.batch_latencies["upload"]) == 3
+    assert report.throughput("upload") > 0 and report.throughput("download") > 0
+    assert lfs.batches.count("upload") == 3 and lfs.batches.count("download") == 1
+    assert not (tmp_path / "lfs" / "source").exists()
+    assert "integrity failures: 0" in report.format()
+
+
+@pytest.mark.unit
+def test_benchmark_reports_integrity_failures(tmp_path):
+    report = LfsThroughputBenchmark(FakeLfs(corrupt=True), "bob", "repo", str(tmp_path)).run(count=2, size=1000)
+
+    assert not report.ok()
+    assert len(report.integrity_failures) == 2
+
+
+@pytest.mark.unit
+def test_git_lfs_push_stops_at_the_first_failed_step(tmp_path, mocker):
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False,
+                    attach_logs_always=False)
+    mocker.patch.object(git, "lfs_install", return_value=GitResult(1, "", "git: 'lfs' is not a git command", 0.0))
+    track = mocker.patch.object(git, "lfs_track")
+
+    with pytest.raises(RuntimeError, match="'lfs' is not a git command"):
+        measure_git_lfs_push(git, str(tmp_path), count=1, size=10)
+    track.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(shutil.which("git-lfs") is None, reason="git-lfs is not installed")
+def test_git_lfs_helpers_track_and_list(git_client, tmp_path, monkeypatch):
+    config = tmp_path / "gitconfig"
+    write_git_config(config, "Lfs", "lfs@example.com")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(config))
+    repo = tmp_path / "repo"
+    assert git_client.init(str(repo)).ok()
+    assert git_client.lfs_install(workdir=str(repo)).ok()
+    assert git_client.lfs_track(["*.bin"], workdir=str(repo)).ok()
+    spec = write_file(repo / "big.bin", 100_000, seed=1)
+    assert git_client.add("big.bin", workdir=str(repo)).ok() and git_client.commit("lfs", workdir=str(repo)).ok()
+
+    assert git_client.lfs_files(workdir=str(repo)) == {"big.bin": spec.sha256}
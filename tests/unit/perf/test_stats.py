@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from gitguard.perf.stats import Summary, dir_size, format_table, percentile
+
+
+@pytest.mark.unit
+def test_percentile_interpolates():
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert math.isnan(percentile([], 50))
+
+
+@pytest.mark.unit
+def test_summary_and_table():
+    s = Summary.of([0.010, 0.020, 0.030])
+    assert (s.count, s.min, s.p50, s.max) == (3, 0.010, 0.020, 0.030)
+    assert s.mean == pytest.approx(0.020)
+    assert Summary.of([]).count == 0
+
+    table = format_table({"http/branch": s}).splitlines()
+    assert table[0].split()[:2] == ["series", "n"]
+    assert table[1].split()[:3] == ["http/branch", "3", "10.00"]
+
+
+@pytest.mark.unit
+def test_dir_size_sums_nested_files(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "x.bin").write_bytes(b"x" * 10)
+    (tmp_path / "a" / "b" / "y.bin").write_bytes(b"y" * 32)
+
+    assert dir_size(tmp_path) == 42
+    assert dir_size(tmp_path / "missing") == 0
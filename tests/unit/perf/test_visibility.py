@@ -0,0 +1,108 @@
+import subprocess
+import time
+
+import pytest
+
+from gitguard.clients.git_client import GitClient
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.infra.namespacing import write_git_config
+from gitguard.perf.visibility import VisibilityProbe
+
+
+@pytest.fixture
+def probe(tmp_path, monkeypatch, mocker):
+    """Probe whose clone URL points at a local bare repo seeded with one commit on main."""
+    config = tmp_path / "gitconfig"
+    write_git_config(config, "Probe", "probe@example.com")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(config))
+    origin = tmp_path / "origin.git"
+    seed = tmp_path / "seed"
+    subprocess.run(["git", "init", "-q", "--bare", str(origin)], check=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(seed)], check=True)
+    (seed / "README.md").write_text("seed")
+    for cmd in (["add", "."], ["commit", "-q", "-m", "seed"], ["push", "-q", str(origin), "main"]):
+        subprocess.run(["git", "-C", str(seed), *cmd], check=True)
+
+    git = GitClient(host="localhost", owner="bob", repo="repo", workdir=str(tmp_path),
+                    artifacts_dir=str(tmp_path / "artifacts"), enable_trace=False, attach_logs_always=False)
+    mocker.patch.object(git, "_make_repo_url", return_value=str(origin))
+    api = GiteaHttpClient("http://localhost:3000", token="t", attach_to_allure=False)
+    p = VisibilityProbe(git, api, "bob", "repo", workdir=str(tmp_path / "probe"), timeout=0.5)
+    p.origin = origin
+    return p
+
+
+@pytest.mark.unit
+def test_measure_records_lag_per_endpoint(probe, mocker):
+    seen = {"branch": 0, "contents": 0}
+
+    def check(endpoint, branch, sha, blob):
+        seen[endpoint] += 1
+        remote = subprocess.run(["git", "--git-dir", str(probe.origin), "rev-parse", branch],
+                                capture_output=True, text=True).stdout.strip()
+        assert remote == sha  # the push already landed when polling starts
+        return seen[endpoint] >= (2 if endpoint == "branch" else 3)
+
+    mocker.patch.object(probe, "_check", side_effect=check)
+
+    report = probe.run(["http"], iterations=2, warmup=1)
+
+    assert len(report.samples) == 2 and report.ok()
+    sample = report.samples[0]
+    assert sample.protocol == "http" and sample.iteration == 1 and len(sample.sha) == 40
+    assert set(sample.lag) == {"branch", "contents"}
+    assert all(lag > 0 for lag in sample.lag.values())
+    assert set(report.summary()) == {"http/push", "http/branch", "http/contents"}
+    assert "timeouts: 0" in report.format()
+
+
+@pytest.mark.unit
+def test_endpoint_never_visible_times_out(probe, mocker):
+    mocker.patch.object(probe, "_check", side_effect=lambda ep, *a: ep == "branch")
+
+    report = probe.run(["http"], iterations=1, warmup=0)
+
+    assert not report.ok()
+    assert report.samples[0].lag["contents"] is None
+    assert report.samples[0].polls["contents"] > 1
+    assert report.timeouts() == 1
+
+
+@pytest.mark.unit
+def test_slow_endpoint_does_not_inflate_other_lags(probe, mocker):
+    def check(endpoint, *args):
+        if endpoint == "branch":
+            time.sleep(0.3)
+        return True
+
+    mocker.patch.object(probe, "_check", side_effect=check)
+
+    sample = probe.run(["http"], iterations=1, warmup=0).samples[0]
+
+    assert sample.lag["branch"] >= 0.3
+    assert sample.lag["contents"] < 0.2
+
+
+@pytest.mark.unit
+def test_faster_server_is_not_hidden_by_earlier_lag(probe, mocker):
+    server_delay = {"s": 0.2}
+
+    def check(*args):
+        time.sleep(server_delay["s"])
+        return True
+
+    mocker.patch.object(probe, "_check", side_effect=check)
+    slow = probe.measure("http", 0)
+
+    server_delay["s"] = 0.0  # the server got fast: visible as soon as the push returns
+    fast = probe.measure("http", 1)
+
+    assert min(slow.lag.values()) >= 0.2
+    assert max(fast.lag.values()) < 0.03 and fast.polls == {"branch": 1, "contents": 1}
+
+
+@pytest.mark.unit
+def test_unknown_endpoint_rejected(probe):
+    with pytest.raises(ValueError):
+        VisibilityProbe(probe.git, GiteaHttpClient("http://x", token="t"), "bob", "repo", "/tmp",
+                        endpoints=["branch", "graphql"])
@@ -0,0 +1,51 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+import requests
+
+from gitguard.perf.webhooks import WebhookDelivery, WebhookReceiver, correlate
+
+
+def _deliver(receiver, sha, delivery_id, secret="s3cret"):
+    body = json.dumps({"ref": "refs/heads/main", "after": sha}).encode()
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    r = requests.post(f"http://127.0.0.1:{receiver.port}/hook", data=body, timeout=5,
+                      headers={"X-Gitea-Event": "push", "X-Gitea-Delivery": delivery_id,
+                               "X-Gitea-Signature": signature, "Content-Type": "application/json"})
+    assert r.status_code == 200
+
+
+@pytest.mark.unit
+def test_receiver_records_and_verifies_deliveries():
+    with WebhookReceiver(host="127.0.0.1", secret="s3cret", advertise_host="tester") as receiver:
+        assert receiver.url == f"http://tester:{receiver.port}/hook"
+        _deliver(receiver, "a" * 40, "d1")
+        _deliver(receiver, "b" * 40, "d2", secret="wrong")
+
+        assert receiver.wait_for(["a" * 40, "b" * 40], timeout=5)
+        assert not receiver.wait_for(["c" * 40], timeout=0.05)
+
+        first, second = receiver.deliveries
+        assert (first.event, first.delivery_id, first.ref) == ("push", "d1", "refs/heads/main")
+        assert first.signature_ok is True and second.signature_ok is False
+
+
+@pytest.mark.unit
+def test_correlate_reports_latency_drops_and_duplicates():
+    pushes = {"a": 10.0, "b": 11.0, "c": 12.0}
+    deliveries = [
+        WebhookDelivery("1", "push", "refs/heads/main", "a", received_at=10.2),
+        WebhookDelivery("2", "push", "refs/heads/main", "b", received_at=11.5),
+        WebhookDelivery("3", "push", "refs/heads/main", "a", received_at=13.0),
+        WebhookDelivery("4", "push", "refs/heads/main", "zzz", received_at=13.1),
+    ]
+
+    report = correlate(pushes, deliveries)
+
+    assert report.latencies == {"a": pytest.approx(0.2), "b": pytest.approx(0.5)}
+    assert report.dropped == ["c"]
+    assert (report.duplicates, report.unexpected) == (1, 1)
+    assert not report.ok()
+    assert "dropped: 1  duplicates: 1" in report.format()
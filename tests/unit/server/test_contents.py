@@ -0,0 +1,78 @@
+import base64
+import json
+
+import pytest
+
+from gitguard.clients.http_client import HttpResult
+
+
+def _res(status, body=None) -> HttpResult:
+    return HttpResult(status_code=status, text=json.dumps(body), json=body, headers={}, duration=0.0)
+
+
+@pytest.fixture
+def contents_api(mocker, gitea_client):
+    """Patch get/post: the tree lists README.md; every POST body is drained and decoded into `sent`."""
+    sent = []
+    tree = {"tree": [{"path": "README.md", "type": "blob", "sha": "abc"}], "truncated": False}
+    mocker.patch.object(type(gitea_client), "get", return_value=_res(200, tree))
+
+    def post(path, data, headers):
+        body = json.loads(b"".join(data))
+        if len(body["files"]) > 1 and any(len(f.get("content", "")) > 1000 for f in body["files"]):
+            return _res(413, {"message": "request entity too large"})
+        sent.append(body)
+        return _res(201, {"commit": {"sha": f"c{len(sent)}"}})
+
+    mock_post = mocker.patch.object(type(gitea_client), "post", side_effect=post)
+    return gitea_client, mock_post, sent
+
+
+@pytest.mark.unit
+def test_commit_files_single_commit_with_operations(contents_api):
+    client, mock_post, sent = contents_api
+
+    result = client.commit_files("bob", "repo", "main",
+                                 {"README.md": "# new", "docs/a.txt": b"\x00bin", "README.md.old": None},
+                                 message="Seed")
+
+    assert result.ok()
+    assert result.commits == ["c1"]
+    assert result.files == 2 and result.payload_bytes == 9
+    assert mock_post.call_args.args[0] == "repos/bob/repo/contents"
+    body = sent[0]
+    assert body["branch"] == "main" and body["message"] == "Seed"
+    assert body["files"] == [
+        {"operation": "update", "path": "README.md", "sha": "abc", "content": base64.b64encode(b"# new").decode()},
+        {"operation": "create", "path": "docs/a.txt", "content": base64.b64encode(b"\x00bin").decode()},
+    ]
+
+
+@pytest.mark.unit
+def test_commit_files_streams_paths_and_chunks_by_payload(contents_api, tmp_path):
+    client, _, sent = contents_api
+    big = tmp_path / "big.bin"
+    big.write_bytes(bytes(range(256)) * 4096)  # 1 MiB, spans several base64 chunks
+
+    result = client.commit_files("bob", "repo", "main",
+                                 {"big.bin": big, "a.txt": "a", "b.txt": "b"},
+                                 message="Bulk", max_payload_bytes=600)
+
+    assert result.ok()
+    assert [[f["path"] for f in body["files"]] for body in sent] == [["big.bin"], ["a.txt", "b.txt"]]
+    assert base64.b64decode(sent[0]["files"][0]["content"]) == big.read_bytes()
+    assert result.commits == ["c1", "c2"]
+
+
+@pytest.mark.unit
+def test_commit_files_splits_batch_on_413(contents_api):
+    client, mock_post, sent = contents_api
+
+    result = client.commit_files("bob", "repo", "main",
+                                 {"a.txt": "x" * 2000, "b.txt": "y" * 2000, "c.txt": "z"},
+                                 message="Split")
+
+    assert result.ok()
+    assert mock_post.call_count == 5  # rejected [a, b, c] -> [a] + rejected [b, c] -> [b] + [c]
+    assert [[f["path"] for f in body["files"]] for body in sent] == [["a.txt"], ["b.txt"], ["c.txt"]]
+    assert result.files == 3 and len(result.commits) == 3
@@ -0,0 +1,78 @@
+import hashlib
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+
+PAYLOAD = bytes(range(256)) * 16 * 1024  # 4 MiB
+
+
+class _Handler(BaseHTTPRequestHandler):
+    seen = []
+
+    def do_GET(self):
+        self.seen.append(self.path)
+        if "missing" in self.path:
+            body = b'{"message": "not found"}'
+            self.send_response(404)
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    _Handler.seen = []
+    yield GiteaHttpClient(f"http://127.0.0.1:{server.server_address[1]}", token="t", attach_to_allure=False)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+def test_download_archive_to_file(api, tmp_path):
+    dest = tmp_path / "out" / "repo.tar.gz"
+
+    res = api.download_archive("bob", "repo", "main", dest, chunk_size=64 * 1024)
+
+    assert res.ok()
+    assert _Handler.seen == ["/api/v1/repos/bob/repo/archive/main.tar.gz"]
+    assert res.bytes_written == len(PAYLOAD) and res.path == str(dest)
+    assert res.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "out" / "repo.tar.gz.part").exists()
+    assert res.throughput > 0
+
+
+@pytest.mark.unit
+def test_download_raw_to_writer_with_ref(api):
+    sink = io.BytesIO()
+
+    res = api.download_raw("bob", "repo", "/docs/big.bin", sink, ref="v1")
+
+    assert res.ok() and res.path is None
+    assert _Handler.seen == ["/api/v1/repos/bob/repo/raw/docs/big.bin?ref=v1"]
+    assert sink.getvalue() == PAYLOAD
+
+
+@pytest.mark.unit
+def test_download_failure_leaves_no_file(api, tmp_path):
+    dest = tmp_path / "missing.bin"
+
+    res = api.download_raw("bob", "repo", "missing.bin", dest)
+
+    assert not res.ok() and res.status_code == 404
+    assert "not found" in res.error
+    assert res.bytes_written == 0
+    assert not dest.exists() and not (tmp_path / "missing.bin.part").exists()
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_create_hook(mocker, gitea_client):
+    mock_post = mocker.patch.object(type(gitea_client), "post", return_value={"id": 7})
+
+    result = gitea_client.create_hook("alice", "repo1", "http://tester:8080/hook", secret="s3cret")
+
+    assert result["id"] == 7
+    mock_post.assert_called_once_with(
+        "repos/alice/repo1/hooks",
+        json={
+            "type": "gitea",
+            "config": {"url": "http://tester:8080/hook", "content_type": "json", "secret": "s3cret"},
+            "events": ["push"],
+            "active": True,
+            "branch_filter": "*",
+        },
+        headers=gitea_client._auth_headers(),
+    )
+
+
+@pytest.mark.unit
+def test_list_and_delete_hooks(mocker, gitea_client):
+    mock_get = mocker.patch.object(type(gitea_client), "get", return_value=[{"id": 7}])
+    mock_delete = mocker.patch.object(type(gitea_client), "delete", return_value={"result": "deleted"})
+
+    assert gitea_client.list_hooks("alice", "repo1") == [{"id": 7}]
+    gitea_client.delete_hook("alice", "repo1", 7)
+
+    mock_get.assert_called_once_with("repos/alice/repo1/hooks", headers=gitea_client._auth_headers())
+    mock_delete.assert_called_once_with("repos/alice/repo1/hooks/7", headers=gitea_client._auth_headers())
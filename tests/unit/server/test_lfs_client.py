@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.clients.lfs_client import LfsClient, LfsObject, file_oid
+
+
+class _LfsHandler(BaseHTTPRequestHandler):
+    """Minimal LFS server: batch API plus basic transfer endpoints under /store/<oid>."""
+    store = {}
+    corrupt = set()
+    auth = []
+
+    def _send(self, code, body=b"", content_type="application/vnd.git-lfs+json"):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.auth.append(self.headers.get("Authorization"))
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/verify":
+            return self._send(200 if body["oid"] in self.store else 404)
+        base = f"http://{self.headers['Host']}"
+        objects = []
+        for o in body["objects"]:
+            entry = {"oid": o["oid"], "size": o["size"]}
+            if body["operation"] == "upload" and o["oid"] not in self.store:
+                entry["actions"] = {"upload": {"href": f"{base}/store/{o['oid']}", "header": {"X-Upload": "1"}},
+                                    "verify": {"href": f"{base}/verify"}}
+            elif body["operation"] == "download":
+                if o["oid"] in self.store:
+                    entry["actions"] = {"download": {"href": f"{base}/store/{o['oid']}"}}
+                else:
+                    entry["error"] = {"code": 404, "message": "Object does not exist"}
+            objects.append(entry)
+        self._send(200, json.dumps({"transfer": "basic", "objects": objects}).encode())
+
+    def do_PUT(self):
+        assert self.headers.get("X-Upload") == "1"
+        self.store[self.path.rsplit("/", 1)[-1]] = self.rfile.read(int(self.headers["Content-Length"]))
+        self._send(200)
+
+    def do_GET(self):
+        oid = self.path.rsplit("/", 1)[-1]
+        data = self.store[oid]
+        self._send(200, data[:-1] + b"!" if oid in self.corrupt else data, "application/octet-stream")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def lfs():
+    _LfsHandler.store, _LfsHandler.corrupt, _LfsHandler.auth = {}, set(), []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LfsHandler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    api = GiteaHttpClient(f"http://127.0.0.1:{server.server_address[1]}", token="tok", attach_to_allure=False)
+    yield LfsClient(api, pool_size=4, chunk_size=4096)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(3):
+        p = tmp_path / "src" / f"f{i}.bin"
+        p.parent.mkdir(exist_ok=True)
+        p.write_bytes(bytes([i]) * (50_000 + i))
+        paths.append(p)
+    return paths
+
+
+@pytest.mark.unit
+def test_upload_then_download_round_trip(lfs, files, tmp_path):
+    batch, uploads = lfs.upload_files("bob", "repo", files)
+
+    assert batch.ok() and [t.ok() and not t.skipped for t in uploads] == [True] * 3
+    assert _LfsHandler.auth[0].startswith("Basic ")
+    objects = [file_oid(p) for p in files]
+    assert set(_LfsHandler.store) == {o.oid for o in objects}
+
+    batch, downloads = lfs.download_objects("bob", "repo", objects, tmp_path / "out")
+
+    assert batch.ok() and all(t.verified for t in downloads)
+    assert (tmp_path / "out" / objects[2].oid).read_bytes() == files[2].read_bytes()
+    assert downloads[0].bytes == 50_000 and downloads[0].throughput > 0
+
+
+@pytest.mark.unit
+def test_existing_objects_are_skipped(lfs, files):
+    lfs.upload_files("bob", "repo", files[:1])
+
+    _, uploads = lfs.upload_files("bob", "repo", files)
+
+    assert [t.skipped for t in uploads] == [True, False, False]
+
+
+@pytest.mark.unit
+def test_download_detects_corruption_and_missing_objects(lfs, files, tmp_path):
+    lfs.upload_files("bob", "repo", files[:1])
+    good = file_oid(files[0])
+    _LfsHandler.corrupt.add(good.oid)
+
+    batch, downloads = lfs.download_objects("bob", "repo", [good, LfsObject("0" * 64, 1)], tmp_path / "out")
+
+    assert batch.errors() == {"0" * 64: "Object does not exist"}
+    assert "integrity check failed" in downloads[0].error and not downloads[0].verified
+    assert not (tmp_path / "out" / good.oid).exists()
+    assert not list((tmp_path / "out").glob("*.part"))
+    assert downloads[1].error == "no download action offered"
+
+
+@pytest.mark.unit
+def test_pool_size_does_not_touch_the_api_session():
+    api = GiteaHttpClient("http://127.0.0.1:1", token="tok", attach_to_allure=False)
+    adapter = api.session.get_adapter("http://127.0.0.1:1/")
+
+    lfs = LfsClient(api, pool_size=16)
+
+    assert lfs.session is not api.session
+    assert api.session.get_adapter("http://127.0.0.1:1/") is adapter
+    assert lfs.session.get_adapter("http://127.0.0.1:1/")._pool_maxsize == 16
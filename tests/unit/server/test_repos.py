@@ -1,5 +1,7 @@
 import pytest
 
+from gitguard.clients.http_client import HttpResult
+
 
 @pytest.mark.unit
 def test_create_repo_success(mocker, gitea_client):
@@ -26,3 +28,18 @@ def test_delete_repo(mocker, gitea_client):
         "repos/alice/repo1",
         headers=gitea_client._auth_headers(),
     )
+
+
+@pytest.mark.unit
+def test_iter_repos_paginates(mocker, gitea_client):
+    pages = {
+        1: HttpResult(200, "", {"ok": True, "data": [{"name": "a"}, {"name": "b"}]}, {"X-Total-Count": "3"}, 0.0),
+        2: HttpResult(200, "", {"ok": True, "data": [{"name": "c"}]}, {"X-Total-Count": "3"}, 0.0),
+    }
+    mock_get = mocker.patch.object(type(gitea_client), "get", side_effect=lambda path, params, headers: pages[params["page"]])
+
+    names = [r["name"] for r in gitea_client.iter_repos(limit=2)]
+
+    assert names == ["a", "b", "c"]
+    assert mock_get.call_count == 2
+    assert mock_get.call_args.kwargs["params"] == {"page": 2, "limit": 2, "sort": "updated", "order": "desc"}
@@ -0,0 +1,112 @@
+import base64
+import os
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gitguard.clients.http_gitea_client import GiteaHttpClient
+from gitguard.clients.smart_http_client import (
+    DELIM_PKT, FLUSH_PKT, SmartHttpClient, encode_command, iter_pkt_lines, parse_ls_refs, pkt_line,
+)
+
+
+@pytest.mark.unit
+def test_pkt_line_roundtrip():
+    assert pkt_line("a\n") == b"0006a\n"
+    data = pkt_line("first\n") + DELIM_PKT + pkt_line(b"second") + FLUSH_PKT
+    assert list(iter_pkt_lines(data)) == [b"first", None, b"second", None]
+    assert encode_command("ls-refs", ["peel"]).startswith(b"0014command=ls-refs\n")
+    with pytest.raises(ValueError):
+        list(iter_pkt_lines(b"00ffshort"))
+
+
+@pytest.mark.unit
+def test_parse_ls_refs_rejects_v0():
+    v0 = pkt_line("# service=git-upload-pack\n") + FLUSH_PKT
+    with pytest.raises(ValueError, match="v2"):
+        parse_ls_refs(v0)
+
+
+class _UploadPack(BaseHTTPRequestHandler):
+    """Serves <root>/<owner>/<repo>.git through `git upload-pack --stateless-rpc` (protocol v2)."""
+    root = ""
+    auth = []
+
+    def do_POST(self):
+        self.auth.append(self.headers.get("Authorization"))
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        repo = os.path.join(self.root, self.path.lstrip("/").removesuffix("/git-upload-pack"))
+        if not os.path.isdir(repo):
+            self.send_response(404)
+            self.end_headers()
+            return
+        env = dict(os.environ, GIT_PROTOCOL=self.headers.get("Git-Protocol", ""))
+        out = subprocess.run(["git", "upload-pack", "--stateless-rpc", repo], input=body, env=env,
+                             capture_output=True, check=True).stdout
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-git-upload-pack-result")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    repo = tmp_path / "bob" / "repo.git"
+    seed = tmp_path / "seed"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(seed)], check=True)
+    for cmd in (["-c", "user.name=t", "-c", "user.email=t@e", "commit", "-q", "--allow-empty", "-m", "x"],
+                ["branch", "feature"], ["-c", "user.name=t", "-c", "user.email=t@e", "tag", "-a", "v1", "-m", "v1"]):
+        subprocess.run(["git", "-C", str(seed), *cmd], check=True)
+    subprocess.run(["git", "clone", "-q", "--bare", str(seed), str(repo)], check=True)
+    _UploadPack.root, _UploadPack.auth = str(tmp_path), []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _UploadPack)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", repo
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.unit
+def test_ls_refs_matches_git_ls_remote(server):
+    url, repo = server
+    client = SmartHttpClient(GiteaHttpClient(url, token="t0k", attach_to_allure=False))
+
+    adv = client.ls_refs("bob", "repo")
+
+    assert adv.ok(), adv.error
+    expected = dict(line.split("\t")[::-1] for line in subprocess.run(
+        ["git", "ls-remote", str(repo)], capture_output=True, text=True, check=True).stdout.splitlines())
+    assert adv.refs == {k: v for k, v in expected.items() if not k.endswith("^{}")}
+    assert adv.peeled == {"refs/tags/v1": expected["refs/tags/v1^{}"]}
+    assert adv.symrefs == {"HEAD": "refs/heads/main"}
+    assert adv.duration > 0 and adv.bytes_received > 0
+    assert _UploadPack.auth[-1] == "Basic " + base64.b64encode(b"t0k:x-oauth-basic").decode()
+
+
+@pytest.mark.unit
+def test_ls_refs_prefix_and_many(server):
+    url, _ = server
+    client = SmartHttpClient(GiteaHttpClient(url, token="t", attach_to_allure=False), pool_size=4)
+
+    results = client.ls_refs_many([("bob", "repo"), ("bob", "missing")], prefixes=["refs/heads/"], max_parallel=2)
+
+    assert set(results["bob/repo"].refs) == {"refs/heads/main", "refs/heads/feature"}
+    assert results["bob/missing"].status_code == 404 and not results["bob/missing"].ok()
+
+
+@pytest.mark.unit
+def test_pool_size_leaves_the_api_session_adapters_alone():
+    api = GiteaHttpClient("http://127.0.0.1:1", token="t", attach_to_allure=False)
+    adapters = dict(api.session.adapters)
+
+    client = SmartHttpClient(api, pool_size=16)
+
+    assert dict(api.session.adapters) == adapters
+    assert client.session is not api.session
+    assert client.session.get_adapter("http://127.0.0.1:1/")._pool_maxsize == 16
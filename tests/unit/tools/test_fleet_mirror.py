@@ -0,0 +1,139 @@
+import json
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.tools.fleet_mirror import FleetMirror
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+class FakeApi:
+    """Stands in for GiteaHttpClient.iter_repos over a set of local bare repositories."""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.calls = 0
+
+    def iter_repos(self, limit=50, sort="updated", order="desc"):
+        self.calls += 1
+        yield from list(self.repos.values())
+
+
+@pytest.fixture
+def fleet(tmp_path):
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"),
+                    enable_trace=False, attach_logs_always=False)
+    repos = {}
+    for i, name in enumerate(("alpha", "beta", "gamma")):
+        origin = tmp_path / "server" / f"{name}.git"
+        _git("init", "-q", "--bare", "-b", "main", str(origin))
+        res = git.build_history([HistoryCommit("init", {"f": name}, branch="main"),
+                                 HistoryCommit("side", {"g": "1"}, branch="side")], workdir=str(origin))
+        assert res.ok(), res.stderr
+        repos[name] = {"full_name": f"team/{name}", "name": name, "owner": {"login": "team"},
+                       "clone_url": str(origin), "updated_at": f"2024-01-0{i + 1}T00:00:00Z"}
+    api = FakeApi(repos)
+    mirror = FleetMirror(api, git, str(tmp_path / "mirrors"), protocol="http")
+    return mirror, api, repos, git
+
+
+@pytest.mark.unit
+def test_first_run_clones_all_most_recent_first(fleet):
+    mirror, _, _, _ = fleet
+
+    report = mirror.run(max_parallel=1)
+
+    assert report.ok(), report.format()
+    assert [o.job.full_name for o in report.outcomes] == ["team/gamma", "team/beta", "team/alpha"]
+    assert {o.action for o in report.outcomes} == {"clone"}
+    assert report.bytes_total > 0 and report.skipped == 0
+    path = mirror.root / "team" / "beta.git"
+    assert _git("--git-dir", str(path), "config", "remote.origin.mirror") == "true"
+    assert not list(mirror.root.rglob("*.partial"))
+
+
+@pytest.mark.unit
+def test_resume_skips_unchanged_and_fetch_prunes(fleet):
+    mirror, api, repos, git = fleet
+    assert mirror.run(max_parallel=2).ok()
+
+    origin = repos["alpha"]["clone_url"]
+    _git("--git-dir", origin, "branch", "-D", "side")
+    repos["alpha"]["updated_at"] = "2024-02-01T00:00:00Z"
+
+    resumed = FleetMirror(api, git, str(mirror.root), protocol="http")  # state comes from the file
+    report = resumed.run(max_parallel=2)
+
+    assert [(o.job.full_name, o.action) for o in report.outcomes] == [("team/alpha", "fetch")]
+    assert report.skipped == 2
+    refs = _git("--git-dir", str(mirror.root / "team" / "alpha.git"), "for-each-ref", "--format=%(refname)")
+    assert refs.split() == ["refs/heads/main"]
+    state = json.loads(mirror.state_file.read_text())
+    assert state["team/alpha"]["updated_at"] == "2024-02-01T00:00:00Z"
+
+
+@pytest.mark.unit
+def test_failed_clone_is_recorded_and_retried(fleet, tmp_path):
+    mirror, _, repos, _ = fleet
+    repos["beta"]["clone_url"] = str(tmp_path / "missing.git")
+
+    report = mirror.run(max_parallel=3)
+
+    assert not report.ok()
+    assert [o.job.full_name for o in report.failed] == ["team/beta"]
+    assert mirror.state("team/beta")["ok"] is False
+    assert not (mirror.root / "team" / "beta.git").exists()
+    assert "team/beta" in report.format()
+
+    assert [o.job.full_name for o in mirror.run().outcomes] == ["team/beta"]
+
+
+@pytest.mark.unit
+def test_limit_caps_syncs_in_priority_order(fleet):
+    mirror, _, _, _ = fleet
+
+    report = mirror.run(limit=1)
+
+    assert [o.job.full_name for o in report.outcomes] == ["team/gamma"]
+    assert [j.full_name for j in mirror.plan()] == ["team/beta", "team/alpha"]
+
+
+@pytest.mark.unit
+def test_http_mirrors_authenticate_with_api_token(fleet, mocker):
+    mirror, api, _, git = fleet
+    api.token = "s3cret"
+    run = mocker.spy(git, "_run")
+
+    assert mirror.run(max_parallel=1, limit=1).ok()
+    assert mirror.run(max_parallel=1, force=True, limit=1).ok()  # now a fetch
+
+    for call in run.call_args_list:
+        env = call.kwargs["extra_env"]
+        assert env["GIT_CONFIG_KEY_0"] == "http.extraHeader"
+        assert env["GIT_CONFIG_VALUE_0"].startswith("Authorization: Basic ")
+        assert "s3cret" not in " ".join(call.args[0])
+    config = (mirror.root / "team" / "gamma.git" / "config").read_text()
+    assert "s3cret" not in config and "Authorization" not in config
+    mirror.protocol = "ssh"
+    assert mirror._auth_env() == {}
+
+
+@pytest.mark.unit
+def test_cli_client_has_no_trace_and_logs_outside_root(tmp_path, mocker):
+    from gitguard.tools import fleet_mirror
+
+    mocker.patch.object(fleet_mirror, "GiteaHttpClient")
+    run = mocker.patch.object(fleet_mirror.FleetMirror, "run", return_value=fleet_mirror.FleetReport())
+    client = mocker.spy(fleet_mirror, "GitClient")
+
+    assert fleet_mirror.main(["--root", str(tmp_path / "mirrors"), "--artifacts", str(tmp_path / "logs")]) == 0
+
+    kwargs = client.call_args.kwargs
+    assert kwargs["enable_trace"] is False and kwargs["attach_logs_always"] is False
+    assert kwargs["artifacts_dir"] == str(tmp_path / "logs")
+    assert not (tmp_path / "mirrors" / "artifacts").exists()
+    run.assert_called_once()
@@ -0,0 +1,96 @@
+import subprocess
+
+import pytest
+
+from gitguard.clients.git_client import GitClient, HistoryCommit
+from gitguard.tools.remote_state import RefChange, RemoteStateCache, diff_refs
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def env(tmp_path):
+    """A bare 'remote' with main, feature and a tag, plus a GitClient to drive it."""
+    git = GitClient(workdir=str(tmp_path), artifacts_dir=str(tmp_path / "artifacts"),
+                    enable_trace=False, attach_logs_always=False)
+    origin = tmp_path / "origin.git"
+    _git("init", "-q", "--bare", "-b", "main", str(origin))
+    history = git.build_history([HistoryCommit("one", {"a": "1"}, tag="v1", label="one"),
+                                 HistoryCommit("two", {"a": "2"}),
+                                 HistoryCommit("feat", {"b": "1"}, branch="feature", parent="one")],
+                                workdir=str(origin))
+    assert history.ok(), history.stderr
+    return git, origin, history.commits
+
+
+def _advance(git, origin, branch="main"):
+    res = git.build_history([HistoryCommit("more", {"c": "x"}, branch=branch, parent=f"refs/heads/{branch}^0")],
+                            workdir=str(origin), base_timestamp=1800000000)
+    assert res.ok(), res.stderr
+    return res.commits[0]
+
+
+@pytest.mark.unit
+def test_diff_refs_kinds():
+    changes = diff_refs({"refs/heads/a": "1", "refs/heads/b": "2"}, {"refs/heads/b": "3", "refs/heads/c": "4"})
+    assert [(c.ref, c.kind) for c in changes] == [
+        ("refs/heads/a", "deleted"), ("refs/heads/b", "updated"), ("refs/heads/c", "created")]
+
+
+@pytest.mark.unit
+def test_changed_refs_detects_moves_and_persists(env, tmp_path):
+    git, origin, commits = env
+    state = tmp_path / "state.json"
+    cache = RemoteStateCache(git, state_file=str(state))
+
+    first = cache.changed_refs(str(origin))
+    assert {c.ref for c in first} == {"refs/heads/main", "refs/heads/feature", "refs/tags/v1"}
+    assert all(c.kind == "created" for c in first)
+    assert cache.changed_refs(str(origin)) == []
+
+    new_head = _advance(git, origin)
+    _git("--git-dir", str(origin), "branch", "-D", "feature")
+
+    reloaded = RemoteStateCache(git, state_file=str(state))
+    assert reloaded.changed_refs(str(origin), update=False) == [
+        RefChange("refs/heads/feature", commits[2], None),
+        RefChange("refs/heads/main", commits[1], new_head),
+    ]
+    assert len(reloaded.changed_refs(str(origin))) == 2  # peek did not store the snapshot
+
+
+@pytest.mark.unit
+def test_fetch_changed_updates_mirror_with_only_moved_refs(env, tmp_path):
+    git, origin, commits = env
+    mirror = tmp_path / "mirror.git"
+    _git("init", "-q", "--bare", str(mirror))
+    _git("--git-dir", str(mirror), "remote", "add", "origin", str(origin))
+    cache = RemoteStateCache(git)
+
+    changes, result = cache.fetch_changed(str(mirror), mirror=True)
+    assert result.ok() and len(changes) == 3
+    assert _git("--git-dir", str(mirror), "rev-parse", "refs/heads/main") == commits[1]
+
+    changes, result = cache.fetch_changed(str(mirror), mirror=True)
+    assert changes == [] and result is None  # nothing moved: no fetch at all
+
+    new_head = _advance(git, origin, branch="feature")
+    _git("--git-dir", str(origin), "tag", "-d", "v1")
+    changes, result = cache.fetch_changed(str(mirror), mirror=True)
+    assert {(c.ref, c.kind) for c in changes} == {("refs/heads/feature", "updated"), ("refs/tags/v1", "deleted")}
+    assert result.ok()
+    assert _git("--git-dir", str(mirror), "rev-parse", "refs/heads/feature") == new_head
+    assert "v1" not in _git("--git-dir", str(mirror), "tag")
+
+
+@pytest.mark.unit
+def test_poll_many_skips_unreachable_remotes(env, tmp_path):
+    git, origin, _ = env
+    cache = RemoteStateCache(git)
+
+    polled = cache.poll_many([str(origin), str(tmp_path / "missing.git")], max_parallel=2)
+
+    assert list(polled) == [str(origin)]
+    assert len(polled[str(origin)]) == 3